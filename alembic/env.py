@@ -5,6 +5,10 @@ from sqlalchemy import pool
 
 from alembic import context
 
+from app.core.settings import settings
+from app.db.database import Base
+import app.db.models.models  # noqa: F401  (모델을 메타데이터에 등록)
+
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
@@ -14,11 +18,12 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
+# DB 접속 정보는 alembic.ini 대신 애플리케이션 설정(.env)에서 읽음
+config.set_main_option("sqlalchemy.url", settings.sync_db_url.replace("%", "%%"))
+
 # add your model's MetaData object here
 # for 'autogenerate' support
-# from myapp import mymodel
-# target_metadata = mymodel.Base.metadata
-target_metadata = None
+target_metadata = Base.metadata
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -26,6 +31,13 @@ target_metadata = None
 # ... etc.
 
 
+# FULLTEXT 인덱스는 MySQL 에서만 만들므로 다른 DB(SQLite 등)에서는 autogenerate 비교 대상에서 제외
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == "index" and object.dialect_kwargs.get("mysql_prefix") == "FULLTEXT":
+        return context.get_context().dialect.name == "mysql"
+    return True
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -65,7 +77,11 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            # SQLite(로컬/벤치마크)는 ALTER TABLE 지원이 제한적이므로 batch 모드 사용
+            render_as_batch=connection.dialect.name == "sqlite",
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,84 @@
+"""initial schema (users, songs, playlists, playlist_songs)
+
+Revision ID: 3b8e1f6a2c40
+Revises:
+Create Date: 2026-10-17 14:02:11.504118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8e1f6a2c40'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 기존에 lifespan 의 create_all 로 만들어진 DB는 이 리비전으로 stamp 후 upgrade
+    #   alembic stamp 3b8e1f6a2c40 && alembic upgrade head
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("username", sa.String(length=50), nullable=False),
+        sa.Column("email", sa.String(length=100), nullable=False),
+        sa.Column("password", sa.String(length=100), nullable=False),
+        sa.Column("role", sa.Enum("ADMIN", "USER", name="userrole"), nullable=False),
+        sa.Column("refresh_token", sa.String(length=500), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "songs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=100), nullable=False),
+        sa.Column("artist", sa.String(length=100), nullable=False),
+        sa.Column("duration", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_songs_id", "songs", ["id"])
+    op.create_index("ix_songs_title", "songs", ["title"])
+
+    op.create_table(
+        "playlists",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("desc", sa.String(length=200), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_playlists_id", "playlists", ["id"])
+    op.create_index("ix_playlists_name", "playlists", ["name"])
+
+    op.create_table(
+        "playlist_songs",
+        sa.Column("playlist_id", sa.Integer(), nullable=False),
+        sa.Column("song_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["playlist_id"], ["playlists.id"]),
+        sa.ForeignKeyConstraint(["song_id"], ["songs.id"]),
+        sa.PrimaryKeyConstraint("playlist_id", "song_id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("playlist_songs")
+    op.drop_index("ix_playlists_name", table_name="playlists")
+    op.drop_index("ix_playlists_id", table_name="playlists")
+    op.drop_table("playlists")
+    op.drop_index("ix_songs_title", table_name="songs")
+    op.drop_index("ix_songs_id", table_name="songs")
+    op.drop_table("songs")
+    op.drop_index("ix_users_email", table_name="users")
+    op.drop_index("ix_users_username", table_name="users")
+    op.drop_index("ix_users_id", table_name="users")
+    op.drop_table("users")
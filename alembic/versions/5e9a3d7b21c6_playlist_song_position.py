@@ -0,0 +1,60 @@
+"""add position to playlist_songs
+
+Revision ID: 5e9a3d7b21c6
+Revises: a1f4c2e9b7d3
+Create Date: 2026-10-17 15:21:48.113027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e9a3d7b21c6'
+down_revision: Union[str, Sequence[str], None] = 'a1f4c2e9b7d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+POSITION_GAP = 1024
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("playlist_songs", sa.Column("position", sa.BigInteger(), nullable=True))
+
+    # 기존 행은 플레이리스트별 song_id 순서로 1024 간격 위치를 매김
+    if op.get_bind().dialect.name == "mysql":
+        # MySQL 은 UPDATE 대상 테이블을 서브쿼리에서 직접 참조할 수 없으므로 파생 테이블과 JOIN
+        op.execute(
+            f"""
+            UPDATE playlist_songs ps
+            JOIN (
+                SELECT playlist_id, song_id,
+                       ROW_NUMBER() OVER (PARTITION BY playlist_id ORDER BY song_id) AS rn
+                FROM playlist_songs
+            ) r ON r.playlist_id = ps.playlist_id AND r.song_id = ps.song_id
+            SET ps.position = r.rn * {POSITION_GAP}
+            """
+        )
+    else:
+        op.execute(
+            f"""
+            UPDATE playlist_songs SET position = {POSITION_GAP} * (
+                SELECT count(*) FROM playlist_songs p2
+                WHERE p2.playlist_id = playlist_songs.playlist_id AND p2.song_id <= playlist_songs.song_id
+            )
+            """
+        )
+
+    with op.batch_alter_table("playlist_songs") as batch_op:
+        batch_op.alter_column("position", existing_type=sa.BigInteger(), nullable=False)
+    op.create_index("ix_playlist_songs_playlist_id_position", "playlist_songs", ["playlist_id", "position"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_playlist_songs_playlist_id_position", table_name="playlist_songs")
+    with op.batch_alter_table("playlist_songs") as batch_op:
+        batch_op.drop_column("position")
@@ -0,0 +1,31 @@
+"""replace songs title index with (title, id)
+
+Revision ID: 7c2d9e4f1a85
+Revises: 3b8e1f6a2c40
+Create Date: 2026-10-17 14:05:37.920461
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2d9e4f1a85'
+down_revision: Union[str, Sequence[str], None] = '3b8e1f6a2c40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 제목순 커서 페이지네이션용 복합 인덱스 - title 단독 인덱스는 이 인덱스로 대체
+    op.create_index("ix_songs_title_id", "songs", ["title", "id"])
+    op.drop_index("ix_songs_title", table_name="songs")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index("ix_songs_title", "songs", ["title"])
+    op.drop_index("ix_songs_title_id", table_name="songs")
@@ -0,0 +1,39 @@
+"""add fulltext index on songs title, artist
+
+Revision ID: a1f4c2e9b7d3
+Revises: 7c2d9e4f1a85
+Create Date: 2026-10-17 10:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1f4c2e9b7d3'
+down_revision: Union[str, Sequence[str], None] = '7c2d9e4f1a85'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # FULLTEXT(ngram) 인덱스는 MySQL 전용
+    if op.get_bind().dialect.name != "mysql":
+        return
+    op.create_index(
+        "ft_songs_title_artist",
+        "songs",
+        ["title", "artist"],
+        mysql_prefix="FULLTEXT",
+        mysql_with_parser="ngram",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "mysql":
+        return
+    op.drop_index("ft_songs_title_artist", table_name="songs")
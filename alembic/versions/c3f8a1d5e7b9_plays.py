@@ -0,0 +1,41 @@
+"""add plays table
+
+Revision ID: c3f8a1d5e7b9
+Revises: 9d4b6f0e8a12
+Create Date: 2026-10-17 18:02:55.407119
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8a1d5e7b9'
+down_revision: Union[str, Sequence[str], None] = '9d4b6f0e8a12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "plays",
+        sa.Column("id", sa.BigInteger().with_variant(sa.Integer(), "sqlite"), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("song_id", sa.Integer(), nullable=False),
+        sa.Column("played_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["song_id"], ["songs.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_plays_user_id_played_at", "plays", ["user_id", "played_at"])
+    op.create_index("ix_plays_song_id_played_at", "plays", ["song_id", "played_at"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_plays_song_id_played_at", table_name="plays")
+    op.drop_index("ix_plays_user_id_played_at", table_name="plays")
+    op.drop_table("plays")
@@ -0,0 +1,57 @@
+"""add song play count rollup tables
+
+Revision ID: e6a2c9f4b8d1
+Revises: c3f8a1d5e7b9
+Create Date: 2026-10-17 19:14:26.871930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a2c9f4b8d1'
+down_revision: Union[str, Sequence[str], None] = 'c3f8a1d5e7b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "song_play_daily",
+        sa.Column("song_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("play_count", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(["song_id"], ["songs.id"]),
+        sa.PrimaryKeyConstraint("song_id", "day"),
+    )
+    op.create_index("ix_song_play_daily_day_play_count", "song_play_daily", ["day", "play_count"])
+    op.create_table(
+        "song_play_totals",
+        sa.Column("song_id", sa.Integer(), nullable=False),
+        sa.Column("play_count", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(["song_id"], ["songs.id"]),
+        sa.PrimaryKeyConstraint("song_id"),
+    )
+    op.create_index("ix_song_play_totals_play_count", "song_play_totals", ["play_count"])
+
+    # 이미 저장된 재생 기록으로 집계 채우기 (이후에는 재생 기록 저장 시 함께 갱신)
+    op.execute(
+        "INSERT INTO song_play_daily (song_id, day, play_count) "
+        "SELECT song_id, DATE(played_at), count(*) FROM plays GROUP BY song_id, DATE(played_at)"
+    )
+    op.execute(
+        "INSERT INTO song_play_totals (song_id, play_count) "
+        "SELECT song_id, count(*) FROM plays GROUP BY song_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_song_play_totals_play_count", table_name="song_play_totals")
+    op.drop_table("song_play_totals")
+    op.drop_index("ix_song_play_daily_day_play_count", table_name="song_play_daily")
+    op.drop_table("song_play_daily")
@@ -0,0 +1,40 @@
+import argparse
+import asyncio
+import sys
+from app.core.settings import settings
+from app.db.database import async_engine
+from app.services.similar import similar_index
+
+# build_similar_index.py : 비슷한 노래 색인 계산 CLI (스케줄 작업용, cron 등에서 하나만 실행)
+# playlist_songs 전체를 읽어 색인을 한 번 계산하고 SIMILAR_INDEX_PATH(또는 --output) 파일로 저장.
+# SIMILAR_INDEX_PATH 가 지정된 API 워커는 직접 계산하지 않고 이 파일을 읽음.
+#
+# 예) python -m app.cli.build_similar_index
+#     python -m app.cli.build_similar_index --output /var/lib/music/similar.npz
+
+
+async def run(path: str) -> int:
+    try:
+        await similar_index.refresh()
+    finally:
+        await async_engine.dispose()
+    if not similar_index.available:
+        print("numpy / scipy are not installed", file=sys.stderr)
+        return 1
+
+    songs = similar_index.save(path)
+    print(f"songs={songs} saved to {path}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="비슷한 노래 색인 계산 후 파일로 저장")
+    parser.add_argument("--output", default=settings.similar_index_path, help="기본값: SIMILAR_INDEX_PATH")
+    args = parser.parse_args()
+    if not args.output:
+        parser.error("--output 또는 SIMILAR_INDEX_PATH 가 필요합니다.")
+    sys.exit(asyncio.run(run(args.output)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import argparse
+import asyncio
+import sys
+from app.core.settings import settings
+from app.db.database import AsyncSessionLocal, async_engine
+from app.services.services import SongIngestService
+
+# ingest_songs.py : 노래 카탈로그 일괄 등록 CLI
+# POST /songs/bulk 와 같은 서비스(SongIngestService)를 사용하여 파일을 스트리밍으로 읽어 저장.
+#
+# 예) python -m app.cli.ingest_songs catalog.ndjson
+#     python -m app.cli.ingest_songs catalog.csv --chunk-size 5000
+#     cat catalog.ndjson | python -m app.cli.ingest_songs - --format ndjson
+
+READ_SIZE = 64 * 1024
+
+
+# 파일을 READ_SIZE 단위 bytes 조각으로 읽기
+async def read_chunks(stream):
+    while chunk := stream.read(READ_SIZE):
+        yield chunk
+
+
+async def run(path: str, fmt: str, chunk_size: int) -> int:
+    stream = sys.stdin.buffer if path == "-" else open(path, "rb")
+    try:
+        async with AsyncSessionLocal() as db:
+            lines = SongIngestService.iter_lines(read_chunks(stream))
+            report = await SongIngestService.ingest_songs(db, lines, fmt, chunk_size)
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+        await async_engine.dispose()
+
+    for error in report.errors:
+        print(f"line {error.line}: {error.error}", file=sys.stderr)
+    print(
+        f"inserted={report.inserted} failed={report.failed} "
+        f"elapsed={report.elapsed}s rows/sec={report.rows_per_sec}"
+    )
+    return 1 if report.failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="노래 카탈로그 일괄 등록 (NDJSON / CSV)")
+    parser.add_argument("path", help="입력 파일 경로 (- 이면 표준 입력)")
+    parser.add_argument("--format", choices=["ndjson", "csv"], help="생략하면 확장자로 판단")
+    parser.add_argument("--chunk-size", type=int, default=settings.ingest_chunk_size)
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    sys.exit(asyncio.run(run(args.path, fmt, args.chunk_size)))
+
+
+if __name__ == "__main__":
+    main()
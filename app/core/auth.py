@@ -1,11 +1,13 @@
 from fastapi import Request, Response, HTTPException, Depends
 from jwt import InvalidTokenError
 from app.core.settings import settings
-from app.core.jwt_context import verify_token
-from app.db.database import get_db
+from app.core.jwt_context import verify_token, decode_access_token
+from app.core.cache import user_cache
+from app.db.database import get_write_db
 from app.services.services import UserService
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.models.models import UserRole
+from app.db.schemas.schemas import AuthUser
 
 def set_auth_cookies(response: Response, access_token: str, refresh_token: str) -> None:
     response.set_cookie(
@@ -51,13 +53,39 @@ async def get_user_id_option(request: Request):
     except InvalidTokenError:
         return None
     
+# 요청객체에서 access_token 꺼내서 검증된 토큰 내용(uid, role 등) 반환
+async def get_token_claims(request: Request) -> dict:
+    access_token = request.cookies.get("access_token")
+    if not access_token:
+        raise HTTPException(status_code=401, detail="Access token missing")
+
+    try:
+        claims = decode_access_token(access_token)
+    except InvalidTokenError:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    if claims.get("uid") is None:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    return claims
+
 # 관리자만 접근 가능하도록 하는 의존성
-async def get_admin_user(user_id: int = Depends(get_user_id), db: AsyncSession = Depends(get_db)):
-    user = await UserService.get_user(db, user_id)
+# 토큰의 role이 ADMIN이 아니면 DB 조회 없이 바로 거부하고,
+# ADMIN이면 권한 변경이 바로 반영되도록 사용자 캐시(없으면 DB)로 한 번 더 확인
+# 관리자 라우트는 모두 쓰기 요청이므로 라우트와 같은 기본 DB 세션(get_write_db)을 함께 사용
+async def get_admin_user(claims: dict = Depends(get_token_claims), db: AsyncSession = Depends(get_write_db)) -> AuthUser:
+    if claims.get("role") not in (None, UserRole.ADMIN.value):
+        raise HTTPException(status_code=403, detail="접근 권한이 없습니다. 관리자만 접근 가능합니다.")
+    user = await UserService.get_auth_user(db, claims["uid"])
     if user.role != UserRole.ADMIN:
         raise HTTPException(status_code=403, detail="접근 권한이 없습니다. 관리자만 접근 가능합니다.")
     return user
 
-# 현재 로그인한 사용자 객체를 반환하는 의존성
-async def get_current_user(user_id: int = Depends(get_user_id), db: AsyncSession = Depends(get_db)):
-    return await UserService.get_user(db, user_id)
\ No newline at end of file
+# 현재 로그인한 사용자 정보(id, role)를 반환하는 의존성
+# 토큰 내용만으로 처리하며 DB는 조회하지 않음 (캐시에 삭제/변경된 사용자로 기록되어 있으면 그 내용을 따름)
+async def get_current_user(claims: dict = Depends(get_token_claims)) -> AuthUser:
+    uid = claims["uid"]
+    cached = user_cache.get(uid, False)
+    if cached is None:
+        raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
+    if cached is not False:
+        return cached
+    return AuthUser(id=uid, role=claims.get("role", UserRole.USER))
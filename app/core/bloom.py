@@ -0,0 +1,39 @@
+import hashlib
+import math
+
+# bloom.py : 블룸 필터 (확률적 집합)
+# "없음" 응답은 항상 정확하고, "있을 수 있음" 응답은 error_rate 확률로 틀릴 수 있음 (삭제는 지원하지 않음).
+# 항목 수가 capacity 를 넘으면 오탐률이 점점 올라가므로 capacity 는 예상 최대 항목 수보다 넉넉하게 설정.
+# 이벤트 루프 스레드에서만 사용하므로 락은 두지 않음.
+
+class BloomFilter:
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        # 비트 수 m = -n ln(p) / (ln 2)^2, 해시 함수 수 k = (m / n) ln 2
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    # 항목 하나의 비트 위치 k 개 (blake2b 128비트 해시를 둘로 나눈 double hashing)
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    # 추가
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    # 포함 여부 : False 면 확실히 없음, True 면 있을 수 있음
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def __len__(self) -> int:
+        return self.count
@@ -0,0 +1,77 @@
+import time
+from collections import OrderedDict
+from app.core.settings import settings
+
+# cache.py : 프로세스 내부 메모리 캐시
+# 최대 크기(LRU 방식으로 오래 안 쓴 항목부터 제거)와 유효 시간(TTL)이 있는 간단한 캐시.
+# 이벤트 루프 스레드에서만 사용하므로 락은 두지 않음.
+
+_MISSING = object()
+
+class TTLCache:
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()   # key -> (만료 시각, 값)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # 조회 : 없거나 만료된 항목이면 default 반환
+    def get(self, key, default=None):
+        item = self._data.get(key, _MISSING)
+        if item is _MISSING:
+            self.misses += 1
+            return default
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    # 저장 : ttl을 지정하지 않으면 기본 TTL 사용, 최대 크기를 넘으면 가장 오래 안 쓴 항목 제거
+    def set(self, key, value, ttl: float | None = None) -> None:
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    # 삭제 (무효화)
+    def delete(self, key) -> None:
+        self._data.pop(key, None)
+
+    # 전체 비우기
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    # 캐시 지표 (적중/실패/제거 횟수, 현재 크기)
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+# 검증된 access token 의 claims 캐시 (토큰 sha256 digest -> claims, 토큰의 exp 까지만 보관)
+# 같은 토큰이 만료될 때까지 매 요청 보내지므로 서명 검증(jwt.decode)을 한 번만 하기 위해 사용
+token_cache = TTLCache(maxsize=settings.token_cache_size, ttl=settings.access_token_expire)
+
+# 폐기된 refresh token 목록 (jti / family id -> True, 토큰 만료 시각까지만 보관)
+# DB(refresh_tokens)가 기준이며, 이 프로세스에서 이미 폐기된 것을 알고 있는 토큰은 DB 조회 없이 거부하는 용도
+revoked_tokens = TTLCache(maxsize=100_000, ttl=settings.refresh_token_expire)
+revoked_families = TTLCache(maxsize=100_000, ttl=settings.refresh_token_expire)
+
+# 사용자 id -> AuthUser(id, role) 캐시 (삭제된 사용자는 None 저장)
+# 인증 의존성에서 매 요청마다 users 테이블을 조회하지 않도록 사용
+user_cache = TTLCache(maxsize=settings.user_cache_size, ttl=settings.user_cache_ttl)
@@ -0,0 +1,115 @@
+import logging
+import random
+import time
+from contextvars import ContextVar
+from sqlalchemy import event
+from app.core.settings import settings
+from app.core.metrics import Counter, Histogram
+
+# instrumentation.py : 요청별 지연시간 / DB 쿼리 수 측정
+#   - InstrumentationMiddleware : 라우트별 지연시간, 요청당 쿼리 수와 DB 시간 기록
+#   - instrument_engine         : SQLAlchemy 커서 실행 이벤트로 쿼리 수와 DB 시간을 현재 요청에 합산
+#   - 느린 요청 로그 + (선택) pyinstrument 샘플링 프로파일
+
+logger = logging.getLogger("app.slow_request")
+
+HTTP_REQUESTS = Counter("http_requests_total", "HTTP requests by route and status")
+HTTP_LATENCY = Histogram("http_request_duration_seconds", "HTTP request latency by route")
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries", "DB queries executed per HTTP request",
+    buckets=(0, 1, 2, 3, 4, 5, 6, 8, 10, 15, 20, 30, 50, 100),
+)
+REQUEST_DB_TIME = Histogram("http_request_db_duration_seconds", "Time spent in DB queries per HTTP request")
+DB_QUERIES = Counter("db_queries_total", "DB queries executed")
+
+# 현재 요청의 쿼리 집계 {"queries": 쿼리 수, "db_time": DB 시간(초)} - 요청 밖(백그라운드 작업 등)에서는 None
+_request_stats: ContextVar[dict | None] = ContextVar("request_stats", default=None)
+
+
+# 엔진에 쿼리 측정 이벤트 등록
+def instrument_engine(engine, label: str) -> None:
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        DB_QUERIES.inc(engine=label)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats["queries"] += 1
+            stats["db_time"] += elapsed
+
+
+# 느린 요청 프로파일러 (PROFILE_SAMPLE_RATE 비율의 요청만, pyinstrument 설치 시에만 동작)
+def _start_profiler():
+    if settings.profile_sample_rate <= 0 or random.random() >= settings.profile_sample_rate:
+        return None
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        return None
+    profiler = Profiler(async_mode="enabled")
+    profiler.start()
+    return profiler
+
+
+# ASGI 미들웨어 : 요청 하나의 지연시간과 쿼리 집계를 지표로 기록
+class InstrumentationMiddleware:
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = {"queries": 0, "db_time": 0.0}
+        token = _request_stats.set(stats)
+        profiler = _start_profiler()
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if settings.server_timing:
+                    app_ms = (time.perf_counter() - start) * 1000
+                    value = (
+                        f'app;dur={app_ms:.1f}, '
+                        f'db;dur={stats["db_time"] * 1000:.1f};desc="{stats["queries"]} queries"'
+                    )
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"server-timing", value.encode()),
+                        (b"x-db-query-count", str(stats["queries"]).encode()),
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            elapsed = time.perf_counter() - start
+            _request_stats.reset(token)
+
+            # 라우트 경로 템플릿(/songs/{song_id})으로 집계, 매칭되지 않은 경로는 하나로 묶음
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            method = scope["method"]
+
+            HTTP_REQUESTS.inc(method=method, route=path, status=status)
+            HTTP_LATENCY.observe(elapsed, method=method, route=path)
+            REQUEST_QUERIES.observe(stats["queries"], method=method, route=path)
+            REQUEST_DB_TIME.observe(stats["db_time"], method=method, route=path)
+
+            if profiler is not None:
+                profiler.stop()
+            if elapsed * 1000 >= settings.slow_request_ms:
+                logger.warning(
+                    "slow request %s %s %.1fms (%d queries, db %.1fms)",
+                    method, path, elapsed * 1000, stats["queries"], stats["db_time"] * 1000,
+                )
+                if profiler is not None:
+                    logger.warning(profiler.output_text(unicode=True))
@@ -1,18 +1,76 @@
 from passlib.context import CryptContext
 from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+import asyncio
+import hashlib
+import time
 import jwt
 from app.core.settings import settings
+from app.core.cache import token_cache
+from app.core.metrics import Counter, Gauge
 import uuid
 
 pwd_context = CryptContext(schemes=["bcrypt"])
 
+# bcrypt는 CPU를 수백 ms 사용하므로 이벤트 루프에서 직접 실행하지 않고 전용 스레드 풀에서 실행
+# (bcrypt 구현은 해시 계산 중 GIL을 놓기 때문에 스레드 풀로도 병렬 처리가 가능)
+_pwd_executor: ThreadPoolExecutor | None = None
+
+# 해시 작업 대기열 지표 (이벤트 루프 스레드에서만 갱신되므로 락 불필요)
+_pwd_pending = 0
+_pwd_stats = {"completed": 0, "rejected": 0}
+
+def _get_pwd_executor() -> ThreadPoolExecutor:
+    global _pwd_executor
+    if _pwd_executor is None:
+        _pwd_executor = ThreadPoolExecutor(
+            max_workers=settings.pwd_hash_workers, thread_name_prefix="pwd-hash"
+        )
+    return _pwd_executor
+
+# 해시 작업을 워커 풀에 제출
+# 대기 중인 작업이 상한을 넘으면 503을 반환하여 로그인 폭주가 다른 API까지 막지 않도록 함 (admission control)
+async def _run_pwd_task(func, *args):
+    global _pwd_pending
+    if _pwd_pending >= settings.pwd_hash_max_pending:
+        _pwd_stats["rejected"] += 1
+        raise HTTPException(
+            status_code=503,
+            detail="요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "1"},
+        )
+
+    _pwd_pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_pwd_executor(), func, *args)
+    finally:
+        _pwd_pending -= 1
+        _pwd_stats["completed"] += 1
+
+# 해시 워커 풀 지표 등록
+PWD_HASH_PENDING = Gauge("pwd_hash_pending", "Password hash jobs waiting or running")
+PWD_HASH_PENDING.set_function(lambda: _pwd_pending)
+PWD_HASH_REJECTED = Counter("pwd_hash_rejected_total", "Password hash jobs rejected by admission control")
+PWD_HASH_REJECTED.set_function(lambda: _pwd_stats["rejected"])
+PWD_HASH_COMPLETED = Counter("pwd_hash_completed_total", "Password hash jobs completed")
+PWD_HASH_COMPLETED.set_function(lambda: _pwd_stats["completed"])
+
+# 애플리케이션 종료 시 워커 풀 정리
+def shutdown_pwd_executor() -> None:
+    global _pwd_executor
+    if _pwd_executor is not None:
+        _pwd_executor.shutdown(wait=True)
+        _pwd_executor = None
+
 # 해시값 저장
 async def get_pwd_hash(password:str):
-    return pwd_context.hash(password)
+    return await _run_pwd_task(pwd_context.hash, password)
 
 # 비밀번호 검증
 async def verify_pwd(plain_password:str, hashed_password:str):
-    return pwd_context.verify(plain_password, hashed_password)
+    return await _run_pwd_task(pwd_context.verify, plain_password, hashed_password)
 
 # JWT 토큰 생성
 def create_token(uid: int, expires_delta: timedelta, **kwargs) -> str:
@@ -24,16 +82,23 @@ def create_token(uid: int, expires_delta: timedelta, **kwargs) -> str:
     )
     return encoded_jwt
 
-def create_access_token(uid: int) -> str:
+# access token에는 권한(role)도 포함하여 인증 시 DB 조회 없이 사용할 수 있게 함
+def create_access_token(uid: int, role: str) -> str:
     return create_token(
-        uid=uid, expires_delta=settings.access_token
+        uid=uid, role=role, expires_delta=settings.access_token
     )
 
-def create_refresh_token(uid: int) -> str:
+# refresh token : 토큰 id(jti)와 family(로그인 한 번에서 이어지는 토큰 묶음) 포함
+# jti 를 지정하지 않으면 새로 생성 (DB에 기록할 jti 는 new_token_id() 로 먼저 만들어 전달)
+def create_refresh_token(uid: int, jti: str | None = None, family: str | None = None) -> str:
     return create_token(
-        uid=uid, jti=str(uuid.uuid4()), expires_delta=settings.refresh_token
+        uid=uid, jti=jti or new_token_id(), fam=family, typ="refresh",
+        expires_delta=settings.refresh_token,
     )
 
+def new_token_id() -> str:
+    return str(uuid.uuid4())
+
 def decode_token(token: str) -> dict:
     return jwt.decode(
         token,
@@ -41,7 +106,38 @@ def decode_token(token: str) -> dict:
         algorithms=[settings.jwt_algo],
     )
 
+# access token 검증 (refresh token 을 access token 자리에 쓰지 못하게 함)
+# 검증에 성공한 토큰은 exp 까지 claims 를 캐시하여 같은 토큰의 서명 검증을 반복하지 않음
+# (캐시 키는 토큰 원문 대신 sha256 digest, 검증에 실패한 토큰은 캐시하지 않음)
+def decode_access_token(token: str) -> dict:
+    key = hashlib.sha256(token.encode()).digest() if settings.token_cache_size > 0 else None
+    if key is not None:
+        claims = token_cache.get(key)
+        if claims is not None:
+            return claims
+
+    payload = decode_token(token)
+    if payload.get("typ") == "refresh":
+        raise jwt.InvalidTokenError("refresh token used as access token")
+
+    if key is not None and "exp" in payload:
+        ttl = payload["exp"] - time.time()
+        if ttl > 0:
+            token_cache.set(key, payload, ttl=ttl)
+    return payload
+
+# 토큰 캐시 비우기 (SECRET_KEY 교체 등으로 이전에 검증한 토큰을 더 이상 믿으면 안 될 때 호출)
+def flush_token_cache() -> None:
+    token_cache.clear()
+
+# refresh token 검증 (jti 가 없는 토큰은 거부)
+def decode_refresh_token(token: str) -> dict:
+    payload = decode_token(token)
+    if payload.get("typ") != "refresh" or not payload.get("jti") or payload.get("uid") is None:
+        raise jwt.InvalidTokenError("not a refresh token")
+    return payload
+
 # 요청에 포함된 토큰의 유효성을 검증, 사용자 ID(uid)를 추출
 def verify_token(token: str) -> int:
-    payload = decode_token(token)
+    payload = decode_access_token(token)
     return payload.get("uid")
\ No newline at end of file
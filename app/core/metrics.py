@@ -0,0 +1,108 @@
+import threading
+
+# metrics.py : 애플리케이션 지표(metrics) 수집 모듈
+# Counter(누적 횟수), Gauge(현재 값), Histogram(분포)을 등록해 두고
+# Prometheus 텍스트 형식으로 내보낼 수 있게 함.
+
+_registry: list = []
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted(labels.items()))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: tuple, extra: tuple = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, doc: str):
+        self.name = name
+        self.doc = doc
+        self._lock = threading.Lock()
+        self._values: dict = {}
+        self._functions: dict = {}
+        _registry.append(self)
+
+    # 값을 다른 곳에서 관리하는 경우 : 등록한 함수를 내보낼 때마다 호출하여 최신 값을 읽음
+    def set_function(self, func, **labels) -> None:
+        self._functions[_label_key(labels)] = func
+
+    def samples(self):
+        values = dict(self._values)
+        for key, func in list(self._functions.items()):
+            values[key] = func()
+        return [(self.name, _format_labels(key), value) for key, value in values.items()]
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+        lines += [f"{name}{labels} {value}" for name, labels, value in self.samples()]
+        return "\n".join(lines)
+
+
+# 누적 횟수 (요청 수, 쿼리 수 등)
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+# 현재 값 (사용 중인 커넥션 수 등)
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        self._values[_label_key(labels)] = value
+
+
+# 분포 (지연시간 등) : 구간(bucket)별 누적 개수, 합계, 개수
+class Histogram(_Metric):
+    kind = "histogram"
+    DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, name: str, doc: str, buckets: tuple = DEFAULT_BUCKETS):
+        super().__init__(name, doc)
+        self.buckets = tuple(sorted(buckets))
+        # self._values : labels -> [구간별 개수..., 합계, 개수]
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            data = self._values.get(key)
+            if data is None:
+                data = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    data[i] += 1
+                    break
+            data[-2] += value
+            data[-1] += 1
+
+    def samples(self):
+        result = []
+        for key, data in list(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, data):
+                cumulative += count
+                result.append((f"{self.name}_bucket", _format_labels(key, (("le", bound),)), cumulative))
+            result.append((f"{self.name}_bucket", _format_labels(key, (("le", "+Inf"),)), data[-1]))
+            result.append((f"{self.name}_sum", _format_labels(key), data[-2]))
+            result.append((f"{self.name}_count", _format_labels(key), data[-1]))
+        return result
+
+
+# 등록된 모든 지표를 Prometheus 텍스트 형식으로 변환
+def render_prometheus() -> str:
+    return "\n".join(metric.render() for metric in _registry) + "\n"
@@ -0,0 +1,25 @@
+import base64
+import json
+from fastapi import HTTPException
+
+# pagination.py : 커서(keyset) 기반 페이지네이션 도우미
+# 마지막으로 반환한 행의 정렬 키를 base64 문자열(불투명 커서)로 만들어 클라이언트에 전달하고,
+# 다음 요청에서 그 키 "다음" 행부터 조회하므로 OFFSET과 달리 깊은 페이지도 첫 페이지와 비용이 같음.
+
+# 정렬 방식과 마지막 행의 키 값을 커서 문자열로 변환
+def encode_cursor(sort: str, keys: list) -> str:
+    raw = json.dumps({"s": sort, "k": keys}, separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+# 커서 문자열을 키 값 목록으로 복원 (정렬 방식이 다르거나 잘못된 커서면 400)
+def decode_cursor(cursor: str, sort: str) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        keys = payload["k"]
+        valid = payload["s"] == sort and isinstance(keys, list)
+    except (ValueError, KeyError, TypeError):
+        valid = False
+    if not valid:
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+    return keys
@@ -0,0 +1,53 @@
+import json
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+from fastapi import Response
+
+# serialization.py : 목록 응답용 빠른 JSON 직렬화 (FAST_JSON=true 일 때 사용)
+# ORM 객체 생성 -> pydantic 검증 -> JSON 변환 대신, DB 행(dict)을 바로 JSON bytes 로 변환.
+# orjson(requirements.txt 에 포함)을 사용하고, import 할 수 없으면 경고 후 표준 json 모듈 사용 (두 결과는 같은 JSON).
+
+logger = logging.getLogger("app.serialization")
+
+
+# 기본 인코더가 모르는 타입 변환 (MySQL SUM() 결과는 Decimal)
+def _default(obj):
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# 표준 json 모듈 인코더 (pydantic 출력과 같은 형식 : 공백 없음, 한글 그대로 UTF-8)
+def stdlib_dumps(obj) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default).encode()
+
+
+# 사용할 인코더 : orjson, import 할 수 없으면 표준 json
+def encoder():
+    try:
+        import orjson
+    except ImportError:
+        logger.warning("FAST_JSON 이 켜져 있지만 orjson 을 import 할 수 없어 표준 json 으로 직렬화합니다.")
+        return stdlib_dumps
+
+    def orjson_dumps(obj) -> bytes:
+        return orjson.dumps(obj, default=_default)
+    return orjson_dumps
+
+
+_dumps = None
+
+# 객체를 JSON bytes 로 변환 (인코더는 처음 호출할 때 결정)
+def dumps(obj) -> bytes:
+    global _dumps
+    if _dumps is None:
+        _dumps = encoder()
+    return _dumps(obj)
+
+
+# 직렬화가 끝난 JSON 으로 응답 생성 (response_model 검증/변환 생략)
+def json_response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
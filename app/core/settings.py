@@ -1,6 +1,7 @@
 from pydantic_settings import BaseSettings
 from pydantic import Field
 from datetime import timedelta
+from typing import Literal, Optional
 
 # settings.py : 설정 관리 모듈 
 # .env 파일에서 환경 변수를 읽어와 애플리케이션 전체에서 사용 가능한 객체를 생성
@@ -11,12 +12,88 @@ class Settings(BaseSettings):
     db_host: str = Field("localhost", alias="DB_HOST")
     db_port: str = Field("3306", alias="DB_PORT")
     db_name: str = Field(..., alias="DB_NAME")
+    # 지정하면 위 DB_* 값 대신 그대로 사용 (벤치마크/로컬 테스트용, 예: sqlite+aiosqlite:///bench.db)
+    database_url: Optional[str] = Field(None, alias="DATABASE_URL")
+    sync_database_url: Optional[str] = Field(None, alias="SYNC_DATABASE_URL")
+
+    # 커넥션 풀 설정 (엔진마다 적용)
+    # 워커 수 x (pool_size + max_overflow) 가 MySQL max_connections 보다 작아야 함
+    db_pool_size: int = Field(5, alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(10, alias="DB_MAX_OVERFLOW")
+    db_pool_timeout: float = Field(30, alias="DB_POOL_TIMEOUT")     # 커넥션 대기 최대 시간(초)
+    db_pool_recycle: int = Field(1800, alias="DB_POOL_RECYCLE")     # 이 시간(초)이 지난 커넥션은 새로 연결 (MySQL wait_timeout 보다 짧게)
+    db_pool_pre_ping: bool = Field(True, alias="DB_POOL_PRE_PING")  # 사용 전 커넥션 상태 확인
+
+    # 읽기 전용 복제본(replica) DB URL 목록 (쉼표로 구분, 비우면 모든 조회를 기본 DB에서 처리)
+    # 복제본 상태 확인 주기(초), 쓰기 요청 후 같은 클라이언트의 조회를 기본 DB로 보내는 시간(초, 복제 지연보다 길게)
+    replica_database_urls: str = Field("", alias="REPLICA_DATABASE_URLS")
+    replica_health_interval: float = Field(5, alias="REPLICA_HEALTH_INTERVAL")
+    read_your_writes_window: float = Field(5, alias="READ_YOUR_WRITES_WINDOW")
+
+    # 시작 시 DB 스키마 리비전 확인 (strict = 최신이 아니면 시작 중단 / warn = 경고만 / off = 확인 안 함)
+    schema_check: Literal["strict", "warn", "off"] = Field("strict", alias="SCHEMA_CHECK")
 
     secret_key: str = Field(..., alias="SECRET_KEY")
     jwt_algo: str = Field("HS256", alias="JWT_ALGORITHM")
     access_token_expire: int = Field(6000, alias="ACCESS_TOKEN_EXPIRE")
     refresh_token_expire: int = Field(604800, alias="REFRESH_TOKEN_EXPIRE")
 
+    # 요청 계측 : 응답에 Server-Timing 헤더 추가 여부, 느린 요청 기준(ms), 프로파일 샘플링 비율(0 = 끔)
+    server_timing: bool = Field(False, alias="SERVER_TIMING")
+    slow_request_ms: float = Field(1000, alias="SLOW_REQUEST_MS")
+    profile_sample_rate: float = Field(0.0, alias="PROFILE_SAMPLE_RATE")
+
+    # 비밀번호 해시(bcrypt) 전용 워커 풀 크기 / 대기 가능한 최대 작업 수
+    pwd_hash_workers: int = Field(4, alias="PWD_HASH_WORKERS")
+    pwd_hash_max_pending: int = Field(64, alias="PWD_HASH_MAX_PENDING")
+
+    # 인증 사용자(id, role) 캐시 유효 시간(초) / 최대 항목 수
+    user_cache_ttl: int = Field(30, alias="USER_CACHE_TTL")
+    user_cache_size: int = Field(10000, alias="USER_CACHE_SIZE")
+
+    # username / email 사용 가능 여부 확인용 블룸 필터 : 예상 최대 사용자 수, 오탐률(오탐이면 DB로 확인),
+    # 다른 워커에서 가입한 사용자를 반영하는 주기(초), 전체를 다시 읽어 필터를 새로 만드는 주기(초)
+    availability_capacity: int = Field(1_000_000, alias="AVAILABILITY_CAPACITY")
+    availability_error_rate: float = Field(0.001, alias="AVAILABILITY_ERROR_RATE")
+    availability_refresh_interval: float = Field(60, alias="AVAILABILITY_REFRESH_INTERVAL")
+    availability_rebuild_interval: float = Field(3600, alias="AVAILABILITY_REBUILD_INTERVAL")
+
+    # 검증된 access token -> claims 캐시 최대 항목 수 (0 = 사용 안 함, 항목은 토큰 만료(exp) 시각에 제거)
+    token_cache_size: int = Field(50000, alias="TOKEN_CACHE_SIZE")
+
+    # 목록 응답(노래 목록 페이지, 내 플레이리스트 목록)을 ORM 객체/pydantic 검증 없이 DB 행에서 바로 JSON 으로 변환 (orjson 사용)
+    fast_json: bool = Field(False, alias="FAST_JSON")
+
+    # 노래 응답 캐시 : 저장소(memory / redis), 유효 시간(초), 메모리 저장소 최대 항목 수
+    cache_backend: str = Field("memory", alias="CACHE_BACKEND")
+    cache_ttl: int = Field(300, alias="CACHE_TTL")
+    cache_max_entries: int = Field(10000, alias="CACHE_MAX_ENTRIES")
+    redis_url: str = Field("redis://localhost:6379/0", alias="REDIS_URL")
+
+    # 재생 기록 수집 : 대기열 최대 크기(가득 차면 503), 한 번에 저장할 최대 개수, 최대 대기 시간(초)
+    play_queue_size: int = Field(10000, alias="PLAY_QUEUE_SIZE")
+    play_flush_size: int = Field(500, alias="PLAY_FLUSH_SIZE")
+    play_flush_interval: float = Field(1.0, alias="PLAY_FLUSH_INTERVAL")
+
+    # 차트 : 기간별로 미리 계산해 둘 순위 수, 다시 계산하는 주기(초)
+    chart_size: int = Field(100, alias="CHART_SIZE")
+    chart_refresh_interval: float = Field(60, alias="CHART_REFRESH_INTERVAL")
+
+    # 비슷한 노래 추천 (플레이리스트에 함께 담긴 횟수 기반, numpy/scipy 사용)
+    # 노래마다 보관할 비슷한 노래 수, 다시 계산(또는 색인 파일을 다시 확인)하는 주기(초, ±10% 지터),
+    # 이보다 노래가 많은 플레이리스트는 제외, DB에서 한 번에 읽을 행 수
+    similar_top_k: int = Field(20, alias="SIMILAR_TOP_K")
+    similar_refresh_interval: float = Field(3600, alias="SIMILAR_REFRESH_INTERVAL")
+    similar_max_playlist_size: int = Field(1000, alias="SIMILAR_MAX_PLAYLIST_SIZE")
+    similar_chunk_size: int = Field(100_000, alias="SIMILAR_CHUNK_SIZE")
+    # 스케줄 작업(python -m app.cli.build_similar_index)이 저장한 색인 파일 경로
+    # 비워 두면 워커마다 시작할 때와 주기마다 playlist_songs 전체를 스캔해 직접 계산함
+    # (DB 부하와 메모리가 워커 수만큼 늘고, 워커가 시작할 때마다 전체 계산 비용을 냄)
+    similar_index_path: Optional[str] = Field(None, alias="SIMILAR_INDEX_PATH")
+
+    # 노래 일괄 등록 시 한 트랜잭션(INSERT 한 번)에 넣을 행 수
+    ingest_chunk_size: int = Field(1000, alias="INGEST_CHUNK_SIZE")
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -29,12 +106,16 @@ class Settings(BaseSettings):
 
     @property
     def db_url(self) -> str :   # 비동기 DB URL
-        return f"mysql+asyncmy://{self.tmp_db}"
+        return self.database_url or f"mysql+asyncmy://{self.tmp_db}"
     
     @property
     def sync_db_url(self) -> str :  # 동기 DB URL
-        return f"mysql+pymysql://{self.tmp_db}"
+        return self.sync_database_url or f"mysql+pymysql://{self.tmp_db}"
     
+    @property
+    def replica_urls(self) -> list[str] :  # 복제본 비동기 DB URL 목록
+        return [url.strip() for url in self.replica_database_urls.split(",") if url.strip()]
+
     @property
     def access_token(self) :
         return timedelta(seconds=self.access_token_expire)
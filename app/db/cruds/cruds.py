@@ -1,8 +1,12 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.models.models import User, Song, Playlist
-from app.db.schemas.schemas import UserCreate, UserUpdate, SongCreate, SongUpdate, PlaylistCreate, PlaylistUpdate
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from datetime import date, datetime
+from app.db.models.models import User, Song, Playlist, PlaylistSong, RefreshToken, Play, SongPlayDaily, SongPlayTotal
+from app.db.schemas.schemas import UserCreate, UserUpdate, SongCreate, SongUpdate, SongSort, PlaylistCreate, PlaylistUpdate
+from sqlalchemy import select, insert, update, delete, func, or_, and_, case
+from sqlalchemy.orm import selectinload, joinedload
+from sqlalchemy.dialects.mysql import match, insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.core.cache import user_cache
 
 # 1. User와 관련된 CRUD 기능 클래스
 class UserCrud:
@@ -29,21 +33,50 @@ class UserCrud:
         if db_user:
             await db.delete(db_user)
             await db.flush()
+            user_cache.set(id, None)    # 삭제된 사용자로 캐시
             return db_user
         return None
     
-    # username 값 얻어오기
-    @staticmethod
-    async def get_username(db: AsyncSession, username: str):
-        result = await db.execute(select(User).filter(User.username == username))
-        return result.scalar_one_or_none()
-    
     # email 값 얻어오기
     @staticmethod
     async def get_email(db: AsyncSession, email: str):
         result = await db.execute(select(User).filter(User.email == email))
         return result.scalar_one_or_none()
     
+    # username / email 중 이미 사용 중인 항목 이름 집합 ({"username", "email"} 의 부분집합)
+    # 한 번의 쿼리로 둘 다 확인, 대소문자는 구분하지 않음 (MySQL 기본 collation 과 같게)
+    @staticmethod
+    async def get_taken(db: AsyncSession, username: str | None = None, email: str | None = None) -> set[str]:
+        conditions = []
+        if username is not None:
+            conditions.append(User.username == username)
+        if email is not None:
+            conditions.append(User.email == email)
+        if not conditions:
+            return set()
+        result = await db.execute(select(User.username, User.email).filter(or_(*conditions)))
+        taken = set()
+        for row in result.all():
+            if username is not None and row.username.casefold() == username.casefold():
+                taken.add("username")
+            if email is not None and row.email.casefold() == email.casefold():
+                taken.add("email")
+        return taken
+
+    # id 가 after_id 보다 큰 사용자의 (id, username, email) 을 id 순으로 limit 개 (사용 가능 여부 색인용)
+    @staticmethod
+    async def get_identities_after(db: AsyncSession, after_id: int, limit: int):
+        result = await db.execute(
+            select(User.id, User.username, User.email).filter(User.id > after_id).order_by(User.id).limit(limit)
+        )
+        return result.all()
+
+    # 주어진 id 중 실제로 존재하는 사용자 id 조회 : select id from users where id in (...)
+    @staticmethod
+    async def get_existing_ids(db:AsyncSession, ids:list[int]) -> set[int]:
+        result = await db.execute(select(User.id).filter(User.id.in_(ids)))
+        return set(result.scalars().all())
+
     # 수정
     @staticmethod
     async def update_by_id(db:AsyncSession, id:int, user:UserUpdate):
@@ -54,18 +87,10 @@ class UserCrud:
             for i, j in update_user.items():
                 setattr(db_user, i, j)
             await db.flush()
+            user_cache.delete(id)   # 캐시된 사용자 정보 무효화
             return db_user
         return None
     
-    # id로 사용자 조회해서 존재하면 refresh_token 업데이트
-    @staticmethod
-    async def update_refresh_token_id(db:AsyncSession, id:int, refresh_token:str):
-        db_user = await db.get(User, id)
-        if db_user:
-            db_user.refresh_token = refresh_token
-            await db.flush()
-        return db_user
-    
 
 # 2. Song과 관련된 CRUD 기능 클래스
 class SongCrud:
@@ -84,34 +109,113 @@ class SongCrud:
         await db.flush()
         return db_song
     
-    # 모든 노래 목록 조회
+    # 여러 노래 한 번에 생성 : insert into songs (...) values (...), (...), ...
     @staticmethod
-    async def get_all(db:AsyncSession) -> list[Song]:
-        result = await db.execute(select(Song))
+    async def bulk_create(db:AsyncSession, songs:list[dict]) -> None:
+        await db.execute(insert(Song), songs)
+
+    # 노래 목록 한 페이지 조회 (keyset 페이지네이션)
+    # after : 이전 페이지 마지막 행의 정렬 키 (id 정렬 = [id], title 정렬 = [title, id])
+    # 다음 페이지 존재 여부를 알기 위해 limit + 1 개까지 조회
+    @staticmethod
+    async def get_page(db:AsyncSession, limit:int, sort:SongSort, after:list | None = None) -> list[Song]:
+        result = await db.execute(SongCrud._page_stmt(select(Song), limit, sort, after))
         return result.scalars().all()
+
+    # 목록 페이지 조회 (ORM 객체 대신 행으로, 빠른 JSON 응답용)
+    # 컬럼 순서는 SongRead 출력과 같게 (title, artist, duration, id)
+    @staticmethod
+    async def get_page_rows(db:AsyncSession, limit:int, sort:SongSort, after:list | None = None):
+        stmt = select(Song.title, Song.artist, Song.duration, Song.id)
+        result = await db.execute(SongCrud._page_stmt(stmt, limit, sort, after))
+        return result.all()
+
+    # 목록 페이지 조회 조건 : 정렬 순서 + 커서 이후 + limit 보다 하나 더 (다음 페이지 존재 여부 확인용)
+    @staticmethod
+    def _page_stmt(stmt, limit:int, sort:SongSort, after:list | None = None):
+        if sort == SongSort.TITLE:
+            if after:
+                title, id = after
+                stmt = stmt.filter(or_(Song.title > title, and_(Song.title == title, Song.id > id)))
+            stmt = stmt.order_by(Song.title, Song.id)
+        else:
+            if after:
+                stmt = stmt.filter(Song.id > after[0])
+            stmt = stmt.order_by(Song.id)
+        return stmt.limit(limit + 1)
+
+    # 제목/가수 검색 (terms : 검색어를 단어 단위로 나눈 목록, 모든 단어가 포함된 노래만 반환)
+    # MySQL : FULLTEXT 인덱스로 접두어 검색(단어*) 후 관련도 순 정렬
+    # 그 외 DB(로컬 테스트용 SQLite 등) : LIKE 검색으로 대체
+    @staticmethod
+    async def search(db:AsyncSession, terms:list[str], limit:int) -> list[Song]:
+        if db.get_bind().dialect.name == "mysql":
+            score = match(
+                Song.title, Song.artist, against=" ".join(f"+{term}*" for term in terms)
+            ).in_boolean_mode()
+            stmt = select(Song).filter(score).order_by(score.desc(), Song.id)
+        else:
+            conditions = [
+                or_(Song.title.contains(term, autoescape=True), Song.artist.contains(term, autoescape=True))
+                for term in terms
+            ]
+            stmt = select(Song).filter(*conditions).order_by(Song.title, Song.id)
+        result = await db.execute(stmt.limit(limit))
+        return result.scalars().all()
+
+    # 여러 id의 노래 한 번에 조회 : select * from songs where id in (...) (순서 보장 안 됨)
+    @staticmethod
+    async def get_by_ids(db:AsyncSession, ids:list[int]) -> list[Song]:
+        result = await db.execute(select(Song).filter(Song.id.in_(ids)))
+        return result.scalars().all()
+
+    # 주어진 id 중 실제로 존재하는 노래 id 조회 : select id from songs where id in (...)
+    @staticmethod
+    async def get_existing_ids(db:AsyncSession, ids:list[int]) -> set[int]:
+        result = await db.execute(select(Song.id).filter(Song.id.in_(ids)))
+        return set(result.scalars().all())
+
+    # 전체 노래를 서버 측 커서로 batch_size 개씩 나눠서 반환 (ORM 객체 대신 dict 형태의 행)
+    # 전체 목록을 메모리에 올리지 않으므로 카탈로그 크기와 관계없이 메모리 사용량이 일정함
+    @staticmethod
+    async def stream_all(db:AsyncSession, batch_size:int = 1000):
+        stmt = (
+            select(Song.id, Song.title, Song.artist, Song.duration)
+            .order_by(Song.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await db.stream(stmt)
+        async for rows in result.mappings().partitions():
+            yield rows
     
     # 삭제
     @staticmethod
     async def delete_by_id(db:AsyncSession, id:int):
         db_song = await db.get(Song, id)
         if db_song:
+            await PlayCrud.delete_by_song_id(db, id)    # 재생 기록 / 집계 (FK) 먼저 삭제
             await db.delete(db_song)
             await db.flush()
             return db_song
         return None
     
     # 수정
+    # PATCH (요청에서 전달된 필드만 업데이트), 없는 노래면 None
+    # UPDATE ... RETURNING 을 지원하는 DB(SQLite, PostgreSQL 등)는 UPDATE 한 번으로 수정된 행까지 받고,
+    # 지원하지 않는 DB(MySQL)는 수정된 행이 있을 때만 기본키로 다시 조회
     @staticmethod
-    async def update_by_id(db:AsyncSession, id:int, song:SongUpdate):
-        db_song = await db.get(Song, id)
-        if db_song:
-            # PATCH (요청에서 전달된 필드만 업데이트)
-            update_song = song.model_dump(exclude_unset=True)   
-            for i, j in update_song.items():
-                setattr(db_song, i, j)
-            await db.flush()
-            return db_song
-        return None
+    async def update_by_id(db:AsyncSession, id:int, song:SongUpdate) -> Song | None:
+        update_song = song.model_dump(exclude_unset=True)
+        if not update_song:
+            return await db.get(Song, id)
+        stmt = update(Song).filter(Song.id == id).values(**update_song)
+        if db.get_bind().dialect.update_returning:
+            result = await db.execute(stmt.returning(Song))
+            return result.scalar_one_or_none()
+        result = await db.execute(stmt)
+        if result.rowcount == 0:
+            return None
+        return await db.get(Song, id)
 
 
 # 3. Playlist와 관련된 CRUD 기능 클래스
@@ -120,80 +224,310 @@ class PlaylistCrud:
     # id로 조회 : select * from playlists where id = :id
     @staticmethod
     async def get_id(db:AsyncSession, id:int) -> Playlist | None:
-        # user, songs 관계를 즉시 로딩하도록 옵션 추가
+        # user, songs 관계를 즉시 로딩하도록 옵션 추가 (user는 N:1 이므로 JOIN으로 같은 쿼리에서 로딩)
         stmt = (
             select(Playlist)
             .options(
-                selectinload(Playlist.user), 
+                joinedload(Playlist.user), 
                 selectinload(Playlist.songs)
             )
             .filter(Playlist.id == id)
         )
         result = await db.execute(stmt)
         return result.scalar_one_or_none()
+
+    # 플레이리스트 소유자 id만 조회 (없으면 None)
+    @staticmethod
+    async def get_owner_id(db:AsyncSession, id:int) -> int | None:
+        result = await db.execute(select(Playlist.user_id).filter(Playlist.id == id))
+        return result.scalar_one_or_none()
     
     # 생성
+    # 응답에 필요한 관계를 미리 채워 두어 commit 후 다시 조회하지 않음
+    # (소유자는 기본키 조회 한 번, 새 플레이리스트의 노래 목록은 빈 목록)
     @staticmethod
     async def create(db:AsyncSession, playlist:PlaylistCreate, user_id:int) -> Playlist :
-        db_playlist = Playlist(**playlist.model_dump(), user_id=user_id)
+        owner = await db.get(User, user_id)
+        db_playlist = Playlist(**playlist.model_dump(), user_id=user_id, user=owner, songs=[])
         db.add(db_playlist)
         await db.flush()
         return db_playlist
     
-    # 특정 사용자의 모든 플레이리스트 조회
+    # 특정 사용자의 모든 플레이리스트 요약 조회
+    # 노래 목록 대신 곡 수와 총 재생 시간을 SQL 집계로 계산 (노래 행은 가져오지 않음)
     @staticmethod
-    async def get_all_by_user_id(db: AsyncSession, user_id: int) -> list[Playlist]:
-        # user, songs 관계를 즉시 로딩하도록 옵션 추가
+    async def get_summaries_by_user_id(db: AsyncSession, user_id: int):
         stmt = (
-            select(Playlist)
-            .options(
-                selectinload(Playlist.user), 
-                selectinload(Playlist.songs)
+            select(
+                Playlist.name,
+                Playlist.desc,
+                Playlist.id,
+                func.count(Song.id).label("song_count"),
+                func.coalesce(func.sum(Song.duration), 0).label("total_duration"),
             )
+            .outerjoin(PlaylistSong, PlaylistSong.playlist_id == Playlist.id)
+            .outerjoin(Song, Song.id == PlaylistSong.song_id)
             .filter(Playlist.user_id == user_id)
+            .group_by(Playlist.id)
+            .order_by(Playlist.id)
         )
         result = await db.execute(stmt)
-        return result.scalars().all()
+        return result.mappings().all()
     
-    # 삭제
+    # 소유자 조건을 포함한 삭제 : delete from playlists where id = :id and user_id = :user_id
+    # 연결 테이블(playlist_songs)의 행을 먼저 지우고, 삭제 여부(True/False) 반환
     @staticmethod
-    async def delete_by_id(db:AsyncSession, id:int):
-        db_playlist = await db.get(Playlist, id)
-        if db_playlist:
-            await db.delete(db_playlist)
-            await db.flush()
-            return db_playlist
-        return None
-    
-    # 수정
+    async def delete_owned(db:AsyncSession, id:int, user_id:int) -> bool:
+        owned = select(Playlist.id).filter(Playlist.id == id, Playlist.user_id == user_id)
+        await db.execute(delete(PlaylistSong).filter(PlaylistSong.playlist_id.in_(owned)))
+        result = await db.execute(
+            delete(Playlist).filter(Playlist.id == id, Playlist.user_id == user_id)
+        )
+        return result.rowcount > 0
+
+    # 이미 로드된 플레이리스트 객체 수정 (다시 조회하지 않음)
     @staticmethod
-    async def update_by_id(db:AsyncSession, id:int, playlist:PlaylistUpdate):
-        db_playlist = await db.get(Playlist, id)
-        if db_playlist:
-            # PATCH (요청에서 전달된 필드만 업데이트)
-            update_playlist = playlist.model_dump(exclude_unset=True)   
-            for i, j in update_playlist.items():
-                setattr(db_playlist, i, j)
-            await db.flush()
-            return db_playlist
-        return None
+    async def update(db:AsyncSession, db_playlist:Playlist, playlist:PlaylistUpdate) -> Playlist:
+        update_playlist = playlist.model_dump(exclude_unset=True)
+        for i, j in update_playlist.items():
+            setattr(db_playlist, i, j)
+        await db.flush()
+        return db_playlist
 
 
 # 4. 플레이리스트에서 노래 추가/제거하는 CRUD 기능 클래스
+# 플레이리스트의 노래 목록 전체를 불러오지 않고 연결 테이블(playlist_songs)에 직접 INSERT/DELETE
 class PlaylistSongCrud:
+    # 위치(position) 간격 : 사이에 끼워 넣을 자리가 없을 때만 플레이리스트 전체 위치를 다시 매김
+    POSITION_GAP = 1024
 
-    # 플레이리스트에 노래 추가
+    # 플레이리스트의 노래 수와 마지막 위치 (노래가 없으면 (0, 0))
     @staticmethod
-    async def add_song_to_playlist(db: AsyncSession, playlist: Playlist, song: Song) -> Playlist:
-        if song not in playlist.songs:
-            playlist.songs.append(song)
-            await db.flush()
-        return playlist
+    async def get_size_and_last_position(db: AsyncSession, playlist_id: int) -> tuple[int, int]:
+        result = await db.execute(
+            select(func.count(), func.max(PlaylistSong.position)).filter(PlaylistSong.playlist_id == playlist_id)
+        )
+        size, last = result.one()
+        return size, last or 0
 
-    # 플레이리스트에서 노래 제거
+    # 플레이리스트 끝에 노래 여러 개 추가 : insert ignore into playlist_songs values (...), (...)
+    # 이미 들어 있는 노래는 (playlist_id, song_id) PK 중복으로 무시됨
+    # (실제로 추가된 행 수, 추가 후 플레이리스트의 노래 수) 반환
     @staticmethod
-    async def remove_song_from_playlist(db: AsyncSession, playlist: Playlist, song: Song) -> Playlist:
-        if song in playlist.songs:
-            playlist.songs.remove(song)
-            await db.flush()
-        return playlist
+    async def add_songs(db: AsyncSession, playlist_id: int, song_ids: list[int]) -> tuple[int, int]:
+        size, last = await PlaylistSongCrud.get_size_and_last_position(db, playlist_id)
+        gap = PlaylistSongCrud.POSITION_GAP
+        stmt = (
+            insert(PlaylistSong)
+            .values([
+                {"playlist_id": playlist_id, "song_id": song_id, "position": last + gap * (i + 1)}
+                for i, song_id in enumerate(song_ids)
+            ])
+            .prefix_with("IGNORE", dialect="mysql")
+            .prefix_with("OR IGNORE", dialect="sqlite")
+        )
+        result = await db.execute(stmt)
+        return result.rowcount, size + result.rowcount
+
+    # 플레이리스트의 노래 한 페이지 조회 ((position, song_id) 기준 keyset 페이지네이션, limit + 1 개까지 조회)
+    # (노래, 위치) 목록 반환
+    @staticmethod
+    async def get_songs_page(db: AsyncSession, playlist_id: int, limit: int, after: list | None = None) -> list:
+        stmt = (
+            select(Song, PlaylistSong.position)
+            .join(PlaylistSong, PlaylistSong.song_id == Song.id)
+            .filter(PlaylistSong.playlist_id == playlist_id)
+        )
+        if after:
+            position, song_id = after
+            stmt = stmt.filter(or_(
+                PlaylistSong.position > position,
+                and_(PlaylistSong.position == position, PlaylistSong.song_id > song_id),
+            ))
+        result = await db.execute(
+            stmt.order_by(PlaylistSong.position, PlaylistSong.song_id).limit(limit + 1)
+        )
+        return result.all()
+
+    # 플레이리스트의 노래 id 목록 (순서대로)
+    @staticmethod
+    async def get_song_ids(db: AsyncSession, playlist_id: int) -> list[int]:
+        result = await db.execute(
+            select(PlaylistSong.song_id)
+            .filter(PlaylistSong.playlist_id == playlist_id)
+            .order_by(PlaylistSong.position, PlaylistSong.song_id)
+        )
+        return result.scalars().all()
+
+    # 노래 하나의 위치 조회 (플레이리스트에 없으면 None)
+    @staticmethod
+    async def get_position(db: AsyncSession, playlist_id: int, song_id: int) -> int | None:
+        result = await db.execute(
+            select(PlaylistSong.position).filter(
+                PlaylistSong.playlist_id == playlist_id, PlaylistSong.song_id == song_id
+            )
+        )
+        return result.scalar()
+
+    # 기준 위치(position, song_id) 바로 다음 노래의 위치 (moving_id 는 제외, 기준이 None 이면 첫 번째)
+    @staticmethod
+    async def get_next_position(db: AsyncSession, playlist_id: int, moving_id: int, after: tuple | None) -> int | None:
+        stmt = select(PlaylistSong.position).filter(
+            PlaylistSong.playlist_id == playlist_id, PlaylistSong.song_id != moving_id
+        )
+        if after is not None:
+            position, song_id = after
+            stmt = stmt.filter(or_(
+                PlaylistSong.position > position,
+                and_(PlaylistSong.position == position, PlaylistSong.song_id > song_id),
+            ))
+        result = await db.execute(stmt.order_by(PlaylistSong.position, PlaylistSong.song_id).limit(1))
+        return result.scalar()
+
+    # 노래 하나의 위치 변경 (한 행만 UPDATE)
+    @staticmethod
+    async def set_position(db: AsyncSession, playlist_id: int, song_id: int, position: int) -> int:
+        result = await db.execute(
+            update(PlaylistSong)
+            .filter(PlaylistSong.playlist_id == playlist_id, PlaylistSong.song_id == song_id)
+            .values(position=position)
+        )
+        return result.rowcount
+
+    # 주어진 순서대로 위치를 POSITION_GAP 간격으로 다시 매김 (한 번의 UPDATE ... CASE)
+    # song_ids 는 플레이리스트의 전체 노래 목록이어야 함
+    @staticmethod
+    async def renumber(db: AsyncSession, playlist_id: int, song_ids: list[int]) -> int:
+        if not song_ids:
+            return 0
+        gap = PlaylistSongCrud.POSITION_GAP
+        positions = case(
+            {song_id: gap * (i + 1) for i, song_id in enumerate(song_ids)},
+            value=PlaylistSong.song_id,
+        )
+        result = await db.execute(
+            update(PlaylistSong)
+            .filter(PlaylistSong.playlist_id == playlist_id, PlaylistSong.song_id.in_(song_ids))
+            .values(position=positions)
+        )
+        return result.rowcount
+
+    # 플레이리스트에서 노래 여러 개 제거 : delete from playlist_songs where playlist_id = :id and song_id in (...)
+    # 남은 노래의 위치는 그대로 두며(간격만 생김), 실제로 제거된 행 수 반환
+    @staticmethod
+    async def remove_songs(db: AsyncSession, playlist_id: int, song_ids: list[int]) -> int:
+        result = await db.execute(
+            delete(PlaylistSong).filter(
+                PlaylistSong.playlist_id == playlist_id,
+                PlaylistSong.song_id.in_(song_ids),
+            )
+        )
+        return result.rowcount
+
+    # (playlist_id, song_id) 쌍을 PK 순서로 limit 개씩 조회 (after : 이전 묶음의 마지막 쌍, 비슷한 노래 색인용)
+    @staticmethod
+    async def get_pairs_after(db: AsyncSession, after: tuple[int, int] | None, limit: int):
+        stmt = select(PlaylistSong.playlist_id, PlaylistSong.song_id)
+        if after:
+            playlist_id, song_id = after
+            stmt = stmt.filter(or_(
+                PlaylistSong.playlist_id > playlist_id,
+                and_(PlaylistSong.playlist_id == playlist_id, PlaylistSong.song_id > song_id),
+            ))
+        result = await db.execute(stmt.order_by(PlaylistSong.playlist_id, PlaylistSong.song_id).limit(limit))
+        return result.all()
+
+
+# 5. RefreshToken과 관련된 CRUD 기능 클래스
+class RefreshTokenCrud:
+
+    # 발급한 refresh token 기록
+    @staticmethod
+    async def create(db: AsyncSession, jti: str, user_id: int, family_id: str, expires_at: datetime) -> None:
+        await db.execute(
+            insert(RefreshToken).values(jti=jti, user_id=user_id, family_id=family_id, expires_at=expires_at)
+        )
+
+    # 토큰 사용(교체) 처리 : 아직 사용되지 않은 유효한 토큰이면 revoked 로 바꾸고 True 반환
+    # update ... where jti = :jti and revoked = false 한 번으로 확인과 변경을 같이 하므로
+    # 같은 토큰으로 동시에 요청해도 하나만 성공함
+    @staticmethod
+    async def consume(db: AsyncSession, jti: str, now: datetime) -> bool:
+        result = await db.execute(
+            update(RefreshToken)
+            .filter(RefreshToken.jti == jti, RefreshToken.revoked.is_(False), RefreshToken.expires_at > now)
+            .values(revoked=True)
+        )
+        return result.rowcount == 1
+
+    # family 의 모든 토큰 폐기 (로그아웃, 재사용 감지 시)
+    @staticmethod
+    async def revoke_family(db: AsyncSession, family_id: str) -> int:
+        result = await db.execute(
+            update(RefreshToken)
+            .filter(RefreshToken.family_id == family_id, RefreshToken.revoked.is_(False))
+            .values(revoked=True)
+        )
+        return result.rowcount
+
+
+# 6. Play(재생 기록)와 관련된 CRUD 기능 클래스
+class PlayCrud:
+
+    # 재생 기록 여러 개 한 번에 저장 : insert into plays (...) values (...), (...), ...
+    @staticmethod
+    async def bulk_create(db: AsyncSession, plays: list[dict]) -> None:
+        await db.execute(insert(Play), plays)
+
+    # 집계 테이블에 재생 수 더하기 (행이 없으면 생성) - 재생 기록 저장과 같은 트랜잭션에서 호출
+    # daily : [{"song_id", "day", "play_count"}], totals : [{"song_id", "play_count"}]
+    # MySQL : insert ... on duplicate key update / 그 외(SQLite) : insert ... on conflict do update
+    @staticmethod
+    async def add_play_counts(db: AsyncSession, daily: list[dict], totals: list[dict]) -> None:
+        for model, rows, keys in (
+            (SongPlayDaily, daily, ["song_id", "day"]),
+            (SongPlayTotal, totals, ["song_id"]),
+        ):
+            if db.get_bind().dialect.name == "mysql":
+                stmt = mysql_insert(model).values(rows)
+                stmt = stmt.on_duplicate_key_update(play_count=model.play_count + stmt.inserted.play_count)
+            else:
+                stmt = sqlite_insert(model).values(rows)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=keys, set_={"play_count": model.play_count + stmt.excluded.play_count}
+                )
+            await db.execute(stmt)
+
+    # 기간(start ~ end 날짜)의 재생 수 상위 노래 : 일별 집계 테이블의 합계 순 (노래, 재생 수) 목록
+    @staticmethod
+    async def get_period_chart(db: AsyncSession, start: date, end: date, limit: int, artist: str | None = None) -> list:
+        counts = (
+            select(SongPlayDaily.song_id, func.sum(SongPlayDaily.play_count).label("play_count"))
+            .filter(SongPlayDaily.day >= start, SongPlayDaily.day <= end)
+            .group_by(SongPlayDaily.song_id)
+        )
+        if artist is not None:
+            counts = counts.join(Song, Song.id == SongPlayDaily.song_id).filter(Song.artist == artist)
+        counts = counts.subquery()
+        result = await db.execute(
+            select(Song, counts.c.play_count)
+            .join(counts, counts.c.song_id == Song.id)
+            .order_by(counts.c.play_count.desc(), Song.id)
+            .limit(limit)
+        )
+        return result.all()
+
+    # 전체 기간 재생 수 상위 노래 (노래, 재생 수) 목록
+    @staticmethod
+    async def get_total_chart(db: AsyncSession, limit: int, artist: str | None = None) -> list:
+        stmt = select(Song, SongPlayTotal.play_count).join(SongPlayTotal, SongPlayTotal.song_id == Song.id)
+        if artist is not None:
+            stmt = stmt.filter(Song.artist == artist)
+        result = await db.execute(stmt.order_by(SongPlayTotal.play_count.desc(), Song.id).limit(limit))
+        return result.all()
+
+    # 노래의 재생 기록과 집계 삭제 (노래 삭제 전에 호출)
+    @staticmethod
+    async def delete_by_song_id(db: AsyncSession, song_id: int) -> None:
+        for model in (Play, SongPlayDaily, SongPlayTotal):
+            await db.execute(delete(model).filter(model.song_id == song_id))
@@ -1,27 +1,255 @@
+import asyncio
+import logging
+import time
+from fastapi import Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.core.settings import settings
+from app.core.metrics import Counter, Gauge, Histogram
+from app.core.instrumentation import instrument_engine
 
 # database.py : 데이터베이스 연결 및 세션 관리 모듈
 # SQLAlchemy를 사용하여 비동기 및 동기 데이터베이스 엔진과 세션 로컬을 설정.
+# 읽기 전용 복제본(REPLICA_DATABASE_URLS)이 있으면 조회 전용 라우트는 get_read_db 로 복제본 세션을 받음.
+
+logger = logging.getLogger("app.db")
+
+# 커넥션 풀 지표
+POOL_CHECKOUTS = Counter("db_pool_checkouts_total", "Connections checked out of the pool")
+POOL_CONNECTS = Counter("db_pool_connects_total", "New DBAPI connections opened by the pool")
+POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+POOL_SIZE = Gauge("db_pool_size", "Configured pool size")
+POOL_IN_USE = Gauge("db_pool_connections_in_use", "Connections currently checked out")
+POOL_IDLE = Gauge("db_pool_connections_idle", "Idle connections kept in the pool")
+POOL_OVERFLOW = Gauge("db_pool_overflow", "Connections opened beyond pool_size (negative = not yet opened)")
+
+# 읽기/쓰기 분리 지표
+REPLICA_HEALTHY = Gauge("db_replica_healthy", "1 if the replica passed its last health check, else 0")
+READ_SESSIONS = Counter("db_read_sessions_total", "Read-only sessions by target (replica / primary / pinned / fallback)")
+
+
+# 커넥션을 얻기까지 기다린 시간을 기록하는 풀 (비동기 / 동기)
+class _TimedPoolMixin:
+    label = "default"
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            POOL_WAIT.observe(time.perf_counter() - start, engine=self.label)
+
+    # engine.dispose() 등으로 풀이 다시 만들어져도 이름 유지 (이벤트는 SQLAlchemy가 옮겨줌)
+    def recreate(self):
+        pool = super().recreate()
+        pool.label = self.label
+        return pool
+
+class InstrumentedAsyncPool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+class InstrumentedPool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+# 엔진 생성 시 공통 풀 설정 (.env 로 조정)
+def _pool_options() -> dict:
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+# 엔진의 풀에 지표 수집용 이벤트 등록
+def instrument_pool(engine, label: str) -> None:
+    pool = engine.pool
+    pool.label = label
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_conn, conn_record, conn_proxy):
+        POOL_CHECKOUTS.inc(engine=label)
+
+    @event.listens_for(pool, "connect")
+    def _on_connect(dbapi_conn, conn_record):
+        POOL_CONNECTS.inc(engine=label)
+
+    POOL_SIZE.set_function(lambda: engine.pool.size(), engine=label)
+    POOL_IN_USE.set_function(lambda: engine.pool.checkedout(), engine=label)
+    POOL_IDLE.set_function(lambda: engine.pool.checkedin(), engine=label)
+    POOL_OVERFLOW.set_function(lambda: engine.pool.overflow(), engine=label)
+
 
 # 비동기 엔진 설정
-async_engine = create_async_engine(settings.db_url, echo=False)
+async_engine = create_async_engine(
+    settings.db_url, echo=False, poolclass=InstrumentedAsyncPool, **_pool_options()
+)
+instrument_pool(async_engine.sync_engine, "async")
+instrument_engine(async_engine.sync_engine, "async")
 
 # 비동기 세션 설정
+# expire_on_commit=False : commit 후에도 객체 값을 유지하여, 응답을 만들 때 다시 SELECT(refresh) 하지 않음
 AsyncSessionLocal = sessionmaker(
-    autocommit=False, autoflush=False, bind=async_engine, class_=AsyncSession
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=async_engine, class_=AsyncSession
 )
 
-# 동기 엔진 설정
-sync_engine = create_engine(settings.sync_db_url, pool_pre_ping=True)
+# 동기 엔진 설정 : 벤치마크/스크립트에서만 쓰므로 처음 사용할 때 생성 (API 워커는 동기 드라이버를 import 하지 않음)
+_sync_engine = None
+
+def get_sync_engine():
+    global _sync_engine
+    if _sync_engine is None:
+        _sync_engine = create_engine(settings.sync_db_url, poolclass=InstrumentedPool, **_pool_options())
+        instrument_pool(_sync_engine, "sync")
+        instrument_engine(_sync_engine, "sync")
+    return _sync_engine
+
+# 기존 코드 호환 : from app.db.database import sync_engine
+def __getattr__(name: str):
+    if name == "sync_engine":
+        return get_sync_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # 기본 클래스 설정 (Base)
 Base = declarative_base()
 
+
+# 읽기 전용 복제본 엔진 묶음
+# 주기적으로 SELECT 1 로 상태를 확인하고, 정상인 복제본을 돌아가며 사용 (모두 비정상이면 None -> 기본 DB 사용)
+# 쿼리 중 연결이 끊긴 복제본은 다음 상태 확인까지 바로 제외
+class ReplicaSet:
+
+    def __init__(self, urls: list[str], health_interval: float):
+        self.health_interval = health_interval
+        self.engines = []
+        self.sessions = []
+        self._healthy: list[bool] = []
+        self._next = 0
+        self._task: asyncio.Task | None = None
+        for index, url in enumerate(urls):
+            label = f"replica{index}"
+            engine = create_async_engine(url, echo=False, poolclass=InstrumentedAsyncPool, **_pool_options())
+            instrument_pool(engine.sync_engine, label)
+            instrument_engine(engine.sync_engine, label)
+            self._watch_disconnects(engine.sync_engine, index)
+            self.engines.append(engine)
+            self.sessions.append(sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine, class_=AsyncSession))
+            self._healthy.append(True)
+            REPLICA_HEALTHY.set(1, replica=label)
+
+    def __bool__(self) -> bool:
+        return bool(self.engines)
+
+    def _mark(self, index: int, healthy: bool) -> None:
+        if self._healthy[index] != healthy:
+            logger.warning("replica%d is %s", index, "healthy again" if healthy else "unhealthy, not reading from it")
+        self._healthy[index] = healthy
+        REPLICA_HEALTHY.set(int(healthy), replica=f"replica{index}")
+
+    def _watch_disconnects(self, sync_engine, index: int) -> None:
+        @event.listens_for(sync_engine, "handle_error")
+        def _on_error(context):
+            if context.is_disconnect:
+                self._mark(index, False)
+
+    # 정상인 복제본의 세션 생성기 (라운드 로빈), 없으면 None
+    def pick(self):
+        for _ in range(len(self.sessions)):
+            index = self._next % len(self.sessions)
+            self._next += 1
+            if self._healthy[index]:
+                return self.sessions[index]
+        return None
+
+    # 모든 복제본 상태 확인 (제한 시간 안에 SELECT 1 이 성공하면 정상)
+    async def check(self) -> None:
+        for index, engine in enumerate(self.engines):
+            try:
+                async with engine.connect() as conn:
+                    await asyncio.wait_for(conn.execute(text("SELECT 1")), timeout=self.health_interval)
+                healthy = True
+            except Exception:
+                healthy = False
+            self._mark(index, healthy)
+
+    # 주기적 상태 확인 작업 시작 / 종료 (lifespan)
+    def start(self) -> None:
+        if self and self._task is None:
+            self._task = asyncio.create_task(self._run(), name="replica-health")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for engine in self.engines:
+            await engine.dispose()
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self.health_interval)
+
+
+replicas = ReplicaSet(settings.replica_urls, settings.replica_health_interval)
+
+# 쓰기 요청 후 이 쿠키의 시각(unix time)까지는 같은 클라이언트의 조회를 기본 DB에서 처리 (read-your-writes)
+PRIMARY_PIN_COOKIE = "db_primary_until"
+
+def _pinned_to_primary(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(PRIMARY_PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+# 조회용 세션 (요청 밖에서 쓰는 백그라운드 작업 등) : 정상인 복제본이 있으면 복제본, 없으면 기본 DB
+def read_session() -> AsyncSession:
+    factory = replicas.pick()
+    return (factory or AsyncSessionLocal)()
+
 # 비동기 세션 생성기
 async def get_db():
     async with AsyncSessionLocal() as session:
-        yield session
\ No newline at end of file
+        yield session
+
+# 조회 전용 라우트의 세션 생성기
+# 복제본이 설정되어 있으면 복제본 세션, 이 클라이언트가 최근에 쓰기를 했거나 정상인 복제본이 없으면 기본 DB 세션
+async def get_read_db(request: Request):
+    factory = None
+    if not replicas:
+        target = "primary"
+    elif _pinned_to_primary(request):
+        target = "pinned"
+    else:
+        factory = replicas.pick()
+        target = "replica" if factory else "fallback"
+    READ_SESSIONS.inc(target=target)
+    async with (factory or AsyncSessionLocal)() as session:
+        session.info["primary_pinned"] = target == "pinned"     # 응답 캐시를 건너뛸지 판단 (services/cache.py)
+        yield session
+
+# 쓰기 라우트의 세션 생성기 (기본 DB)
+# 복제본이 있으면 READ_YOUR_WRITES_WINDOW 동안 이 클라이언트의 조회도 기본 DB로 보내도록 쿠키 설정
+# (응답 전에 설정해야 하므로 쓰기 성공 여부와 관계없이 설정 - 실패해도 기본 DB에서 조회할 뿐)
+async def get_write_db(response: Response):
+    if replicas:
+        window = settings.read_your_writes_window
+        response.set_cookie(
+            key=PRIMARY_PIN_COOKIE,
+            value=f"{time.time() + window:.3f}",
+            max_age=max(1, int(window + 0.999)),
+            httponly=True,
+            samesite="lax",
+        )
+    async with AsyncSessionLocal() as session:
+        yield session
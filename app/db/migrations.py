@@ -0,0 +1,66 @@
+import logging
+from pathlib import Path
+from app.core.settings import settings
+
+# migrations.py : 시작 시 DB 스키마 리비전 확인
+# 테이블/인덱스 생성은 Alembic 마이그레이션(alembic upgrade head)으로만 하고,
+# 애플리케이션(워커)은 DB의 alembic_version 이 최신 리비전(head)인지만 확인함.
+# alembic 은 이 확인에서만 쓰므로 함수 안에서 import (워커 시작 시간 단축)
+
+logger = logging.getLogger("app.migrations")
+
+SCRIPT_LOCATION = Path(__file__).resolve().parents[2] / "alembic"
+
+
+# 마이그레이션 스크립트 기준 최신 리비전 목록
+def get_head_revisions() -> set[str]:
+    from alembic.script import ScriptDirectory
+
+    return set(ScriptDirectory(str(SCRIPT_LOCATION)).get_heads())
+
+
+# 첫 리비전 (create_all 로 만들어진 기존 DB의 스키마와 같음)
+def get_base_revision() -> str:
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory(str(SCRIPT_LOCATION)).get_base()
+
+
+# DB에 적용된 리비전 목록 (alembic_version 테이블이 없으면 빈 집합)
+def _get_current_revisions(connection) -> set[str]:
+    from alembic.runtime.migration import MigrationContext
+
+    return set(MigrationContext.configure(connection).get_current_heads())
+
+
+# 리비전 기록 없이 테이블만 있는지 (Alembic 도입 전 create_all 로 만들어진 DB)
+def _has_unversioned_tables(connection) -> bool:
+    from sqlalchemy import inspect
+
+    return inspect(connection).has_table("users")
+
+
+# DB 스키마 리비전 확인 (SCHEMA_CHECK : strict = 다르면 시작 중단 / warn = 경고만 / off = 확인 안 함)
+async def check_schema_revision(engine) -> None:
+    mode = settings.schema_check
+    if mode == "off":
+        return
+
+    async with engine.connect() as conn:
+        current = await conn.run_sync(_get_current_revisions)
+        unversioned = not current and await conn.run_sync(_has_unversioned_tables)
+    heads = get_head_revisions()
+    if current == heads:
+        return
+
+    if unversioned:
+        hint = (
+            "Alembic 도입 전(create_all)에 만들어진 DB라면 "
+            f"'alembic stamp {get_base_revision()}' 후 'alembic upgrade head' 를 실행하세요."
+        )
+    else:
+        hint = "'alembic upgrade head' 를 실행하세요."
+    message = f"DB 스키마 리비전이 최신이 아닙니다 (DB: {sorted(current) or '없음'}, 최신: {sorted(heads)}). {hint}"
+    if mode == "strict":
+        raise RuntimeError(message)
+    logger.warning(message)
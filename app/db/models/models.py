@@ -1,6 +1,6 @@
 import enum
-from typing import Optional
-from sqlalchemy import Integer, String, ForeignKey, Enum
+from datetime import date, datetime
+from sqlalchemy import BigInteger, Boolean, Date, DateTime, Integer, String, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from app.db.database import Base
 
@@ -21,8 +21,6 @@ class User(Base):
     # 2. role 컬럼 추가 (Enum 사용, 기본값은 USER)
     role: Mapped[UserRole] = mapped_column(Enum(UserRole), default=UserRole.USER)
 
-    refresh_token: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
-
     # User - Playlist 관계 설정 = 1:N 관계
     playlists: Mapped[list["Playlist"]] = relationship("Playlist", back_populates="user")
 
@@ -32,7 +30,7 @@ class Song(Base):
     __tablename__ = "songs"
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
-    title: Mapped[str] = mapped_column(String(100), index=True)
+    title: Mapped[str] = mapped_column(String(100))
     artist: Mapped[str] = mapped_column(String(100))
     duration: Mapped[int] = mapped_column(Integer)  # duration in seconds
 
@@ -40,6 +38,13 @@ class Song(Base):
         "Playlist", secondary="playlist_songs", back_populates="songs"
     )
 
+    # 제목순 커서 페이지네이션용 복합 인덱스 (title, id) - title 단독 조회에도 사용됨
+    # 제목/가수 검색용 FULLTEXT 인덱스 (MySQL 전용, 한글 검색을 위해 ngram 파서 사용)
+    __table_args__ = (
+        Index("ix_songs_title_id", "title", "id"),
+        Index("ft_songs_title_artist", "title", "artist", mysql_prefix="FULLTEXT", mysql_with_parser="ngram"),
+    )
+
 # Playlist 모델: 플레이리스트 정보
 class Playlist(Base):
     __tablename__ = "playlists"
@@ -50,12 +55,71 @@ class Playlist(Base):
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
 
     user: Mapped["User"] = relationship("User", back_populates="playlists")
+    # 노래 목록은 플레이리스트 안의 순서(position)대로 조회
     songs: Mapped[list["Song"]] = relationship(
-        "Song", secondary="playlist_songs", back_populates="playlists"
+        "Song", secondary="playlist_songs", back_populates="playlists",
+        order_by="PlaylistSong.position",
     )
 
 # PlaylistSong 모델: 플레이리스트와 노래의 N:M 관계 테이블
 class PlaylistSong(Base):
     __tablename__ = "playlist_songs" # 명시적 테이블 이름 지정
     playlist_id: Mapped[int] = mapped_column(ForeignKey("playlists.id"), primary_key=True)
-    song_id: Mapped[int] = mapped_column(ForeignKey("songs.id"), primary_key=True)
\ No newline at end of file
+    song_id: Mapped[int] = mapped_column(ForeignKey("songs.id"), primary_key=True)
+    # 플레이리스트 안의 순서 : 간격(1024)을 두고 매기므로 이동/삽입 시 해당 행 하나만 변경
+    position: Mapped[int] = mapped_column(BigInteger)
+
+    # 순서대로 조회 / 커서 페이지네이션용 인덱스
+    __table_args__ = (
+        Index("ix_playlist_songs_playlist_id_position", "playlist_id", "position"),
+    )
+
+# RefreshToken 모델: 발급한 refresh token (jti) 기록
+# 로그인할 때마다 새 family 가 시작되고, /users/refresh 로 교체(rotation)된 토큰은 같은 family 를 이어받음.
+# 이미 사용(교체)된 토큰이 다시 들어오면 탈취로 보고 family 전체를 폐기.
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+
+    jti: Mapped[str] = mapped_column(String(36), primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
+    family_id: Mapped[str] = mapped_column(String(36), index=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime)
+    revoked: Mapped[bool] = mapped_column(Boolean, default=False)
+
+# Play 모델: 재생 기록 (사용자가 노래를 재생한 시각)
+# 재생 요청마다 바로 저장하지 않고 PlayRecorder 가 모아서 여러 행 INSERT 로 저장
+class Play(Base):
+    __tablename__ = "plays"
+
+    # SQLite 는 INTEGER PRIMARY KEY 만 자동 증가하므로 SQLite 에서는 Integer 사용
+    id: Mapped[int] = mapped_column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    song_id: Mapped[int] = mapped_column(ForeignKey("songs.id"))
+    played_at: Mapped[datetime] = mapped_column(DateTime)
+
+    # 사용자별 최근 재생 기록 / 노래별 재생 집계용 인덱스
+    __table_args__ = (
+        Index("ix_plays_user_id_played_at", "user_id", "played_at"),
+        Index("ix_plays_song_id_played_at", "song_id", "played_at"),
+    )
+
+# SongPlayDaily 모델: 노래별 하루 재생 수 (재생 기록을 저장할 때 같은 트랜잭션에서 누적)
+# 차트는 원본 재생 기록(plays) 대신 이 집계 테이블에서 조회
+class SongPlayDaily(Base):
+    __tablename__ = "song_play_daily"
+
+    song_id: Mapped[int] = mapped_column(ForeignKey("songs.id"), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    play_count: Mapped[int] = mapped_column(BigInteger, default=0)
+
+    # 일간 차트(해당 날짜의 재생 수 순) 조회용 인덱스
+    __table_args__ = (
+        Index("ix_song_play_daily_day_play_count", "day", "play_count"),
+    )
+
+# SongPlayTotal 모델: 노래별 전체 재생 수
+class SongPlayTotal(Base):
+    __tablename__ = "song_play_totals"
+
+    song_id: Mapped[int] = mapped_column(ForeignKey("songs.id"), primary_key=True)
+    play_count: Mapped[int] = mapped_column(BigInteger, default=0, index=True)
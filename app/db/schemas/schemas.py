@@ -1,4 +1,6 @@
-from pydantic import BaseModel, ConfigDict
+import enum
+from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional
 from app.db.models.models import UserRole
 
@@ -40,6 +42,18 @@ class UserRead(UserBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+# username / email 사용 가능 여부 (True = 사용 가능, 확인을 요청하지 않은 항목은 None)
+class UserAvailability(BaseModel):
+    username: Optional[bool] = None
+    email: Optional[bool] = None
+
+# 인증된 사용자 정보 (토큰 / 캐시에서 얻은 최소 정보 - 권한 확인용)
+class AuthUser(BaseModel):
+    id: int
+    role: UserRole
+
+    model_config = ConfigDict(from_attributes=True)
+
 
 # 2. Song 스키마: 노래 정보
 
@@ -68,6 +82,69 @@ class SongInDB(SongBase):
 class SongRead(SongInDB):
     pass
 
+# 노래 일괄 등록 중 실패한 행 정보
+class SongIngestError(BaseModel):
+    line: int       # 입력 파일의 줄 번호 (1부터, CSV는 헤더 포함)
+    error: str
+
+# 노래 일괄 등록 결과
+class SongIngestReport(BaseModel):
+    inserted: int
+    failed: int
+    errors: List[SongIngestError] = []  # 실패한 행 (최대 1000개까지만 기록)
+    elapsed: float                      # 소요 시간 (초)
+    rows_per_sec: float                 # 처리량
+
+# 노래 목록 정렬 기준 (각각 인덱스로 뒷받침됨 : id = PK, title = (title, id))
+class SongSort(str, enum.Enum):
+    ID = "id"
+    TITLE = "title"
+
+# 노래 목록 한 페이지 + 다음 페이지 커서 (마지막 페이지면 None)
+class SongPage(BaseModel):
+    items: List[SongRead]
+    next_cursor: Optional[str] = None
+
+# 여러 노래를 한 번에 조회할 때 받을 데이터
+class SongBatchRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=500)
+
+# 여러 노래 조회 결과 : 요청한 순서대로의 노래 목록 + 존재하지 않는 id 목록
+class SongBatch(BaseModel):
+    items: List[SongRead]
+    missing: List[int]
+
+# 차트 기간 (day = 오늘(UTC), week = 오늘 포함 최근 7일, all = 전체 기간)
+class ChartPeriod(str, enum.Enum):
+    DAY = "day"
+    WEEK = "week"
+    ALL = "all"
+
+# 차트 항목 (순위, 재생 수, 노래)
+class ChartEntry(BaseModel):
+    rank: int
+    play_count: int
+    song: SongRead
+
+# 차트 (generated_at : 차트를 계산한 시각, 주기적으로 다시 계산됨)
+class SongChart(BaseModel):
+    period: ChartPeriod
+    artist: Optional[str] = None
+    generated_at: datetime
+    items: List[ChartEntry]
+
+# 비슷한 노래 (score : 두 노래가 함께 담긴 플레이리스트 수를 정규화한 값, 0~1)
+class SimilarSong(BaseModel):
+    song_id: int
+    score: float
+
+# 비슷한 노래 목록 (generated_at : 색인을 계산한 시각, 아직 계산 전이면 None)
+# 노래 정보는 POST /songs/batch 로 조회
+class SimilarSongs(BaseModel):
+    song_id: int
+    generated_at: Optional[datetime] = None
+    items: List[SimilarSong]
+
 
 # 3. Playlist 스키마: 플레이리스트 정보
 
@@ -99,4 +176,52 @@ class PlaylistRead(PlaylistBase):
     user: UserRead              # 소유자 정보 (중첩 모델)
     songs: List[SongRead] = []  # 노래 목록 (중첩 모델 리스트)
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+# 플레이리스트 목록 조회 시 반환할 요약 정보 (노래 목록 대신 곡 수와 총 재생 시간)
+class PlaylistSummary(PlaylistBase):
+    id: int
+    song_count: int
+    total_duration: int     # 총 재생 시간 (초)
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+# 4. PlaylistSong 스키마: 플레이리스트-노래 관계
+
+# 플레이리스트 하나에 담을 수 있는 최대 노래 수 (전체 순서 변경 요청이 모든 노래 id 를 받으므로 그 상한과 같음)
+PLAYLIST_MAX_SONGS = 5000
+
+# 플레이리스트에 여러 노래를 한 번에 추가/제거할 때 받을 데이터
+class PlaylistSongIds(BaseModel):
+    song_ids: List[int] = Field(..., min_length=1, max_length=1000)
+
+# 플레이리스트 안에서 노래 하나를 이동할 때 받을 데이터 (after_song_id 바로 뒤로, None 이면 맨 앞으로)
+class PlaylistSongMove(BaseModel):
+    after_song_id: Optional[int] = None
+
+# 플레이리스트 전체 순서를 바꿀 때 받을 데이터 (현재 노래 목록의 순열)
+class PlaylistSongOrder(BaseModel):
+    song_ids: List[int] = Field(..., min_length=1, max_length=PLAYLIST_MAX_SONGS)
+
+# 플레이리스트 노래 추가/제거 결과
+class PlaylistSongsResult(BaseModel):
+    playlist_id: int
+    song_ids: List[int]     # 요청한 노래 id 목록
+    changed: int            # 실제로 추가/제거된 노래 수 (이미 있거나 없던 노래는 제외)
+
+
+# 5. Play 스키마: 재생 기록
+
+# 재생 기록 하나 (played_at 을 생략하면 서버가 받은 시각으로 기록)
+class PlayCreate(BaseModel):
+    song_id: int
+    played_at: Optional[datetime] = None
+
+# 재생 기록 여러 개를 한 번에 보낼 때 받을 데이터
+class PlayBatch(BaseModel):
+    plays: List[PlayCreate] = Field(..., min_length=1, max_length=500)
+
+# 재생 기록 접수 결과 (대기열에 들어간 개수, 저장은 잠시 후 일괄로 수행)
+class PlayAck(BaseModel):
+    accepted: int
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends, status
+from app.db.schemas.schemas import PlayCreate, PlayBatch, PlayAck, AuthUser
+from app.services.services import PlayService
+from app.core.auth import get_current_user # 현재 로그인한 사용자 정보
+
+router = APIRouter(prefix="/plays", tags=["Play"])
+
+# 재생 기록 (로그인한 사용자) - 대기열에 넣고 바로 202 응답, 저장은 백그라운드에서 일괄 수행
+@router.post("/", response_model=PlayAck, status_code=status.HTTP_202_ACCEPTED)
+async def record_play(
+    play: PlayCreate,
+    current_user: AuthUser = Depends(get_current_user)
+):
+    return PlayService.record_plays(current_user.id, [play])
+
+# 재생 기록 여러 개 한 번에 (오프라인 재생 기록 동기화 등, 최대 500개)
+@router.post("/batch", response_model=PlayAck, status_code=status.HTTP_202_ACCEPTED)
+async def record_plays(
+    body: PlayBatch,
+    current_user: AuthUser = Depends(get_current_user)
+):
+    return PlayService.record_plays(current_user.id, body.plays)
@@ -1,11 +1,12 @@
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
-from app.db.schemas.schemas import PlaylistRead, PlaylistCreate, PlaylistUpdate
+from typing import List, Optional
+from app.db.schemas.schemas import PlaylistRead, PlaylistSummary, SongPage, PlaylistCreate, PlaylistUpdate, PlaylistSongIds, PlaylistSongMove, PlaylistSongOrder, PlaylistSongsResult, AuthUser
 from app.services.services import PlaylistService, PlaylistSongService
-from app.db.database import get_db
-from app.db.models.models import User
+from app.db.database import get_read_db, get_write_db
 from app.core.auth import get_current_user # 현재 로그인한 사용자 정보
+from app.core.serialization import json_response
+from app.core.settings import settings
 
 router = APIRouter(prefix="/playlists", tags=["Playlist"])
 
@@ -13,79 +14,121 @@ router = APIRouter(prefix="/playlists", tags=["Playlist"])
 @router.post("/", response_model=PlaylistRead, status_code=status.HTTP_201_CREATED)
 async def create_playlist(
     playlist: PlaylistCreate,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_write_db),
+    current_user: AuthUser = Depends(get_current_user)
 ):
     return await PlaylistService.create_playlist(db, playlist, current_user.id)
 
-# 현재 유저의 모든 플레이리스트 목록 조회
-@router.get("/", response_model=List[PlaylistRead])
+# 현재 유저의 모든 플레이리스트 목록 조회 (요약 : 곡 수, 총 재생 시간)
+# 노래 목록은 /{playlist_id}/songs 에서 페이지 단위로 조회
+# FAST_JSON 이면 직렬화된 JSON 을 그대로 반환 (response_model 검증 생략, 응답 형태는 같음)
+@router.get("/", response_model=List[PlaylistSummary])
 async def get_my_playlists(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: AuthUser = Depends(get_current_user)
 ):
+    if settings.fast_json:
+        return json_response(await PlaylistService.get_user_playlists_json(db, current_user.id))
     return await PlaylistService.get_user_playlists(db, current_user.id)
 
 # 특정 플레이리스트 조회 (본인만 가능)
 @router.get("/{playlist_id}", response_model=PlaylistRead)
 async def get_playlist(
     playlist_id: int,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: AuthUser = Depends(get_current_user)
 ):
-    db_playlist = await PlaylistService.get_playlist(db, playlist_id)
-    if db_playlist.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="플레이리스트에 접근할 권한이 없습니다.")
-    return db_playlist
+    return await PlaylistService.get_owned_playlist(db, playlist_id, current_user.id)
+
+# 플레이리스트의 노래 목록 페이지 조회 (본인만 가능)
+# 응답의 next_cursor를 cursor 파라미터로 넘기면 다음 페이지 조회
+@router.get("/{playlist_id}/songs", response_model=SongPage)
+async def get_playlist_songs(
+    playlist_id: int,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: AuthUser = Depends(get_current_user)
+):
+    return await PlaylistSongService.get_playlist_songs(db, playlist_id, current_user.id, limit, cursor)
 
 # 플레이리스트 정보 수정 (본인만 가능)
 @router.patch("/{playlist_id}", response_model=PlaylistRead)
 async def update_playlist(
     playlist_id: int,
     playlist_update: PlaylistUpdate,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_write_db),
+    current_user: AuthUser = Depends(get_current_user)
 ):
-    db_playlist = await PlaylistService.get_playlist(db, playlist_id)
-    if db_playlist.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="플레이리스트를 수정할 권한이 없습니다.")
-    return await PlaylistService.update_playlist(db, playlist_id, playlist_update)
+    return await PlaylistService.update_playlist(db, playlist_id, playlist_update, current_user.id)
 
 # 플레이리스트 삭제 (본인만 가능)
 @router.delete("/{playlist_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_playlist(
     playlist_id: int,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_write_db),
+    current_user: AuthUser = Depends(get_current_user)
 ):
-    db_playlist = await PlaylistService.get_playlist(db, playlist_id)
-    if db_playlist.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="플레이리스트를 삭제할 권한이 없습니다.")
-    await PlaylistService.delete_playlist(db, playlist_id)
+    await PlaylistService.delete_playlist(db, playlist_id, current_user.id)
     return {"detail": "플레이리스트가 성공적으로 삭제되었습니다."}
 
 # 플레이리스트에 노래 추가
-@router.post("/{playlist_id}/songs/{song_id}", response_model=PlaylistRead)
+@router.post("/{playlist_id}/songs/{song_id}", response_model=PlaylistSongsResult)
 async def add_song_to_playlist(
     playlist_id: int,
     song_id: int,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_write_db),
+    current_user: AuthUser = Depends(get_current_user)
 ):
-    db_playlist = await PlaylistService.get_playlist(db, playlist_id)
-    if db_playlist.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="플레이리스트를 수정할 권한이 없습니다.")
-    return await PlaylistSongService.add_song_to_playlist(db, playlist_id, song_id)
+    return await PlaylistSongService.add_songs_to_playlist(db, playlist_id, [song_id], current_user.id)
 
 # 플레이리스트에 노래 제거
-@router.delete("/{playlist_id}/songs/{song_id}", response_model=PlaylistRead)
+@router.delete("/{playlist_id}/songs/{song_id}", response_model=PlaylistSongsResult)
 async def remove_song_from_playlist(
     playlist_id: int,
     song_id: int,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_write_db),
+    current_user: AuthUser = Depends(get_current_user)
+):
+    return await PlaylistSongService.remove_songs_from_playlist(db, playlist_id, [song_id], current_user.id)
+
+# 플레이리스트에 노래 여러 개 추가 (한 번의 INSERT)
+@router.post("/{playlist_id}/songs", response_model=PlaylistSongsResult)
+async def add_songs_to_playlist(
+    playlist_id: int,
+    body: PlaylistSongIds,
+    db: AsyncSession = Depends(get_write_db),
+    current_user: AuthUser = Depends(get_current_user)
+):
+    return await PlaylistSongService.add_songs_to_playlist(db, playlist_id, body.song_ids, current_user.id)
+
+# 플레이리스트에서 노래 여러 개 제거 (한 번의 DELETE)
+@router.delete("/{playlist_id}/songs", response_model=PlaylistSongsResult)
+async def remove_songs_from_playlist(
+    playlist_id: int,
+    body: PlaylistSongIds,
+    db: AsyncSession = Depends(get_write_db),
+    current_user: AuthUser = Depends(get_current_user)
+):
+    return await PlaylistSongService.remove_songs_from_playlist(db, playlist_id, body.song_ids, current_user.id)
+
+# 플레이리스트 안에서 노래 하나 이동 (after_song_id 바로 뒤로, 보통 한 행만 변경)
+@router.patch("/{playlist_id}/songs/{song_id}/position", response_model=PlaylistSongsResult)
+async def move_song_in_playlist(
+    playlist_id: int,
+    song_id: int,
+    body: PlaylistSongMove,
+    db: AsyncSession = Depends(get_write_db),
+    current_user: AuthUser = Depends(get_current_user)
+):
+    return await PlaylistSongService.move_song(db, playlist_id, song_id, body.after_song_id, current_user.id)
+
+# 플레이리스트 전체 순서 변경 (현재 노래 목록의 순열, 한 트랜잭션)
+@router.put("/{playlist_id}/songs/order", response_model=PlaylistSongsResult)
+async def reorder_playlist_songs(
+    playlist_id: int,
+    body: PlaylistSongOrder,
+    db: AsyncSession = Depends(get_write_db),
+    current_user: AuthUser = Depends(get_current_user)
 ):
-    db_playlist = await PlaylistService.get_playlist(db, playlist_id)
-    if db_playlist.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="플레이리스트를 수정할 권한이 없습니다.")
-    return await PlaylistSongService.remove_song_from_playlist(db, playlist_id, song_id)
\ No newline at end of file
+    return await PlaylistSongService.reorder_songs(db, playlist_id, body.song_ids, current_user.id)
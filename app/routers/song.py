@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
-from app.db.schemas.schemas import SongRead, SongCreate, SongUpdate, UserRead
+from typing import List, Literal, Optional
+from app.db.schemas.schemas import SongRead, SongCreate, SongUpdate, SongPage, SongSort, SongIngestReport, SongBatch, SongBatchRequest, SongChart, ChartPeriod, SimilarSongs, AuthUser
 from app.services import services
-from app.db.database import get_db
+from app.services.cache import etag_response
+from app.db.database import get_read_db, get_write_db
 from app.core.auth import get_admin_user
+from app.core.settings import settings
 
 router = APIRouter(prefix="/songs", tags=["Song"])
 
@@ -12,28 +15,95 @@ router = APIRouter(prefix="/songs", tags=["Song"])
 @router.post("/", response_model=SongRead, status_code=status.HTTP_201_CREATED)
 async def create_song(
     song: SongCreate,
-    db: AsyncSession = Depends(get_db),
-    admin_user: UserRead = Depends(get_admin_user) # 관리자 권한 확인
+    db: AsyncSession = Depends(get_write_db),
+    admin_user: AuthUser = Depends(get_admin_user) # 관리자 권한 확인
 ):
     return await services.SongService.create_song(db, song)
 
-# 모든 노래 목록 조회 (모든 사용자 가능)
-@router.get("/", response_model=List[SongRead])
-async def get_all_songs(db: AsyncSession = Depends(get_db)):
-    return await services.SongService.get_all_songs(db)
+# 노래 일괄 등록 (관리자만 가능)
+# 요청 본문(NDJSON 또는 CSV)을 스트리밍으로 읽어 chunk_size 개씩 저장, 잘못된 행은 건너뛰고 결과에 기록
+@router.post("/bulk", response_model=SongIngestReport)
+async def bulk_create_songs(
+    request: Request,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    chunk_size: int = Query(settings.ingest_chunk_size, ge=1, le=10000),
+    db: AsyncSession = Depends(get_write_db),
+    admin_user: AuthUser = Depends(get_admin_user) # 관리자 권한 확인
+):
+    lines = services.SongIngestService.iter_lines(request.stream())
+    return await services.SongIngestService.ingest_songs(db, lines, format, chunk_size)
+
+# 여러 노래 한 번에 조회 (모든 사용자 가능) - 플레이리스트/재생 목록 화면용
+# 요청한 순서대로 반환하고, 존재하지 않는 id는 missing 에 담아 반환 (최대 500개)
+@router.post("/batch", response_model=SongBatch)
+async def get_songs_batch(body: SongBatchRequest, db: AsyncSession = Depends(get_read_db)):
+    return await services.SongService.get_songs_batch(db, body.ids)
+
+# 노래 목록 페이지 조회 (모든 사용자 가능)
+# 응답의 next_cursor를 cursor 파라미터로 넘기면 다음 페이지 조회
+# 캐시된 응답을 ETag와 함께 반환 (If-None-Match 일치 시 304)
+@router.get("/", response_model=SongPage)
+async def get_all_songs(
+    request: Request,
+    limit: int = Query(50, ge=1, le=200),
+    sort: SongSort = SongSort.ID,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    body, etag = await services.SongService.get_songs_page_json(db, limit, sort, cursor)
+    return etag_response(request, body, etag)
+
+# 노래 검색 (모든 사용자 가능) - 제목/가수, 관련도 순
+# /{song_id} 보다 먼저 등록해야 함
+@router.get("/search", response_model=List[SongRead])
+async def search_songs(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=50),
+    db: AsyncSession = Depends(get_read_db),
+):
+    return await services.SongService.search_songs(db, q, limit)
+
+# 인기 차트 (모든 사용자 가능) - 일간(day) / 주간(week) / 전체(all), 가수별 선택 가능
+# 주기적으로 미리 계산된 차트를 반환 - /{song_id} 보다 먼저 등록해야 함
+@router.get("/charts", response_model=SongChart)
+async def get_song_chart(
+    period: ChartPeriod = ChartPeriod.DAY,
+    limit: int = Query(10, ge=1, le=settings.chart_size),
+    artist: Optional[str] = Query(None, min_length=1, max_length=100),
+    db: AsyncSession = Depends(get_read_db),
+):
+    return await services.SongService.get_chart(db, period, limit, artist)
+
+# 전체 노래 목록 내보내기 (모든 사용자 가능)
+# NDJSON 형식으로 조회되는 대로 바로 전송 - /{song_id} 보다 먼저 등록해야 함
+@router.get("/export")
+async def export_songs():
+    return StreamingResponse(
+        services.SongService.stream_songs(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="songs.ndjson"'},
+    )
 
 # 특정 노래 조회 (모든 사용자 가능)
+# 캐시된 응답을 ETag와 함께 반환 (If-None-Match 일치 시 304)
 @router.get("/{song_id}", response_model=SongRead)
-async def get_song(song_id: int, db: AsyncSession = Depends(get_db)):
-    return await services.SongService.get_song(db, song_id)
+async def get_song(song_id: int, request: Request, db: AsyncSession = Depends(get_read_db)):
+    body, etag = await services.SongService.get_song_json(db, song_id)
+    return etag_response(request, body, etag)
+
+# 비슷한 노래 (모든 사용자 가능) - 같은 플레이리스트에 함께 담긴 노래 기반
+# 주기적으로 미리 계산된 색인에서 노래 id 와 점수만 반환 (노래 정보는 POST /songs/batch 로 조회)
+@router.get("/{song_id}/similar", response_model=SimilarSongs)
+async def get_similar_songs(song_id: int, limit: int = Query(10, ge=1, le=settings.similar_top_k)):
+    return services.SongService.get_similar_songs(song_id, limit)
 
 # 노래 정보 수정 (관리자만 가능)
 @router.patch("/{song_id}", response_model=SongRead)
 async def update_song(
     song_id: int,
     song_update: SongUpdate,
-    db: AsyncSession = Depends(get_db),
-    admin_user: UserRead = Depends(get_admin_user) # 관리자 권한 확인
+    db: AsyncSession = Depends(get_write_db),
+    admin_user: AuthUser = Depends(get_admin_user) # 관리자 권한 확인
 ):
     return await services.SongService.update_song(db, song_id, song_update)
 
@@ -41,8 +111,8 @@ async def update_song(
 @router.delete("/{song_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_song(
     song_id: int,
-    db: AsyncSession = Depends(get_db),
-    admin_user: UserRead = Depends(get_admin_user) # 관리자 권한 확인
+    db: AsyncSession = Depends(get_write_db),
+    admin_user: AuthUser = Depends(get_admin_user) # 관리자 권한 확인
 ):
     await services.SongService.delete_song(db, song_id)
     return {"detail": "노래가 성공적으로 삭제되었습니다."}
\ No newline at end of file
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, Response
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.schemas.schemas import UserCreate, UserLogin, UserRead
+from typing import Optional
+from app.db.schemas.schemas import UserCreate, UserLogin, UserRead, UserAvailability, AuthUser
 from app.services.services import UserService
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
 from app.core.auth import set_auth_cookies, get_user_id
 
 router = APIRouter(prefix="/users", tags=["User"])
@@ -12,6 +13,16 @@ async def signup(user: UserCreate, db: AsyncSession = Depends(get_db)):
     db_user = await UserService.signup(db, user)
     return db_user
 
+# username / email 사용 가능 여부 확인 (로그인 불필요, 가입 화면에서 입력 중 확인용)
+# 메모리 블룸 필터에 없는 값은 DB 조회 없이 바로 응답
+@router.get("/availability", response_model=UserAvailability)
+async def check_availability(
+    username: Optional[str] = Query(None, min_length=1, max_length=50),
+    email: Optional[str] = Query(None, min_length=1, max_length=100),
+    db: AsyncSession = Depends(get_read_db),
+):
+    return await UserService.check_availability(db, username, email)
+
 @router.post("/login", response_model=UserRead)
 async def login(user: UserLogin, response: Response, db: AsyncSession = Depends(get_db)):
     result = await UserService.login(db, user)
@@ -19,8 +30,17 @@ async def login(user: UserLogin, response: Response, db: AsyncSession = Depends(
     set_auth_cookies(response, access_token, refresh_token)
     return db_user
 
+# access / refresh token 재발급 (refresh token 은 한 번만 사용 가능, 비밀번호 확인 없음)
+@router.post("/refresh", response_model=AuthUser)
+async def refresh(request: Request, response: Response, db: AsyncSession = Depends(get_db)):
+    auth_user, access_token, refresh_token = await UserService.refresh(db, request.cookies.get("refresh_token"))
+    set_auth_cookies(response, access_token, refresh_token)
+    return auth_user
+
+# 로그아웃 : 쿠키 삭제 + refresh token 폐기
 @router.post("/logout", response_model=bool)
-async def logout(response: Response):
+async def logout(request: Request, response: Response, db: AsyncSession = Depends(get_db)):
+    await UserService.logout(db, request.cookies.get("refresh_token"))
     response.delete_cookie(key="access_token")
     response.delete_cookie(key="refresh_token")
     return True
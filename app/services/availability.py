@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import time
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.bloom import BloomFilter
+from app.core.settings import settings
+from app.core.metrics import Counter, Gauge
+from app.db.database import read_session
+from app.db.cruds.cruds import UserCrud
+
+# availability.py : username / email 사용 가능 여부 색인
+# 가입된 username, email 을 메모리 블룸 필터에 넣어 두고, 필터에 없는 값은 DB 조회 없이 바로 "사용 가능" 으로 응답.
+# 필터에 있을 수 있는 값(이미 가입되었거나 오탐)만 DB로 확인.
+#   - 시작 시 users 테이블 전체를 id 순으로 읽어 채우고(백그라운드), 이후 AVAILABILITY_REFRESH_INTERVAL 초마다
+#     마지막으로 읽은 id 보다 OVERLAP_IDS 만큼 앞에서부터 다시 읽어 추가 (다른 워커에서 가입한 사용자 반영)
+#     auto increment id 는 commit 순서와 다를 수 있어(동시 가입), 마지막 id 이후만 읽으면 늦게 commit 된 행을 놓침
+#   - AVAILABILITY_REBUILD_INTERVAL 초마다 새 필터에 전체를 다시 채워 한 번에 교체
+#     (겹쳐 읽는 범위보다 오래 걸린 트랜잭션의 행, 삭제된 사용자도 반영)
+#   - 이 워커에서 가입한 사용자는 가입 직후 바로 추가
+# 입력 확인용 참고 정보이며, 실제 중복 가입은 users 테이블의 unique 제약으로 막음.
+# MySQL 기본 collation 은 대소문자를 구분하지 않으므로 소문자로 바꿔서 저장/조회.
+
+logger = logging.getLogger("app.availability")
+
+AVAILABILITY_LOOKUPS = Counter("user_availability_lookups_total", "Availability lookups by field and where they were answered")
+AVAILABILITY_ENTRIES = Gauge("user_availability_index_entries", "Users loaded into the availability filter")
+
+
+class AvailabilityIndex:
+    BATCH_SIZE = 10000
+    OVERLAP_IDS = 1000
+
+    def __init__(self, capacity: int, error_rate: float, refresh_interval: float, rebuild_interval: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.refresh_interval = refresh_interval
+        self.rebuild_interval = rebuild_interval
+        self._usernames = BloomFilter(capacity, error_rate)
+        self._emails = BloomFilter(capacity, error_rate)
+        self._building: tuple[BloomFilter, BloomFilter] | None = None  # 전체 다시 채우는 중인 새 필터
+        self._last_id = 0
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        self.ready = False  # 처음 채우기 전에는 모든 값을 DB로 확인
+        AVAILABILITY_ENTRIES.set_function(lambda: len(self._usernames))
+
+    @staticmethod
+    def _normalize(value: str) -> str:
+        return value.casefold()
+
+    # 필터에 추가 (이미 있을 수 있는 값은 건너뜀 - 겹쳐 읽은 사용자를 다시 세지 않음)
+    @staticmethod
+    def _add_to(filters: tuple[BloomFilter, BloomFilter], username: str, email: str) -> None:
+        for bloom, value in zip(filters, (username, email)):
+            value = AvailabilityIndex._normalize(value)
+            if value not in bloom:
+                bloom.add(value)
+
+    # 가입한 사용자 추가 (전체를 다시 채우는 중이면 새 필터에도 추가)
+    def add(self, username: str, email: str) -> None:
+        self._add_to((self._usernames, self._emails), username, email)
+        if self._building is not None:
+            self._add_to(self._building, username, email)
+
+    # 이미 사용 중일 수 있는지 (False 면 확실히 사용 가능)
+    def maybe_taken(self, username: str | None = None, email: str | None = None) -> bool:
+        if not self.ready:
+            return True
+        return (
+            (username is not None and self._normalize(username) in self._usernames)
+            or (email is not None and self._normalize(email) in self._emails)
+        )
+
+    # id 가 after_id 보다 큰 사용자를 filters 에 추가하고, 마지막으로 읽은 id 반환 (없으면 after_id)
+    async def _load(self, filters: tuple[BloomFilter, BloomFilter], after_id: int) -> int:
+        async with read_session() as db:
+            while True:
+                rows = await UserCrud.get_identities_after(db, after_id, self.BATCH_SIZE)
+                for row in rows:
+                    self._add_to(filters, row.username, row.email)
+                if rows:
+                    after_id = rows[-1].id
+                if len(rows) < self.BATCH_SIZE:
+                    return after_id
+
+    # 최근 사용자 추가 : 마지막으로 읽은 id 보다 OVERLAP_IDS 앞에서부터 다시 읽음
+    async def refresh(self) -> None:
+        async with self._lock:
+            last_id = await self._load((self._usernames, self._emails), max(0, self._last_id - self.OVERLAP_IDS))
+            self._last_id = max(self._last_id, last_id)
+
+    # 새 필터에 users 테이블 전체를 채운 뒤 한 번에 교체 (채우는 동안 조회는 기존 필터 사용)
+    async def rebuild(self) -> None:
+        async with self._lock:
+            self._building = (BloomFilter(self.capacity, self.error_rate), BloomFilter(self.capacity, self.error_rate))
+            try:
+                last_id = await self._load(self._building, 0)
+                self._usernames, self._emails = self._building
+                self._last_id = last_id
+            finally:
+                self._building = None
+            if not self.ready:
+                logger.info("availability index loaded %d users", len(self._usernames))
+            self.ready = True
+
+    # 주기적 갱신 작업 시작 / 종료 (lifespan)
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="availability-index")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # 처음과 rebuild_interval 마다 전체를 다시 채우고, 그 사이에는 최근 사용자만 추가
+    async def _run(self) -> None:
+        rebuilt_at = None
+        while True:
+            try:
+                if rebuilt_at is None or time.monotonic() - rebuilt_at >= self.rebuild_interval:
+                    await self.rebuild()
+                    rebuilt_at = time.monotonic()
+                else:
+                    await self.refresh()
+            except Exception:
+                logger.exception("availability index refresh failed")
+            await asyncio.sleep(self.refresh_interval)
+
+    # username / email 사용 가능 여부 (True = 사용 가능, 확인하지 않은 항목은 None)
+    # 필터에 없는 값은 DB 조회 없이 응답하고, 있을 수 있는 값만 한 번의 쿼리로 확인
+    async def check(self, db: AsyncSession, username: str | None = None, email: str | None = None) -> dict:
+        result = {"username": None, "email": None}
+        confirm = {}
+        for field, value in (("username", username), ("email", email)):
+            if value is None:
+                continue
+            if self.maybe_taken(**{field: value}):
+                confirm[field] = value
+            else:
+                result[field] = True
+                AVAILABILITY_LOOKUPS.inc(field=field, source="filter")
+        if confirm:
+            taken = await UserCrud.get_taken(db, confirm.get("username"), confirm.get("email"))
+            for field in confirm:
+                result[field] = field not in taken
+                AVAILABILITY_LOOKUPS.inc(field=field, source="db")
+        return result
+
+
+availability_index = AvailabilityIndex(
+    capacity=settings.availability_capacity,
+    error_rate=settings.availability_error_rate,
+    refresh_interval=settings.availability_refresh_interval,
+    rebuild_interval=settings.availability_rebuild_interval,
+)
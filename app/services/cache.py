@@ -0,0 +1,213 @@
+import asyncio
+import hashlib
+import logging
+from abc import ABC, abstractmethod
+from fastapi import Request, Response
+from app.core.cache import TTLCache, user_cache, token_cache
+from app.core.metrics import Counter, Gauge
+from app.core.settings import settings
+from app.db.database import replicas
+
+# cache.py : 서비스 계층에서 사용하는 응답 캐시
+# 직렬화가 끝난 JSON(bytes)과 ETag를 함께 저장하여, 캐시 적중 시 DB 조회와 직렬화를 모두 건너뜀.
+# 저장소(backend)는 교체 가능
+#   - memory : 프로세스 내부 LRU + TTL (기본값, 워커마다 따로 동작)
+#   - redis  : Redis 호환 서버 공유 (워커 간 무효화 공유, 로컬에서는 Redis 호환 대체 서버 사용 가능)
+# 읽기 복제본이 있으면 복제 지연 동안 복제본에서 읽은 옛 데이터가 캐시에 다시 저장될 수 있으므로,
+# 무효화를 READ_YOUR_WRITES_WINDOW 뒤에 한 번 더 하고, 기본 DB로 고정된 클라이언트는 캐시를 읽지 않음.
+
+logger = logging.getLogger("app.cache")
+
+# 캐시 저장소 공통 인터페이스
+class CacheBackend(ABC):
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: int | None = None) -> None: ...
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None: ...
+
+    # 정수 카운터 조회 / 1 증가 후 값 반환 (캐시 키의 세대·버전 번호용, 만료·제거되지 않음)
+    @abstractmethod
+    async def get_counter(self, key: str) -> int: ...
+
+    @abstractmethod
+    async def incr(self, key: str) -> int: ...
+
+    # 캐시 지표 (적중/실패/제거 횟수)
+    @abstractmethod
+    def stats(self) -> dict: ...
+
+
+# 프로세스 내부 메모리 저장소
+class MemoryCacheBackend(CacheBackend):
+
+    def __init__(self, maxsize: int, ttl: int):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._counters: dict[str, int] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: int | None = None) -> None:
+        self._cache.set(key, value, ttl)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._cache.delete(key)
+
+    async def get_counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+    def stats(self) -> dict:
+        return {"backend": "memory", **self._cache.stats()}
+
+
+# Redis 호환 저장소 (redis.asyncio.Redis 또는 같은 메서드를 가진 클라이언트)
+# 제거(eviction)는 서버가 관리하므로 적중/실패 횟수만 집계
+class RedisCacheBackend(CacheBackend):
+
+    def __init__(self, client, ttl: int, prefix: str = "cache:"):
+        self._client = client
+        self._ttl = ttl
+        self._prefix = prefix
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> bytes | None:
+        value = await self._client.get(self._prefix + key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: int | None = None) -> None:
+        await self._client.set(self._prefix + key, value, ex=ttl or self._ttl)
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self._client.delete(*(self._prefix + key for key in keys))
+
+    async def get_counter(self, key: str) -> int:
+        return int(await self._client.get(self._prefix + key) or 0)
+
+    async def incr(self, key: str) -> int:
+        return await self._client.incr(self._prefix + key)
+
+    def stats(self) -> dict:
+        return {"backend": "redis", "hits": self.hits, "misses": self.misses, "evictions": 0}
+
+
+# 설정(CACHE_BACKEND)에 따라 저장소 생성
+def create_cache_backend() -> CacheBackend:
+    if settings.cache_backend == "redis":
+        try:
+            from redis.asyncio import Redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis 를 사용하려면 redis 패키지를 설치해야 합니다.") from e
+        return RedisCacheBackend(Redis.from_url(settings.redis_url), ttl=settings.cache_ttl)
+    return MemoryCacheBackend(maxsize=settings.cache_max_entries, ttl=settings.cache_ttl)
+
+
+# 응답 본문으로 ETag 생성
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+# 캐시된 JSON 본문으로 응답 생성
+# 요청의 If-None-Match 에 같은 ETag가 있으면 본문 없이 304 반환
+def etag_response(request: Request, body: bytes, etag: str) -> Response:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in tags or "*" in tags:
+            return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+# 노래 상세 / 노래 목록 페이지 응답 캐시
+# 상세는 노래별 버전 번호, 목록 페이지는 전체 세대 번호를 키에 넣고, 무효화할 때 번호를 올려 이전 키를 모두 무효화
+# (키는 DB 조회 전에 먼저 만들어 두어야, 조회 중에 무효화되더라도 옛 데이터가 새 번호의 키로 저장되지 않음)
+class SongCache:
+    GENERATION_KEY = "songs:gen"
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self._delayed: set[asyncio.Task] = set()
+
+    # 노래별 버전 번호 키
+    @staticmethod
+    def _version_key(song_id: int) -> str:
+        return f"songs:ver:{song_id}"
+
+    # 노래 상세 키 : 현재 버전 번호 포함
+    async def song_key(self, song_id: int) -> str:
+        version = await self.backend.get_counter(self._version_key(song_id))
+        return f"song:{song_id}:{version}"
+
+    # 목록 페이지 키 : 현재 세대 번호 포함
+    async def page_key(self, params: str) -> str:
+        generation = await self.backend.get_counter(self.GENERATION_KEY)
+        return f"songs:page:{generation}:{params}"
+
+    # 저장 형식 : ETag + "\n" + JSON 본문
+    async def get(self, key: str) -> tuple[bytes, str] | None:
+        value = await self.backend.get(key)
+        if value is None:
+            return None
+        etag, _, body = value.partition(b"\n")
+        return body, etag.decode()
+
+    async def set(self, key: str, body: bytes) -> tuple[bytes, str]:
+        etag = make_etag(body)
+        await self.backend.set(key, etag.encode() + b"\n" + body)
+        return body, etag
+
+    # 노래 생성/수정/삭제 후 호출 : 해당 노래 상세와 모든 목록 페이지 무효화
+    # 복제본이 있으면 READ_YOUR_WRITES_WINDOW(복제 지연보다 길게 설정) 뒤에 한 번 더 무효화
+    async def invalidate(self, song_id: int | None = None) -> None:
+        await self._bump(song_id)
+        if replicas:
+            task = asyncio.create_task(self._invalidate_later(song_id, settings.read_your_writes_window))
+            self._delayed.add(task)
+            task.add_done_callback(self._delayed.discard)
+
+    # 버전 / 세대 번호 증가, 이전 버전의 상세 키는 바로 삭제 (메모리 확보용, 삭제하지 않아도 다시 읽히지 않음)
+    async def _bump(self, song_id: int | None) -> None:
+        if song_id is not None:
+            version = await self.backend.incr(self._version_key(song_id))
+            await self.backend.delete(f"song:{song_id}:{version - 1}")
+        await self.backend.incr(self.GENERATION_KEY)
+
+    async def _invalidate_later(self, song_id: int | None, delay: float) -> None:
+        await asyncio.sleep(delay)
+        try:
+            await self._bump(song_id)
+        except Exception:
+            logger.exception("delayed song cache invalidation failed")
+
+    def stats(self) -> dict:
+        return self.backend.stats()
+
+
+song_cache = SongCache(create_cache_backend())
+
+
+# 캐시 지표 등록 (노래 응답 캐시, 인증 사용자 캐시, access token 캐시)
+CACHE_HITS = Counter("cache_hits_total", "Cache hits")
+CACHE_MISSES = Counter("cache_misses_total", "Cache misses")
+CACHE_EVICTIONS = Counter("cache_evictions_total", "Entries evicted to respect the size limit")
+CACHE_SIZE = Gauge("cache_entries", "Entries currently cached (in-process caches only)")
+for _name, _stats in (("song", song_cache.stats), ("user", user_cache.stats), ("token", token_cache.stats)):
+    CACHE_HITS.set_function(lambda stats=_stats: stats()["hits"], cache=_name)
+    CACHE_MISSES.set_function(lambda stats=_stats: stats()["misses"], cache=_name)
+    CACHE_EVICTIONS.set_function(lambda stats=_stats: stats()["evictions"], cache=_name)
+    CACHE_SIZE.set_function(lambda stats=_stats: stats().get("size", 0), cache=_name)
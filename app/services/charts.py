@@ -0,0 +1,112 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import TTLCache
+from app.core.settings import settings
+from app.core.metrics import Counter, Gauge, Histogram
+from app.db.database import read_session
+from app.db.cruds.cruds import PlayCrud
+from app.db.schemas.schemas import ChartPeriod, ChartEntry, SongChart, SongRead
+
+# charts.py : 인기 차트 (일간 / 주간 / 전체)
+# 재생 기록을 저장할 때 함께 갱신되는 집계 테이블(song_play_daily, song_play_totals)에서
+# 기간별 상위 CHART_SIZE 곡을 CHART_REFRESH_INTERVAL 초마다 계산해 메모리에 보관하고,
+# 요청은 보관된 차트를 잘라서 반환 (요청마다 재생 기록을 GROUP BY 하지 않음).
+# 가수별 차트는 요청이 들어왔을 때 집계 테이블에서 계산하여 다음 갱신 주기까지 캐시.
+# 집계 테이블 조회는 복제본이 있으면 복제본에서 수행.
+
+logger = logging.getLogger("app.charts")
+
+CHART_REFRESH_DURATION = Histogram("chart_refresh_duration_seconds", "Time spent recomputing the song charts")
+CHART_REFRESH_FAILURES = Counter("chart_refresh_failures_total", "Failed chart refreshes")
+CHART_LAST_REFRESH = Gauge("chart_last_refresh_timestamp_seconds", "Unix time of the last successful chart refresh")
+
+
+class ChartStore:
+
+    def __init__(self, size: int, refresh_interval: float):
+        self.size = size
+        self.refresh_interval = refresh_interval
+        self._charts: dict[ChartPeriod, SongChart] = {}
+        self._artist_charts = TTLCache(maxsize=1000, ttl=refresh_interval)
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    # 주기적 갱신 작업 시작 / 종료 (lifespan)
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="chart-refresh")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                CHART_REFRESH_FAILURES.inc()
+                logger.exception("chart refresh failed")
+            await asyncio.sleep(self.refresh_interval)
+
+    # 모든 기간의 차트를 다시 계산 (가수별 차트 캐시는 비움)
+    async def refresh(self) -> None:
+        async with self._lock:
+            await self._refresh_locked()
+
+    # 아직 계산되지 않은 기간이 있을 때만 계산
+    # 동시에 들어온 첫 요청들은 락을 얻은 뒤 다시 확인하므로, 먼저 끝난 계산 결과를 함께 사용
+    async def _load(self, period: ChartPeriod) -> None:
+        async with self._lock:
+            if period not in self._charts:
+                await self._refresh_locked()
+
+    async def _refresh_locked(self) -> None:
+        start = time.perf_counter()
+        async with read_session() as db:
+            charts = {period: await self._compute(db, period) for period in ChartPeriod}
+        self._charts = charts
+        self._artist_charts.clear()
+        CHART_REFRESH_DURATION.observe(time.perf_counter() - start)
+        CHART_LAST_REFRESH.set(time.time())
+
+    # 기간별 차트 계산 (집계 테이블 조회)
+    async def _compute(self, db: AsyncSession, period: ChartPeriod, artist: str | None = None) -> SongChart:
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        today = now.date()
+        if period == ChartPeriod.ALL:
+            rows = await PlayCrud.get_total_chart(db, self.size, artist)
+        else:
+            start = today if period == ChartPeriod.DAY else today - timedelta(days=6)
+            rows = await PlayCrud.get_period_chart(db, start, today, self.size, artist)
+        items = [
+            ChartEntry(rank=rank, play_count=count, song=SongRead.model_validate(song))
+            for rank, (song, count) in enumerate(rows, 1)
+        ]
+        return SongChart(period=period, artist=artist, generated_at=now, items=items)
+
+    # 차트 상위 limit 곡 (아직 한 번도 계산하지 않았으면 지금 계산)
+    async def get(self, db: AsyncSession, period: ChartPeriod, limit: int, artist: str | None = None) -> SongChart:
+        if artist is None:
+            if period not in self._charts:
+                await self._load(period)
+            chart = self._charts[period]
+        else:
+            chart = self._artist_charts.get((period, artist))
+            if chart is None:
+                chart = await self._compute(db, period, artist)
+                self._artist_charts.set((period, artist), chart)
+        if limit >= len(chart.items):
+            return chart
+        return chart.model_copy(update={"items": chart.items[:limit]})
+
+
+chart_store = ChartStore(size=settings.chart_size, refresh_interval=settings.chart_refresh_interval)
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import time
+from collections import Counter as Tally
+from fastapi import HTTPException
+from app.core.settings import settings
+from app.core.metrics import Counter, Gauge, Histogram
+from app.db.database import AsyncSessionLocal
+from app.db.cruds.cruds import UserCrud, SongCrud, PlayCrud
+
+# plays.py : 재생 기록 수집 파이프라인
+# POST /plays 는 재생 기록을 프로세스 내부 대기열(asyncio.Queue)에 넣고 바로 응답하며,
+# 백그라운드 작업이 대기열에서 PLAY_FLUSH_SIZE 개가 모이거나 PLAY_FLUSH_INTERVAL 초가 지나면
+# 한 번의 여러 행 INSERT 로 저장함. 대기열이 가득 차면 503 으로 클라이언트가 잠시 후 다시 보내게 함.
+# 같은 트랜잭션에서 노래별 재생 수 집계(일별 / 전체)도 갱신하여 차트는 집계 테이블만 조회 (charts.py).
+# 애플리케이션 종료(lifespan) 시 대기열에 남은 기록을 모두 저장한 뒤 종료.
+
+logger = logging.getLogger("app.plays")
+
+PLAYS_ENQUEUED = Counter("plays_enqueued_total", "Play events accepted into the queue")
+PLAYS_REJECTED = Counter("plays_rejected_total", "Play events rejected because the queue was full")
+PLAYS_WRITTEN = Counter("plays_written_total", "Play events written to the database")
+PLAYS_DROPPED = Counter("plays_dropped_total", "Play events dropped while flushing")
+PLAY_QUEUE_DEPTH = Gauge("play_queue_depth", "Play events waiting to be written")
+PLAY_FLUSH_SIZE = Histogram(
+    "play_flush_batch_size", "Play events written per flush",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000),
+)
+PLAY_FLUSH_DURATION = Histogram("play_flush_duration_seconds", "Time spent writing one batch of play events")
+
+_STOP = object()   # 종료 신호 : 이보다 먼저 들어온 기록은 모두 저장된 뒤 작업이 끝남
+
+
+class PlayRecorder:
+    WRITE_ATTEMPTS = 3
+
+    def __init__(self, maxsize: int, flush_size: int, flush_interval: float):
+        self.maxsize = maxsize
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._closed = True
+        PLAY_QUEUE_DEPTH.set_function(lambda: self._queue.qsize() if self._queue else 0)
+
+    # 백그라운드 저장 작업 시작 (lifespan 시작 시, 대기열은 실행 중인 이벤트 루프에서 생성)
+    def start(self) -> None:
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+            self._closed = False
+            self._task = asyncio.create_task(self._run(), name="play-recorder")
+
+    # 새 기록을 받지 않고, 대기열에 남은 기록을 모두 저장한 뒤 종료 (lifespan 종료 시)
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._closed = True
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    # 재생 기록 여러 개를 대기열에 추가 (전부 들어갈 자리가 없으면 하나도 넣지 않고 503)
+    def enqueue(self, plays: list[dict]) -> None:
+        if self._closed or self._queue.maxsize - self._queue.qsize() < len(plays):
+            PLAYS_REJECTED.inc(len(plays))
+            raise HTTPException(
+                status_code=503,
+                detail="요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+                headers={"Retry-After": "1"},
+            )
+        for play in plays:
+            self._queue.put_nowait(play)
+        PLAYS_ENQUEUED.inc(len(plays))
+
+    # 대기열에서 flush_size 개가 모이거나 flush_interval 초가 지날 때까지 모아서 저장
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            first = await self._queue.get()
+            if first is _STOP:
+                break
+            batch = [first]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.flush_size:
+                try:
+                    play = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        play = await asyncio.wait_for(self._queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                if play is _STOP:
+                    stopping = True
+                    break
+                batch.append(play)
+            await self._flush(batch)
+
+    # 한 묶음 저장 : 존재하지 않는 사용자/노래의 기록은 제외하고 한 번의 INSERT + 집계 갱신
+    # DB 오류 시 잠시 후 다시 시도하고, 그래도 실패하면 버리고 로그만 남김 (작업은 계속 실행)
+    async def _flush(self, batch: list[dict]) -> None:
+        start = time.perf_counter()
+        for attempt in range(1, self.WRITE_ATTEMPTS + 1):
+            try:
+                async with AsyncSessionLocal() as db:
+                    users = await UserCrud.get_existing_ids(db, list({play["user_id"] for play in batch}))
+                    songs = await SongCrud.get_existing_ids(db, list({play["song_id"] for play in batch}))
+                    rows = [play for play in batch if play["user_id"] in users and play["song_id"] in songs]
+                    if rows:
+                        await PlayCrud.bulk_create(db, rows)
+                        daily, totals = self._tally(rows)
+                        await PlayCrud.add_play_counts(db, daily, totals)
+                        await db.commit()
+                break
+            except Exception:
+                if attempt == self.WRITE_ATTEMPTS:
+                    logger.exception("failed to write %d play events, dropping them", len(batch))
+                    PLAYS_DROPPED.inc(len(batch), reason="db_error")
+                    return
+                await asyncio.sleep(0.5 * 2 ** (attempt - 1))
+
+        PLAYS_WRITTEN.inc(len(rows))
+        if len(rows) < len(batch):
+            PLAYS_DROPPED.inc(len(batch) - len(rows), reason="unknown_song_or_user")
+        PLAY_FLUSH_SIZE.observe(len(rows))
+        PLAY_FLUSH_DURATION.observe(time.perf_counter() - start)
+
+    # 재생 기록 묶음을 노래별 (일별, 전체) 재생 수로 집계
+    @staticmethod
+    def _tally(rows: list[dict]) -> tuple[list[dict], list[dict]]:
+        daily = Tally((row["song_id"], row["played_at"].date()) for row in rows)
+        totals = Tally(row["song_id"] for row in rows)
+        return (
+            [{"song_id": song_id, "day": day, "play_count": count} for (song_id, day), count in daily.items()],
+            [{"song_id": song_id, "play_count": count} for song_id, count in totals.items()],
+        )
+
+
+play_recorder = PlayRecorder(
+    maxsize=settings.play_queue_size,
+    flush_size=settings.play_flush_size,
+    flush_interval=settings.play_flush_interval,
+)
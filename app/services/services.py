@@ -1,8 +1,29 @@
+import codecs
+import csv
+import json
+import re
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import AsyncIterator
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.schemas.schemas import UserCreate, UserLogin, SongCreate, SongUpdate, PlaylistCreate, PlaylistUpdate
-from app.db.cruds.cruds import UserCrud, SongCrud, PlaylistCrud, PlaylistSongCrud
+from app.db.database import read_session
+from app.db.schemas.schemas import SongIngestReport, AuthUser, UserCreate, UserLogin, SongCreate, SongUpdate, SongSort, SongRead, SongPage, PlaylistCreate, PlaylistUpdate, PlayCreate, ChartPeriod, PLAYLIST_MAX_SONGS
+from app.db.cruds.cruds import UserCrud, SongCrud, PlaylistCrud, PlaylistSongCrud, RefreshTokenCrud
 from fastapi import HTTPException
-from app.core.jwt_context import get_pwd_hash, verify_pwd, create_access_token, create_refresh_token
+from jwt import InvalidTokenError
+from app.core.jwt_context import get_pwd_hash, verify_pwd, create_access_token, create_refresh_token, decode_refresh_token, new_token_id
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.serialization import dumps
+from app.core.cache import user_cache, revoked_tokens, revoked_families
+from app.core.settings import settings
+from app.services.cache import song_cache
+from app.services.plays import play_recorder
+from app.services.charts import chart_store
+from app.services.availability import availability_index
+from app.services.similar import similar_index
 
 # 1. User(사용자)와 관련된 서비스 클래스
 class UserService:
@@ -14,27 +35,54 @@ class UserService:
         if not db_user:
             raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
         return db_user
+
+    # 인증용 사용자 정보(id, role) 조회 : 캐시에 있으면 DB 조회 없이 반환
+    @staticmethod
+    async def get_auth_user(db: AsyncSession, id: int) -> AuthUser:
+        auth_user = user_cache.get(id, False)
+        if auth_user is False:
+            db_user = await UserCrud.get_id(db, id)
+            auth_user = AuthUser.model_validate(db_user) if db_user else None
+            user_cache.set(id, auth_user)
+        if auth_user is None:
+            raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
+        return auth_user
     
     # 회원가입 서비스
+    # 중복 확인은 users 테이블의 unique 제약(INSERT 실패)으로 하므로 동시에 가입해도 한 명만 성공.
+    # 사용 가능 여부 색인에 있을 수 있는 값일 때만 비밀번호 해시(bcrypt) 전에 DB로 미리 확인
     @staticmethod
     async def signup(db: AsyncSession, user:UserCreate):
+        if availability_index.maybe_taken(user.username, user.email):
+            UserService._raise_if_taken(await UserCrud.get_taken(db, user.username, user.email))
 
-        # 중복된 username 또는 email이 있는지 확인
-        if await UserCrud.get_username(db, user.username):
-            raise HTTPException(status_code=400, detail="이미 사용 중인 username입니다.")
-        if await UserCrud.get_email(db, user.email):
-            raise HTTPException(status_code=400, detail="이미 사용 중인 email입니다.")
-        
-        # 중복 없으면 username, email, password를 DB에 저장 (비밀번호는 해시값으로 저장)
+        # username, email, password를 DB에 저장 (비밀번호는 해시값으로 저장)
         user.password = await get_pwd_hash(user.password)
-
         try:
             db_user = await UserCrud.create(db, user)
             await db.commit()
-            await db.refresh(db_user)
-            return db_user
-        except Exception:
-            raise HTTPException(status_code=401, detail="잘못된 이메일 또는 비밀번호입니다.")
+        except IntegrityError:
+            await db.rollback()
+            UserService._raise_if_taken(await UserCrud.get_taken(db, user.username, user.email))
+            raise HTTPException(status_code=400, detail="이미 사용 중인 username 또는 email입니다.")
+
+        availability_index.add(db_user.username, db_user.email)
+        return db_user
+
+    # 이미 사용 중인 항목이 있으면 400
+    @staticmethod
+    def _raise_if_taken(taken: set[str]) -> None:
+        if "username" in taken:
+            raise HTTPException(status_code=400, detail="이미 사용 중인 username입니다.")
+        if "email" in taken:
+            raise HTTPException(status_code=400, detail="이미 사용 중인 email입니다.")
+
+    # username / email 사용 가능 여부 확인 (가입 화면 입력 중 확인용)
+    @staticmethod
+    async def check_availability(db: AsyncSession, username: str | None, email: str | None) -> dict:
+        if username is None and email is None:
+            raise HTTPException(status_code=400, detail="username 또는 email 중 하나 이상을 입력해주세요.")
+        return await availability_index.check(db, username, email)
     
     # 로그인 서비스
     @staticmethod
@@ -44,14 +92,77 @@ class UserService:
         if not db_user or not await verify_pwd(user.password, db_user.password):
             raise HTTPException(status_code=401, detail="잘못된 이메일 또는 비밀번호입니다.")
         
-        access_token = create_access_token(db_user.id)
-        refresh_token = create_refresh_token(db_user.id)
+        access_token = create_access_token(db_user.id, db_user.role.value)
+        user_cache.set(db_user.id, AuthUser.model_validate(db_user))
+        # 로그인마다 새 토큰 family 시작
+        refresh_token = await UserService._issue_refresh_token(db, db_user.id, new_token_id())
+        await db.commit()
+
+        return db_user, access_token, refresh_token
+
+    # refresh token 발급 + DB 기록 (commit 은 호출한 쪽에서)
+    @staticmethod
+    async def _issue_refresh_token(db: AsyncSession, user_id: int, family: str) -> str:
+        jti = new_token_id()
+        expires_at = datetime.now(timezone.utc).replace(tzinfo=None) + settings.refresh_token
+        await RefreshTokenCrud.create(db, jti, user_id, family, expires_at)
+        return create_refresh_token(user_id, jti, family)
+
+    # 쿠키의 refresh token 검증 (없거나 잘못된 토큰이면 401)
+    @staticmethod
+    def _decode_refresh_token(refresh_token: str | None) -> dict:
+        if not refresh_token:
+            raise HTTPException(status_code=401, detail="Refresh token missing")
+        try:
+            return decode_refresh_token(refresh_token)
+        except InvalidTokenError:
+            raise HTTPException(status_code=401, detail="Invalid token")
+
+    # 토큰 family 폐기 (DB + 이 프로세스의 폐기 목록)
+    @staticmethod
+    async def _revoke_family(db: AsyncSession, family: str) -> None:
+        await RefreshTokenCrud.revoke_family(db, family)
+        await db.commit()
+        revoked_families.set(family, True)
+
+    # 토큰 재발급 서비스 (access / refresh token 교체, 비밀번호 확인 없음)
+    # JWT 서명 확인 + UPDATE 한 번으로 토큰을 사용 처리하고 같은 family 로 새 토큰 발급.
+    # 이미 사용된 토큰이 다시 들어오면(탈취 의심) family 전체를 폐기하여 이후 교체된 토큰도 무효화
+    @staticmethod
+    async def refresh(db: AsyncSession, refresh_token: str | None) -> tuple:
+        claims = UserService._decode_refresh_token(refresh_token)
+        jti, family, user_id = claims["jti"], claims.get("fam"), claims["uid"]
+
+        # 이 프로세스에서 이미 폐기된 것을 알고 있으면 DB 조회 없이 거부
+        if family is None or revoked_families.get(family):
+            raise HTTPException(status_code=401, detail="Invalid token")
+        if revoked_tokens.get(jti):
+            await UserService._revoke_family(db, family)
+            raise HTTPException(status_code=401, detail="Invalid token")
 
-        updated_user = await UserCrud.update_refresh_token_id(db, db_user.id, refresh_token)
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        if not await RefreshTokenCrud.consume(db, jti, now):
+            # 이미 사용되었거나 폐기/만료된 토큰 -> 재사용으로 보고 family 폐기
+            await UserService._revoke_family(db, family)
+            raise HTTPException(status_code=401, detail="Invalid token")
+
+        auth_user = await UserService.get_auth_user(db, user_id)
+        new_refresh_token = await UserService._issue_refresh_token(db, user_id, family)
         await db.commit()
-        await db.refresh(updated_user)
+        revoked_tokens.set(jti, True, ttl=max(claims["exp"] - time.time(), 1))
 
-        return updated_user, access_token, refresh_token
+        access_token = create_access_token(user_id, auth_user.role.value)
+        return auth_user, access_token, new_refresh_token
+
+    # 로그아웃 서비스 : refresh token family 폐기 (토큰이 없거나 잘못되었으면 아무것도 하지 않음)
+    @staticmethod
+    async def logout(db: AsyncSession, refresh_token: str | None) -> None:
+        try:
+            claims = UserService._decode_refresh_token(refresh_token)
+        except HTTPException:
+            return
+        if claims.get("fam"):
+            await UserService._revoke_family(db, claims["fam"])
 
 
 # 2. Song(노래)과 관련된 서비스 클래스
@@ -65,26 +176,108 @@ class SongService:
             raise HTTPException(status_code=404, detail="노래를 찾을 수 없습니다.")
         return db_song
     
-    # 전체 노래 조회
+    # 노래 상세 응답(JSON 본문, ETag) 조회 - 캐시에 있으면 DB 조회와 직렬화 생략
+    # 최근에 쓰기를 한 클라이언트(기본 DB로 고정된 세션)는 캐시를 읽지 않고, 기본 DB에서 읽은 값으로 캐시를 덮어씀
+    @staticmethod
+    async def get_song_json(db: AsyncSession, id: int) -> tuple[bytes, str]:
+        key = await song_cache.song_key(id)
+        cached = None if db.info.get("primary_pinned") else await song_cache.get(key)
+        if cached:
+            return cached
+        db_song = await SongService.get_song(db, id)
+        return await song_cache.set(key, SongRead.model_validate(db_song).model_dump_json().encode())
+
+    # 여러 노래 한 번에 조회 (한 번의 IN 쿼리, 요청한 순서 유지, 중복 id는 한 번만)
+    @staticmethod
+    async def get_songs_batch(db: AsyncSession, ids: list[int]):
+        ids = list(dict.fromkeys(ids))
+        songs = {song.id: song for song in await SongCrud.get_by_ids(db, ids)}
+        return {
+            "items": [songs[id] for id in ids if id in songs],
+            "missing": [id for id in ids if id not in songs],
+        }
+
+    # 노래 목록 페이지 응답(JSON 본문, ETag) 조회 - 캐시에 있으면 DB 조회와 직렬화 생략
+    # FAST_JSON 이면 ORM 객체 / SongPage 검증 없이 행을 바로 JSON 으로 변환 (같은 JSON)
+    # 기본 DB로 고정된 세션은 get_song_json 과 같이 캐시를 읽지 않음
+    @staticmethod
+    async def get_songs_page_json(db: AsyncSession, limit: int, sort: SongSort, cursor: str | None = None) -> tuple[bytes, str]:
+        key = await song_cache.page_key(f"{sort.value}:{limit}:{cursor or ''}")
+        cached = None if db.info.get("primary_pinned") else await song_cache.get(key)
+        if cached:
+            return cached
+        if settings.fast_json:
+            page = await SongService.get_songs_page(db, limit, sort, cursor, rows=True)
+            body = dumps({"items": [row._asdict() for row in page["items"]], "next_cursor": page["next_cursor"]})
+        else:
+            page = await SongService.get_songs_page(db, limit, sort, cursor)
+            body = SongPage.model_validate(page).model_dump_json().encode()
+        return await song_cache.set(key, body)
+
+    # 노래 목록 페이지 조회 (커서 기반, rows=True 이면 ORM 객체 대신 행 반환)
+    @staticmethod
+    async def get_songs_page(db: AsyncSession, limit: int, sort: SongSort, cursor: str | None = None, rows: bool = False):
+        after = None
+        if cursor:
+            after = decode_cursor(cursor, sort.value)
+            expected = [str, int] if sort == SongSort.TITLE else [int]
+            if [type(key) for key in after] != expected:
+                raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+
+        fetch = SongCrud.get_page_rows if rows else SongCrud.get_page
+        songs = await fetch(db, limit, sort, after)
+
+        next_cursor = None
+        if len(songs) > limit:
+            songs = songs[:limit]
+            last = songs[-1]
+            keys = [last.title, last.id] if sort == SongSort.TITLE else [last.id]
+            next_cursor = encode_cursor(sort.value, keys)
+        return {"items": songs, "next_cursor": next_cursor}
+
+    # 노래 검색 서비스 (제목/가수, 입력 중 자동완성용 접두어 검색)
+    # FULLTEXT 검색 연산자(+, -, *, " 등)는 제거하고 단어만 최대 8개까지 사용
+    @staticmethod
+    async def search_songs(db: AsyncSession, q: str, limit: int):
+        terms = re.findall(r"\w+", q)[:8]
+        if not terms:
+            return []
+        return await SongCrud.search(db, terms, limit)
+
+    # 인기 차트 조회 (미리 계산된 차트에서 상위 limit 곡)
+    @staticmethod
+    async def get_chart(db: AsyncSession, period: ChartPeriod, limit: int, artist: str | None = None):
+        return await chart_store.get(db, period, limit, artist)
+
+    # 비슷한 노래 조회 (주기적으로 계산된 메모리 색인에서 상위 limit 곡, DB 조회 없음)
+    @staticmethod
+    def get_similar_songs(song_id: int, limit: int):
+        return similar_index.get(song_id, limit)
+
+    # 전체 노래 목록을 NDJSON(한 줄에 노래 하나) 문자열 조각으로 스트리밍
+    # 응답 전송 도중에도 세션이 유지되어야 하므로 요청 의존성(get_db)이 아닌 자체 세션 사용 (복제본이 있으면 복제본)
     @staticmethod
-    async def get_all_songs(db: AsyncSession):
-        return await SongCrud.get_all(db)
+    async def stream_songs(batch_size: int = 1000):
+        async with read_session() as db:
+            async for rows in SongCrud.stream_all(db, batch_size):
+                yield "".join(json.dumps(dict(row), ensure_ascii=False) + "\n" for row in rows)
     
     # 노래 생성 서비스
     @staticmethod
     async def create_song(db: AsyncSession, song: SongCreate):
         db_song = await SongCrud.create(db, song)
         await db.commit()
-        await db.refresh(db_song)
+        await song_cache.invalidate()   # 목록 페이지 캐시 무효화
         return db_song
     
-    # 노래 수정 서비스
+    # 노래 수정 서비스 (미리 조회하지 않고 UPDATE 결과로 존재 여부 확인)
     @staticmethod
     async def update_song(db: AsyncSession, id: int, song_update: SongUpdate):
-        db_song = await SongService.get_song(db, id) # get_song으로 노래 존재 여부 확인
         updated_song = await SongCrud.update_by_id(db, id, song_update)
+        if not updated_song:
+            raise HTTPException(status_code=404, detail="노래를 찾을 수 없습니다.")
         await db.commit()
-        await db.refresh(updated_song)
+        await song_cache.invalidate(id)     # 노래 상세 + 목록 페이지 캐시 무효화
         return updated_song
     
     # 노래 삭제 서비스
@@ -93,6 +286,7 @@ class SongService:
         db_song = await SongService.get_song(db, id) # get_song으로 노래 존재 여부 확인
         deleted_song = await SongCrud.delete_by_id(db, id)
         await db.commit()
+        await song_cache.invalidate(id)     # 노래 상세 + 목록 페이지 캐시 무효화
         return deleted_song
 
 
@@ -107,69 +301,342 @@ class PlaylistService:
             raise HTTPException(status_code=404, detail="플레이리스트를 찾을 수 없습니다.")
         return db_playlist
     
-    # 해당 사용자의 모든 플레이리스트 조회
+    # 해당 사용자의 모든 플레이리스트 요약 조회 (곡 수, 총 재생 시간)
     @staticmethod
     async def get_user_playlists(db: AsyncSession, user_id: int):
-        return await PlaylistCrud.get_all_by_user_id(db, user_id)
+        return await PlaylistCrud.get_summaries_by_user_id(db, user_id)
+
+    # 플레이리스트 요약 목록 응답(JSON 본문) - 집계 행을 검증 없이 바로 JSON 으로 변환 (FAST_JSON 용)
+    @staticmethod
+    async def get_user_playlists_json(db: AsyncSession, user_id: int) -> bytes:
+        rows = await PlaylistCrud.get_summaries_by_user_id(db, user_id)
+        return dumps([dict(row) for row in rows])
     
     # 플레이리스트 생성 서비스
     @staticmethod
     async def create_playlist(db: AsyncSession, playlist: PlaylistCreate, user_id: int):
         
-        # 객체를 생성하고 세션에 추가
+        # 객체를 생성하고 세션에 추가 (소유자, 빈 노래 목록까지 채워진 객체)
         db_playlist = await PlaylistCrud.create(db, playlist, user_id)
-        # commit 하기 전에 id를 변수에 저장
-        playlist_id = db_playlist.id
-        # 데이터베이스에 변경사항을 커밋
+        # 데이터베이스에 변경사항을 커밋 (commit 후에도 값이 유지되므로 다시 조회하지 않고 반환)
         await db.commit()
-        # 미리 저장해 둔 id를 사용하여 관계가 로드된 완전한 객체를 조회하여 반환
-        return await PlaylistCrud.get_id(db, playlist_id)
+        return db_playlist
     
-    # 플레이리스트 수정 서비스
+    # 소유자 확인까지 포함한 플레이리스트 조회
+    # 플레이리스트를 한 번만 로드하고, 다른 사용자의 플레이리스트면 403
+    @staticmethod
+    async def get_owned_playlist(db: AsyncSession, id: int, user_id: int, detail: str = "플레이리스트에 접근할 권한이 없습니다."):
+        db_playlist = await PlaylistService.get_playlist(db, id)
+        if db_playlist.user_id != user_id:
+            raise HTTPException(status_code=403, detail=detail)
+        return db_playlist
+
+    # 플레이리스트 소유자만 확인 (플레이리스트 내용은 로드하지 않음)
     @staticmethod
-    async def update_playlist(db: AsyncSession, id: int, playlist_update: PlaylistUpdate):
-        db_playlist = await PlaylistService.get_playlist(db, id) # get_playlist으로 플레이리스트 존재 여부 확인
-        updated_playlist = await PlaylistCrud.update_by_id(db, id, playlist_update)
+    async def check_owner(db: AsyncSession, id: int, user_id: int, detail: str = "플레이리스트에 접근할 권한이 없습니다."):
+        owner_id = await PlaylistCrud.get_owner_id(db, id)
+        if owner_id is None:
+            raise HTTPException(status_code=404, detail="플레이리스트를 찾을 수 없습니다.")
+        if owner_id != user_id:
+            raise HTTPException(status_code=403, detail=detail)
+
+    # 플레이리스트 수정 서비스 (본인만 가능)
+    @staticmethod
+    async def update_playlist(db: AsyncSession, id: int, playlist_update: PlaylistUpdate, user_id: int):
+        db_playlist = await PlaylistService.get_owned_playlist(db, id, user_id, "플레이리스트를 수정할 권한이 없습니다.")
+        updated_playlist = await PlaylistCrud.update(db, db_playlist, playlist_update)
         await db.commit()
-        await db.refresh(updated_playlist)
         return updated_playlist
     
-    # 플레이리스트 삭제 서비스
+    # 플레이리스트 삭제 서비스 (본인만 가능)
+    # 소유자 조건을 DELETE 문 자체에 넣어 조회 없이 삭제하고, 삭제된 행이 없을 때만 원인(404/403)을 확인
     @staticmethod
-    async def delete_playlist(db: AsyncSession, id: int):
-        db_playlist = await PlaylistService.get_playlist(db, id) # get_playlist으로 플레이리스트 존재 여부 확인
-        deleted_playlist = await PlaylistCrud.delete_by_id(db, id)
-        await db.commit()
-        return deleted_playlist
+    async def delete_playlist(db: AsyncSession, id: int, user_id: int):
+        if await PlaylistCrud.delete_owned(db, id, user_id):
+            await db.commit()
+            return True
+
+        await db.rollback()
+        owner_id = await PlaylistCrud.get_owner_id(db, id)
+        if owner_id is None:
+            raise HTTPException(status_code=404, detail="플레이리스트를 찾을 수 없습니다.")
+        raise HTTPException(status_code=403, detail="플레이리스트를 삭제할 권한이 없습니다.")
     
 
 # 4. PlaylistSong(플레이리스트-노래 관계)와 관련된 서비스 클래스
 class PlaylistSongService:
+
+    # 플레이리스트의 노래 목록 페이지 조회 (본인만 가능)
+    @staticmethod
+    async def get_playlist_songs(db: AsyncSession, playlist_id: int, user_id: int, limit: int, cursor: str | None = None):
+        await PlaylistService.check_owner(db, playlist_id, user_id)
+
+        after = None
+        if cursor:
+            after = decode_cursor(cursor, "playlist_song")
+            if [type(key) for key in after] != [int, int]:
+                raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+
+        rows = await PlaylistSongCrud.get_songs_page(db, playlist_id, limit, after)
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            song, position = rows[-1]
+            next_cursor = encode_cursor("playlist_song", [position, song.id])
+        return {"items": [song for song, _ in rows], "next_cursor": next_cursor}
     
-    # 플레이리스트에 노래 추가 서비스
+    # 플레이리스트에 노래 추가 서비스 (본인만 가능, 여러 곡 한 번에 가능)
+    # 추가 후 노래 수가 PLAYLIST_MAX_SONGS 를 넘으면 되돌리고 400 (이미 들어 있던 노래는 세지 않음)
     @staticmethod
-    async def add_song_to_playlist(db: AsyncSession, playlist_id: int, song_id: int):
+    async def add_songs_to_playlist(db: AsyncSession, playlist_id: int, song_ids: list[int], user_id: int):
+        song_ids = list(dict.fromkeys(song_ids))    # 중복 제거 (순서 유지)
+        await PlaylistService.check_owner(db, playlist_id, user_id, "플레이리스트를 수정할 권한이 없습니다.")
 
-        # 플레이리스트와 노래가 DB에 존재하는지 확인
-        db_playlist = await PlaylistService.get_playlist(db, playlist_id)
-        db_song = await SongService.get_song(db, song_id)
+        # 노래가 DB에 존재하는지 한 번의 쿼리로 확인
+        existing = await SongCrud.get_existing_ids(db, song_ids)
+        missing = [song_id for song_id in song_ids if song_id not in existing]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"노래를 찾을 수 없습니다: {missing}")
 
         # CRUD 호출하여 노래 추가
-        updated_playlist = await PlaylistSongCrud.add_song_to_playlist(db, db_playlist, db_song)
+        added, size = await PlaylistSongCrud.add_songs(db, playlist_id, song_ids)
+        if size > PLAYLIST_MAX_SONGS:
+            await db.rollback()
+            raise HTTPException(
+                status_code=400,
+                detail=f"플레이리스트에는 노래를 최대 {PLAYLIST_MAX_SONGS}곡까지 담을 수 있습니다.",
+            )
         await db.commit()
-        await db.refresh(updated_playlist)
-        return updated_playlist
+        return {"playlist_id": playlist_id, "song_ids": song_ids, "changed": added}
     
-    # 플레이리스트에서 노래 제거 서비스
+    # 플레이리스트에서 노래 제거 서비스 (본인만 가능, 여러 곡 한 번에 가능)
+    @staticmethod
+    async def remove_songs_from_playlist(db: AsyncSession, playlist_id: int, song_ids: list[int], user_id: int):
+        song_ids = list(dict.fromkeys(song_ids))
+        await PlaylistService.check_owner(db, playlist_id, user_id, "플레이리스트를 수정할 권한이 없습니다.")
+
+        # CRUD 호출하여 노래 제거 (플레이리스트에 없는 노래는 무시)
+        removed = await PlaylistSongCrud.remove_songs(db, playlist_id, song_ids)
+        await db.commit()
+        return {"playlist_id": playlist_id, "song_ids": song_ids, "changed": removed}
+
+    # 노래 하나를 after_song_id 바로 뒤로 이동 (None 이면 맨 앞으로, 본인만 가능)
+    # 앞뒤 노래 위치의 중간 값을 사용하므로 보통 한 행만 변경하고, 사이에 자리가 없을 때만 전체 위치를 다시 매김
+    @staticmethod
+    async def move_song(db: AsyncSession, playlist_id: int, song_id: int, after_song_id: int | None, user_id: int):
+        await PlaylistService.check_owner(db, playlist_id, user_id, "플레이리스트를 수정할 권한이 없습니다.")
+        if after_song_id == song_id:
+            raise HTTPException(status_code=400, detail="자기 자신 뒤로는 이동할 수 없습니다.")
+
+        if await PlaylistSongCrud.get_position(db, playlist_id, song_id) is None:
+            raise HTTPException(status_code=404, detail="플레이리스트에 없는 노래입니다.")
+        after = None
+        if after_song_id is not None:
+            after_position = await PlaylistSongCrud.get_position(db, playlist_id, after_song_id)
+            if after_position is None:
+                raise HTTPException(status_code=404, detail="플레이리스트에 없는 노래입니다.")
+            after = (after_position, after_song_id)
+
+        position = await PlaylistSongService._position_between(db, playlist_id, song_id, after)
+        if position is None:
+            # 간격이 다 찼으면 전체 위치를 다시 매긴 뒤 한 번 더 계산
+            await PlaylistSongCrud.renumber(db, playlist_id, await PlaylistSongCrud.get_song_ids(db, playlist_id))
+            if after is not None:
+                after = (await PlaylistSongCrud.get_position(db, playlist_id, after_song_id), after_song_id)
+            position = await PlaylistSongService._position_between(db, playlist_id, song_id, after)
+
+        changed = await PlaylistSongCrud.set_position(db, playlist_id, song_id, position)
+        await db.commit()
+        return {"playlist_id": playlist_id, "song_ids": [song_id], "changed": changed}
+
+    # after 와 그 다음 노래 사이의 새 위치 (사이에 정수 자리가 없으면 None)
     @staticmethod
-    async def remove_song_from_playlist(db: AsyncSession, playlist_id: int, song_id: int):
+    async def _position_between(db: AsyncSession, playlist_id: int, song_id: int, after: tuple | None) -> int | None:
+        gap = PlaylistSongCrud.POSITION_GAP
+        next_position = await PlaylistSongCrud.get_next_position(db, playlist_id, song_id, after)
+        if after is None:
+            return gap if next_position is None else next_position - gap
+        if next_position is None:
+            return after[0] + gap
+        if next_position - after[0] < 2:
+            return None
+        return (after[0] + next_position) // 2
 
-        # 플레이리스트와 노래가 DB에 존재하는지 확인
-        db_playlist = await PlaylistService.get_playlist(db, playlist_id)
-        db_song = await SongService.get_song(db, song_id)
+    # 플레이리스트 전체 순서 변경 (본인만 가능)
+    # song_ids 는 현재 노래 목록의 순열이어야 하며, 한 번의 UPDATE 로 한 트랜잭션에서 적용
+    @staticmethod
+    async def reorder_songs(db: AsyncSession, playlist_id: int, song_ids: list[int], user_id: int):
+        await PlaylistService.check_owner(db, playlist_id, user_id, "플레이리스트를 수정할 권한이 없습니다.")
+
+        current = await PlaylistSongCrud.get_song_ids(db, playlist_id)
+        if len(song_ids) != len(current) or set(song_ids) != set(current):
+            raise HTTPException(status_code=400, detail="플레이리스트의 모든 노래를 한 번씩 포함해야 합니다.")
 
-        # CRUD 호출하여 노래 제거
-        updated_playlist = await PlaylistSongCrud.remove_song_from_playlist(db, db_playlist, db_song)
+        changed = await PlaylistSongCrud.renumber(db, playlist_id, song_ids)
         await db.commit()
-        await db.refresh(updated_playlist)
-        return updated_playlist
\ No newline at end of file
+        return {"playlist_id": playlist_id, "song_ids": song_ids, "changed": changed}
+
+
+# csv.reader 에 줄을 넘겨주는 버퍼 (비어 있으면 StopIteration, 나중에 줄을 더 넣으면 이어서 읽힘)
+class _LineBuffer(deque):
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self:
+            raise StopIteration
+        return self.popleft()
+
+
+# 5. 노래 일괄 등록(ingest)과 관련된 서비스 클래스
+# 입력(NDJSON / CSV)을 한 줄씩 읽어 SongCreate로 검증하고, chunk_size 개씩 모아
+# 여러 행 INSERT + commit 으로 저장. 잘못된 행은 건너뛰고 오류 목록에 기록.
+class SongIngestService:
+    MAX_REPORTED_ERRORS = 1000
+
+    # bytes 조각 스트림(요청 본문, 파일 등)을 줄 단위 문자열로 변환
+    @staticmethod
+    async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+        decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        buffer = ""
+        async for chunk in chunks:
+            buffer += decoder.decode(chunk)
+            *lines, buffer = buffer.split("\n")
+            for line in lines:
+                yield line.rstrip("\r")
+        buffer += decoder.decode(b"", final=True)
+        if buffer:
+            yield buffer.rstrip("\r")
+
+    # 입력 줄을 (줄 번호, 행 dict) 로 변환, 파싱할 수 없는 행은 (줄 번호, 오류)
+    # CSV는 하나의 csv.reader 로 읽어 따옴표 안에 줄바꿈이 있는 필드도 한 행으로 처리 (첫 행의 헤더를 키로 사용)
+    # 따옴표가 닫히지 않은 줄은 닫힐 때까지 모아 두었다가 reader 에 넘기며, 줄 번호는 행이 시작된 줄
+    @staticmethod
+    async def _iter_rows(lines: AsyncIterator[str], fmt: str) -> AsyncIterator[tuple[int, dict | Exception]]:
+        line_no = 0
+        if fmt != "csv":
+            async for line in lines:
+                line_no += 1
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    yield line_no, e
+                    continue
+                yield line_no, row if isinstance(row, dict) else ValueError("JSON 객체가 아닙니다")
+            return
+
+        pending = _LineBuffer()
+        reader = csv.reader(pending)
+        header = None
+        start = 0
+        in_quotes = False
+        async for line in lines:
+            line_no += 1
+            if not pending and not line.strip():
+                continue
+            if not pending:
+                start = line_no
+            pending.append(line + "\n")
+            in_quotes ^= line.count('"') % 2 == 1
+            if in_quotes:
+                continue
+            while pending:
+                try:
+                    values = next(reader)
+                except csv.Error as e:
+                    yield start, e
+                    continue
+                if header is None:
+                    header = [name.strip() for name in values]
+                elif len(values) != len(header):
+                    yield start, ValueError(f"열 개수가 헤더와 다릅니다 ({len(values)} != {len(header)})")
+                else:
+                    yield start, dict(zip(header, values))
+        if pending:
+            yield start, ValueError("따옴표가 닫히지 않았습니다")
+
+    # 모아둔 행들을 한 번의 INSERT와 commit으로 저장
+    # 실패하면 해당 묶음만 한 행씩 다시 저장하여 문제 있는 행만 오류로 기록
+    @staticmethod
+    async def _write_chunk(db: AsyncSession, rows: list[tuple[int, dict]], report: dict) -> None:
+        try:
+            await SongCrud.bulk_create(db, [row for _, row in rows])
+            await db.commit()
+            report["inserted"] += len(rows)
+            return
+        except Exception:
+            await db.rollback()
+
+        for line_no, row in rows:
+            try:
+                await SongCrud.bulk_create(db, [row])
+                await db.commit()
+                report["inserted"] += 1
+            except Exception as e:
+                await db.rollback()
+                SongIngestService._add_error(report, line_no, str(getattr(e, "orig", e)))
+
+    @staticmethod
+    def _add_error(report: dict, line_no: int, error: str) -> None:
+        report["failed"] += 1
+        if len(report["errors"]) < SongIngestService.MAX_REPORTED_ERRORS:
+            report["errors"].append({"line": line_no, "error": error})
+
+    # 노래 일괄 등록 서비스
+    # fmt : "ndjson" 또는 "csv" (CSV는 title,artist,duration 헤더 필요)
+    @staticmethod
+    async def ingest_songs(db: AsyncSession, lines: AsyncIterator[str], fmt: str, chunk_size: int) -> SongIngestReport:
+        report = {"inserted": 0, "failed": 0, "errors": []}
+        start = time.perf_counter()
+        rows: list[tuple[int, dict]] = []
+
+        async for line_no, row in SongIngestService._iter_rows(lines, fmt):
+            if isinstance(row, Exception):
+                SongIngestService._add_error(report, line_no, str(row))
+                continue
+            try:
+                song = SongCreate.model_validate(row)
+            except ValidationError as e:
+                SongIngestService._add_error(report, line_no, str(e))
+                continue
+
+            rows.append((line_no, song.model_dump()))
+            if len(rows) >= chunk_size:
+                await SongIngestService._write_chunk(db, rows, report)
+                rows = []
+
+        if rows:
+            await SongIngestService._write_chunk(db, rows, report)
+        if report["inserted"]:
+            await song_cache.invalidate()   # 목록 페이지 캐시 무효화
+
+        elapsed = time.perf_counter() - start
+        return SongIngestReport(
+            **report,
+            elapsed=round(elapsed, 3),
+            rows_per_sec=round(report["inserted"] / elapsed, 1) if elapsed > 0 else 0.0,
+        )
+
+
+# 6. Play(재생 기록)와 관련된 서비스 클래스
+class PlayService:
+
+    # 재생 기록 접수 : DB에 바로 저장하지 않고 대기열에 넣은 뒤 바로 반환 (대기열이 가득 차면 503)
+    # 노래/사용자 존재 여부는 저장할 때 한 번에 확인
+    @staticmethod
+    def record_plays(user_id: int, plays: list[PlayCreate]) -> dict:
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        rows = []
+        for play in plays:
+            played_at = play.played_at
+            if played_at is None:
+                played_at = now
+            elif played_at.tzinfo is not None:
+                played_at = played_at.astimezone(timezone.utc).replace(tzinfo=None)
+            rows.append({"user_id": user_id, "song_id": play.song_id, "played_at": min(played_at, now)})
+        play_recorder.enqueue(rows)
+        return {"accepted": len(rows)}
@@ -0,0 +1,251 @@
+import asyncio
+import logging
+import os
+import random
+import time
+from datetime import datetime, timezone
+from fastapi import HTTPException
+from app.core.settings import settings
+from app.core.metrics import Counter, Gauge, Histogram
+from app.db.database import read_session
+from app.db.cruds.cruds import PlaylistSongCrud
+
+# similar.py : 비슷한 노래 추천 (플레이리스트에 함께 담긴 노래 기반, item-to-item)
+# SIMILAR_REFRESH_INTERVAL 초마다 playlist_songs 전체를 PK 순서로 SIMILAR_CHUNK_SIZE 행씩 읽어
+# 노래 x 노래 동시 등장 행렬을 희소 행렬 곱으로 계산하고, 노래마다 상위 SIMILAR_TOP_K 개만 배열 색인으로 보관.
+# 요청은 메모리의 색인만 조회 (이진 탐색 + 배열 조각, DB 조회 없음).
+# 계산은 playlist_songs 전체 스캔 + 행렬 곱이라 워커마다 하면 DB 부하와 메모리가 워커 수만큼 늘어나므로,
+# 운영에서는 SIMILAR_INDEX_PATH 를 지정하고 스케줄 작업(python -m app.cli.build_similar_index) 하나만 계산해 파일로 저장,
+# 워커는 그 파일만 주기적으로 다시 읽음 (파일이 바뀌었을 때만). 지정하지 않으면 워커가 직접 계산 (개발 / 단일 워커용).
+# 갱신 주기에는 ±10% 지터를 주어 워커들이 같은 시각에 몰리지 않게 함.
+# numpy / scipy (requirements.txt 에 포함) 는 워커 시작 시간을 줄이기 위해 처음 계산할 때 import 하며,
+# 설치되어 있지 않은 환경에서는 기능을 끄고 503 으로 응답.
+
+logger = logging.getLogger("app.similar")
+
+SIMILAR_BUILD_DURATION = Histogram(
+    "similar_index_build_duration_seconds", "Time spent rebuilding the similar-songs index",
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0),
+)
+SIMILAR_BUILD_FAILURES = Counter("similar_index_build_failures_total", "Failed similar-songs index rebuilds")
+SIMILAR_LAST_BUILD = Gauge("similar_index_last_build_timestamp_seconds", "Unix time of the last successful similar-songs index build")
+SIMILAR_INDEX_SONGS = Gauge("similar_index_songs", "Songs with an entry in the similar-songs index")
+
+
+# numpy / scipy import (없으면 None)
+def _load_numpy():
+    try:
+        import numpy as np
+        from scipy import sparse
+    except ImportError:
+        return None
+    return np, sparse
+
+
+# 플레이리스트-노래 쌍으로 비슷한 노래 색인 계산 (CPU 작업이므로 스레드에서 실행)
+#   A = 플레이리스트 x 노래 0/1 희소 행렬, C = Aᵀ A (두 노래가 함께 담긴 플레이리스트 수)
+#   score(i, j) = C[i, j] / sqrt(C[i, i] * C[j, j])  (코사인 유사도, 0~1)
+# C 전체를 한 번에 만들지 않고 열 묶음으로 나누어 계산하여 메모리 사용량을 제한.
+# 묶음 크기는 노래마다의 쌍 수 상한(그 노래가 담긴 플레이리스트들의 노래 수 합)이 block_pairs 를 넘지 않도록 정함
+# (인기 곡은 거의 모든 노래와 함께 담기므로 노래 수로 나누면 묶음마다 메모리 차이가 큼)
+# 노래가 max_playlist_size 개보다 많은 플레이리스트는 제외 (쌍의 수가 노래 수의 제곱으로 늘고 관련성도 낮음)
+# 반환 : (색인에 있는 노래 id 오름차순 배열, 비슷한 노래 id 배열 [노래 수 x top_k, 점수 내림차순],
+#         점수 배열 [노래 수 x top_k], 노래마다 채워진 칸 수 배열)
+def build_index(playlist_ids, song_ids, top_k: int, max_playlist_size: int, block_pairs: int = 1_000_000):
+    np, sparse = _load_numpy()
+
+    playlists, playlist_rows = np.unique(playlist_ids, return_inverse=True)
+    keep = np.bincount(playlist_rows)[playlist_rows] <= max_playlist_size
+    playlist_rows = playlist_rows[keep]
+    index_ids, song_cols = np.unique(song_ids[keep], return_inverse=True)
+    n = len(index_ids)
+
+    matrix = sparse.csc_matrix(
+        (np.ones(len(song_cols), dtype=np.float32), (playlist_rows, song_cols)),
+        shape=(len(playlists), n),
+    )
+    norms = np.sqrt(np.asarray(matrix.sum(axis=0), dtype=np.float32).ravel())
+    transposed = matrix.T.tocsr()
+
+    playlist_sizes = np.asarray(matrix.sum(axis=1), dtype=np.float64).ravel()
+    pair_bounds = np.cumsum(transposed @ playlist_sizes)
+
+    neighbors = np.full((n, top_k), -1, dtype=np.int32)
+    scores = np.zeros((n, top_k), dtype=np.float32)
+    start = 0
+    while start < n:
+        used = pair_bounds[start - 1] if start else 0.0
+        stop = max(start + 1, int(np.searchsorted(pair_bounds, used + block_pairs, side="right")))
+        block = (transposed @ matrix[:, start:stop]).tocoo()   # n x (stop - start) 동시 등장 횟수
+        others, songs, counts = block.row, block.col + start, block.data
+        mask = others != songs      # 자기 자신 제외
+        others, songs, counts = others[mask], songs[mask], counts[mask]
+        similarity = counts / (norms[others] * norms[songs])
+        # 노래별로 점수 내림차순 정렬 후, 노래 안에서의 순위가 top_k 미만인 것만 보관
+        order = np.lexsort((-similarity, songs))
+        others, songs, similarity = others[order], songs[order], similarity[order]
+        first = np.searchsorted(songs, songs)   # 정렬된 배열에서 같은 노래의 첫 위치
+        rank = np.arange(len(songs)) - first
+        keep = rank < top_k
+        neighbors[songs[keep], rank[keep]] = others[keep]
+        scores[songs[keep], rank[keep]] = similarity[keep]
+        start = stop
+
+    # 조회 시 searchsorted 가 파이썬 int(int64)와 비교하므로 노래 id 배열은 int64 로 보관 (dtype 이 다르면 매번 배열 전체 변환)
+    index_ids = index_ids.astype(np.int64)
+    counts = (neighbors >= 0).sum(axis=1).astype(np.int32)
+    neighbor_ids = np.where(neighbors >= 0, index_ids[np.maximum(neighbors, 0)], 0).astype(np.int32)
+    return index_ids, neighbor_ids, scores, counts
+
+
+INDEX_ARRAYS = ("index_ids", "neighbor_ids", "scores", "counts")
+
+
+# 색인을 파일로 저장 (임시 파일에 쓴 뒤 교체하므로 읽는 쪽은 이전 파일 또는 새 파일 전체만 봄)
+def save_index(np, path: str, index: tuple) -> None:
+    *arrays, generated_at = index
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, generated_at=np.array(generated_at.isoformat()), **dict(zip(INDEX_ARRAYS, arrays)))
+    os.replace(tmp_path, path)
+
+
+# 저장된 색인 파일 읽기 : (build_index 결과 배열 4개, 계산 시각)
+def load_index(np, path: str) -> tuple:
+    with np.load(path) as data:
+        arrays = tuple(data[name] for name in INDEX_ARRAYS)
+        return (*arrays, datetime.fromisoformat(str(data["generated_at"])))
+
+
+class SimilarSongIndex:
+
+    def __init__(self, top_k: int, refresh_interval: float, max_playlist_size: int, chunk_size: int,
+                 index_path: str | None = None):
+        self.top_k = top_k
+        self.refresh_interval = refresh_interval
+        self.max_playlist_size = max_playlist_size
+        self.chunk_size = chunk_size
+        self.index_path = index_path
+        self.available = True
+        self._index = None      # (build_index 결과 배열 4개, 계산 시각) - 통째로 교체
+        self._loaded_mtime = None   # 마지막으로 읽은 색인 파일의 수정 시각
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        SIMILAR_INDEX_SONGS.set_function(lambda: len(self._index[0]) if self._index else 0)
+
+    # 주기적 갱신 작업 시작 / 종료 (lifespan)
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="similar-index")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # 색인 파일이 지정되어 있으면 파일을 읽고, 없으면 직접 계산
+    async def _run(self) -> None:
+        while True:
+            try:
+                if self.index_path:
+                    await self.load()
+                else:
+                    await self.refresh()
+            except Exception:
+                SIMILAR_BUILD_FAILURES.inc()
+                logger.exception("similar songs index build failed")
+            if not self.available:
+                return
+            await asyncio.sleep(self.refresh_interval * random.uniform(0.9, 1.1))
+
+    # 스케줄 작업이 저장한 색인 파일 읽기 (수정 시각이 바뀌었을 때만, 파일 읽기는 스레드에서)
+    async def load(self) -> None:
+        modules = _load_numpy()
+        if modules is None:
+            if self.available:
+                logger.warning("numpy / scipy are not installed, similar songs are disabled")
+            self.available = False
+            return
+        try:
+            mtime = os.stat(self.index_path).st_mtime_ns
+        except FileNotFoundError:
+            logger.warning("similar songs index file %s does not exist yet", self.index_path)
+            return
+        if mtime == self._loaded_mtime:
+            return
+        self._index = await asyncio.to_thread(load_index, modules[0], self.index_path)
+        self._loaded_mtime = mtime
+        SIMILAR_LAST_BUILD.set(self._index[-1].replace(tzinfo=timezone.utc).timestamp())
+
+    # 현재 색인을 파일로 저장하고 색인에 있는 노래 수 반환 (스케줄 작업에서 refresh() 후 호출)
+    def save(self, path: str) -> int:
+        np, _ = _load_numpy()
+        save_index(np, path, self._index)
+        return len(self._index[0])
+
+    # playlist_songs 를 PK 순서로 chunk_size 행씩 읽어 (playlist_id 배열, song_id 배열)로 모음
+    async def _load_pairs(self, np):
+        playlist_chunks, song_chunks = [], []
+        after = None
+        async with read_session() as db:
+            while True:
+                rows = await PlaylistSongCrud.get_pairs_after(db, after, self.chunk_size)
+                if not rows:
+                    break
+                pairs = np.array(rows, dtype=np.int32)  # id 컬럼은 INT 이므로 int32 (행당 8바이트)
+                playlist_chunks.append(pairs[:, 0])
+                song_chunks.append(pairs[:, 1])
+                after = tuple(rows[-1])
+                if len(rows) < self.chunk_size:
+                    break
+        if not playlist_chunks:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32)
+        return np.concatenate(playlist_chunks), np.concatenate(song_chunks)
+
+    # 색인 다시 계산 (DB 읽기는 이벤트 루프에서 묶음 단위로, 행렬 계산은 스레드에서)
+    async def refresh(self) -> None:
+        modules = _load_numpy()
+        if modules is None:
+            if self.available:
+                logger.warning("numpy / scipy are not installed, similar songs are disabled")
+            self.available = False
+            return
+        async with self._lock:
+            start = time.perf_counter()
+            playlist_ids, song_ids = await self._load_pairs(modules[0])
+            index = await asyncio.to_thread(
+                build_index, playlist_ids, song_ids, self.top_k, self.max_playlist_size
+            )
+            self._index = (*index, datetime.now(timezone.utc).replace(tzinfo=None))
+            SIMILAR_BUILD_DURATION.observe(time.perf_counter() - start)
+            SIMILAR_LAST_BUILD.set(time.time())
+
+    # 노래 하나의 비슷한 노래 상위 limit 개 (색인에 없는 노래 = 함께 담긴 노래가 없으면 빈 목록)
+    def get(self, song_id: int, limit: int) -> dict:
+        if not self.available:
+            raise HTTPException(status_code=503, detail="비슷한 노래 추천을 사용할 수 없습니다.")
+        if self._index is None:
+            return {"song_id": song_id, "generated_at": None, "items": []}
+        index_ids, neighbor_ids, scores, counts, generated_at = self._index
+        row = int(index_ids.searchsorted(song_id))
+        items = []
+        if row < len(index_ids) and index_ids[row] == song_id:
+            count = min(limit, int(counts[row]))
+            items = [
+                {"song_id": other, "score": round(score, 4)}
+                for other, score in zip(neighbor_ids[row, :count].tolist(), scores[row, :count].tolist())
+            ]
+        return {"song_id": song_id, "generated_at": generated_at, "items": items}
+
+
+similar_index = SimilarSongIndex(
+    top_k=settings.similar_top_k,
+    refresh_interval=settings.similar_refresh_interval,
+    max_playlist_size=settings.similar_max_playlist_size,
+    chunk_size=settings.similar_chunk_size,
+    index_path=settings.similar_index_path,
+)
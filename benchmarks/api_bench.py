@@ -0,0 +1,275 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# api_bench.py : API 부하 테스트 / 회귀 비교용 벤치마크
+# main.py 의 FastAPI app 을 같은 프로세스에서 실행하고(ASGI transport), 로컬 DB(기본 SQLite)에
+# 사용자/노래/플레이리스트를 생성한 뒤 주요 API를 동시에 호출하여 결과를 JSON으로 저장.
+#   - 처리량(req/s), 지연시간 p50/p95/p99, 요청당 쿼리 수(X-DB-Query-Count 헤더)
+# httpx, aiosqlite(기본 SQLite DB) 필요 (pip install -r requirements-dev.txt)
+#
+# 예) python benchmarks/api_bench.py --songs 20000 --concurrency 32
+#     python benchmarks/api_bench.py --db-url "mysql+asyncmy://root:pw@localhost/bench" \
+#         --sync-db-url "mysql+pymysql://root:pw@localhost/bench"
+#     python benchmarks/compare.py benchmarks/results/old.json benchmarks/results/new.json
+
+SEED_PASSWORD = "bench-password"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="API throughput / latency benchmark")
+    parser.add_argument("--db-url", default=f"sqlite+aiosqlite:///{ROOT / 'benchmarks' / 'bench.db'}")
+    parser.add_argument("--sync-db-url", default=None, help="기본값: --db-url 에서 비동기 드라이버만 제거")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--songs", type=int, default=10_000)
+    parser.add_argument("--playlists-per-user", type=int, default=5)
+    parser.add_argument("--songs-per-playlist", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=1000, help="시나리오별 요청 수")
+    parser.add_argument("--login-requests", type=int, default=100, help="로그인은 bcrypt 비용이 커서 따로 지정")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="기본값: benchmarks/results/<시각>-<커밋>.json")
+    return parser.parse_args()
+
+
+def configure_env(args) -> None:
+    # app 을 import 하기 전에 설정해야 엔진이 벤치마크 DB로 만들어짐
+    sync_url = args.sync_db_url or args.db_url.replace("+aiosqlite", "").replace("+asyncmy", "+pymysql")
+    os.environ["DATABASE_URL"] = args.db_url
+    os.environ["SYNC_DATABASE_URL"] = sync_url
+    os.environ["SERVER_TIMING"] = "true"
+    os.environ["SCHEMA_CHECK"] = "off"  # 벤치마크 DB는 seed() 에서 create_all 로 만듦
+    os.environ.setdefault("PWD_HASH_MAX_PENDING", "100000")
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+# 벤치마크 DB 초기화 후 가짜 데이터 생성 (동기 엔진, 여러 행 INSERT)
+def seed(args) -> dict:
+    from sqlalchemy import insert
+    from app.core.jwt_context import pwd_context
+    from app.db.database import Base, sync_engine
+    from app.db.models.models import User, Song, Playlist, PlaylistSong, UserRole
+
+    rng = random.Random(args.seed)
+    Base.metadata.drop_all(sync_engine)
+    Base.metadata.create_all(sync_engine)
+
+    password = pwd_context.hash(SEED_PASSWORD)  # 모든 사용자가 같은 해시 사용 (생성 시간 단축)
+    users = [
+        {"id": i, "username": f"user{i}", "email": f"user{i}@bench.test", "password": password,
+         "role": UserRole.ADMIN if i == 1 else UserRole.USER}
+        for i in range(1, args.users + 1)
+    ]
+    songs = [
+        {"id": i, "title": f"song {i:07d}", "artist": f"artist {i % 500}", "duration": rng.randint(90, 420)}
+        for i in range(1, args.songs + 1)
+    ]
+    playlists, playlist_songs = [], []
+    for user in users:
+        for n in range(args.playlists_per_user):
+            playlist_id = len(playlists) + 1
+            playlists.append({"id": playlist_id, "name": f"playlist {n}", "desc": None, "user_id": user["id"]})
+            sampled = rng.sample(range(1, args.songs + 1), min(args.songs_per_playlist, args.songs))
+            for position, song_id in enumerate(sampled, 1):
+                playlist_songs.append({"playlist_id": playlist_id, "song_id": song_id, "position": position * 1024})
+
+    with sync_engine.begin() as conn:
+        for model, rows in ((User, users), (Song, songs), (Playlist, playlists), (PlaylistSong, playlist_songs)):
+            for i in range(0, len(rows), 5000):
+                conn.execute(insert(model), rows[i:i + 5000])
+    sync_engine.dispose()
+
+    owned = {}
+    for playlist in playlists:
+        owned.setdefault(playlist["user_id"], []).append(playlist["id"])
+    return {"users": users, "owned_playlists": owned}
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def summarize(latencies: list[float], queries: list[int], statuses: dict, wall: float) -> dict:
+    return {
+        "requests": len(latencies),
+        "rps": round(len(latencies) / wall, 1) if wall else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(statistics.fmean(latencies), 3) if latencies else 0.0,
+        "queries_per_request": round(statistics.fmean(queries), 2) if queries else 0.0,
+        "status": {str(code): count for code, count in sorted(statuses.items())},
+    }
+
+
+async def run_scenario(clients: list, total: int, make_request) -> dict:
+    latencies: list[float] = []
+    queries: list[int] = []
+    statuses: dict[int, int] = {}
+    remaining = iter(range(total))
+
+    async def worker(index: int, client):
+        rng = random.Random(index)
+        for _ in remaining:
+            start = time.perf_counter()
+            response = await make_request(client, rng)
+            latencies.append((time.perf_counter() - start) * 1000)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            queries.append(int(response.headers.get("x-db-query-count", 0)))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i, client) for i, client in enumerate(clients)))
+    return summarize(latencies, queries, statuses, time.perf_counter() - start)
+
+
+async def run(args, data: dict) -> dict:
+    import httpx
+    from main import app
+
+    users = data["users"]
+    owned = data["owned_playlists"]
+    results = {}
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        # 동시 사용자마다 별도 클라이언트(쿠키) 사용
+        clients = [
+            httpx.AsyncClient(transport=transport, base_url="http://bench")
+            for _ in range(args.concurrency)
+        ]
+        try:
+            async def login(client, rng):
+                user = rng.choice(users)
+                return await client.post("/users/login", json={"email": user["email"], "password": SEED_PASSWORD})
+
+            results["login"] = await run_scenario(clients, args.login_requests, login)
+
+            # 이후 시나리오를 위해 클라이언트마다 한 사용자로 로그인
+            client_users = {}
+            for i, client in enumerate(clients):
+                user = users[i % len(users)]
+                await client.post("/users/login", json={"email": user["email"], "password": SEED_PASSWORD})
+                client_users[id(client)] = user["id"]
+
+            cursors: dict[int, str | None] = {}
+
+            async def songs_page(client, rng):
+                cursor = cursors.get(id(client))
+                response = await client.get("/songs/", params={"limit": 50, **({"cursor": cursor} if cursor else {})})
+                cursors[id(client)] = response.json().get("next_cursor")
+                return response
+
+            async def song_detail(client, rng):
+                return await client.get(f"/songs/{rng.randint(1, args.songs)}")
+
+            # 쿠키의 refresh token 으로 토큰 교체 (응답의 새 쿠키가 다음 요청에 사용됨)
+            async def token_refresh(client, rng):
+                return await client.post("/users/refresh")
+
+            async def song_batch(client, rng):
+                ids = [rng.randint(1, args.songs) for _ in range(50)]
+                return await client.post("/songs/batch", json={"ids": ids})
+
+            async def play(client, rng):
+                return await client.post("/plays/", json={"song_id": rng.randint(1, args.songs)})
+
+            async def my_playlists(client, rng):
+                return await client.get("/playlists/")
+
+            async def playlist_add_remove(client, rng):
+                playlist_id = rng.choice(owned[client_users[id(client)]])
+                song_id = rng.randint(1, args.songs)
+                await client.post(f"/playlists/{playlist_id}/songs/{song_id}")
+                return await client.delete(f"/playlists/{playlist_id}/songs/{song_id}")
+
+            # 쓰기 요청 : 요청당 쿼리 수가 "쓰기 한 번 (+ 응답에 필요한 조회)" 로 유지되는지 compare.py 로 확인
+            async def playlist_create(client, rng):
+                return await client.post("/playlists/", json={"name": f"bench {rng.random():.6f}"})
+
+            async def playlist_update(client, rng):
+                playlist_id = rng.choice(owned[client_users[id(client)]])
+                return await client.patch(f"/playlists/{playlist_id}", json={"desc": f"updated {rng.random():.6f}"})
+
+            async def song_update(client, rng):
+                return await client.patch(f"/songs/{rng.randint(1, args.songs)}", json={"duration": rng.randint(90, 420)})
+
+            for name, scenario in (
+                ("token_refresh", token_refresh),
+                ("songs_page", songs_page),
+                ("song_detail", song_detail),
+                ("song_batch", song_batch),
+                ("my_playlists", my_playlists),
+                ("playlist_add_remove", playlist_add_remove),
+                ("play", play),
+                ("playlist_create", playlist_create),
+                ("playlist_update", playlist_update),
+            ):
+                results[name] = await run_scenario(clients, args.requests, scenario)
+            # 노래 수정은 관리자(user1)로 로그인한 첫 번째 클라이언트만 사용
+            results["song_update"] = await run_scenario(clients[:1], args.requests, song_update)
+        finally:
+            for client in clients:
+                await client.aclose()
+    return results
+
+
+def main():
+    args = parse_args()
+    configure_env(args)
+
+    started = time.perf_counter()
+    data = seed(args)
+    seed_seconds = time.perf_counter() - started
+
+    scenarios = asyncio.run(run(args, data))
+
+    commit = git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "db": args.db_url.split("://")[0],
+            "seed_seconds": round(seed_seconds, 2),
+            "params": {key: value for key, value in vars(args).items() if key not in ("output", "db_url", "sync_db_url")},
+        },
+        "scenarios": scenarios,
+    }
+
+    output = Path(args.output) if args.output else (
+        ROOT / "benchmarks" / "results" / f"{datetime.now():%Y%m%d-%H%M%S}-{commit}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+
+    for name, result in scenarios.items():
+        print(
+            f"{name:<22} {result['rps']:>9} req/s  p50 {result['p50_ms']:>8}ms  p95 {result['p95_ms']:>8}ms  "
+            f"p99 {result['p99_ms']:>8}ms  queries/req {result['queries_per_request']:>5}  {result['status']}"
+        )
+    print(f"saved {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from starlette.requests import Request
+from app.core.settings import settings
+from app.core.auth import get_user_id, get_token_claims, get_current_user
+from app.core.jwt_context import create_access_token, flush_token_cache
+
+# auth_bench.py : 인증 의존성 요청당 오버헤드 마이크로 벤치마크 (DB 불필요)
+# 같은 access token 쿠키로 인증 의존성을 반복 호출하여 호출당 시간(µs)을 측정.
+#   - no cache : TOKEN_CACHE_SIZE=0 과 같음 (매번 jwt.decode 서명 검증)
+#   - cached   : 토큰 claims 캐시 사용 (첫 호출만 검증)
+#
+# 예) python benchmarks/auth_bench.py --iterations 50000
+
+
+def make_request(token: str) -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": [(b"cookie", f"access_token={token}".encode())]})
+
+
+async def per_call_us(func, iterations: int, repeat: int) -> float:
+    results = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await func()
+        results.append((time.perf_counter() - start) / iterations * 1_000_000)
+    return statistics.median(results)
+
+
+async def run(args) -> None:
+    token = create_access_token(1, "USER")
+    request = make_request(token)
+
+    async def user_id():
+        return await get_user_id(request)
+
+    async def current_user():
+        return await get_current_user(await get_token_claims(request))
+
+    cache_size = settings.token_cache_size
+    print(f"{'dependency':<22}{'no cache':>12}{'cached':>12}{'speedup':>10}")
+    for name, func in (("get_user_id", user_id), ("get_current_user", current_user)):
+        settings.token_cache_size = 0
+        baseline = await per_call_us(func, args.iterations, args.repeat)
+        settings.token_cache_size = cache_size or 50000
+        flush_token_cache()
+        cached = await per_call_us(func, args.iterations, args.repeat)
+        print(f"{name:<22}{baseline:>10.2f}µs{cached:>10.2f}µs{baseline / cached:>9.1f}x")
+    settings.token_cache_size = cache_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="auth dependency overhead micro-benchmark")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
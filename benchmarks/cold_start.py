@@ -0,0 +1,87 @@
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# cold_start.py : 워커 시작(cold start) 시간 측정
+# 새 파이썬 프로세스에서 `import main` 과 lifespan 시작(스키마 리비전 확인)까지 걸리는 시간을 여러 번 재고,
+# 마지막 실행의 -X importtime 결과로 import 시간이 큰 모듈을 보여줌.
+# 오토스케일링 시 새 워커가 요청을 받기까지의 시간이므로 기준(--budget-ms)을 넘으면 종료 코드 1 반환.
+#
+# 예) python benchmarks/cold_start.py --runs 10
+#     DATABASE_URL=sqlite+aiosqlite:///benchmarks/bench.db python benchmarks/cold_start.py --startup
+
+# 자식 프로세스에서 실행할 코드 : 결과를 JSON 한 줄로 출력
+CHILD = """
+import json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+startup = None
+if {startup}:
+    import asyncio
+    async def boot():
+        async with main.app.router.lifespan_context(main.app):
+            pass
+    asyncio.run(boot())
+    startup = (time.perf_counter() - imported) * 1000
+print(json.dumps({{"import_ms": (imported - start) * 1000, "startup_ms": startup}}))
+"""
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)")
+
+
+def run_child(startup: bool, importtime: bool = False) -> tuple[dict, str]:
+    cmd = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", CHILD.format(startup=startup)]
+    proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True, env=os.environ.copy())
+    if proc.returncode != 0:
+        sys.exit(proc.stderr)
+    return json.loads(proc.stdout.strip().splitlines()[-1]), proc.stderr
+
+
+# -X importtime 출력에서 누적 시간이 큰 모듈 (main 바로 아래 단계만)
+def top_imports(stderr: str, count: int) -> list[tuple[str, float]]:
+    modules = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match and len(match.group(3)) == 3:
+            modules.append((match.group(4), int(match.group(2)) / 1000))
+    return sorted(modules, key=lambda item: item[1], reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="worker cold start benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--startup", action="store_true", help="lifespan 시작(DB 스키마 확인)까지 측정 (DB 필요)")
+    parser.add_argument("--top", type=int, default=15, help="import 시간이 큰 모듈 몇 개를 보여줄지")
+    parser.add_argument("--budget-ms", type=float, default=None, help="import+startup 중앙값 허용 기준(ms)")
+    args = parser.parse_args()
+
+    run_child(args.startup)  # 첫 실행은 .pyc 생성 / 디스크 캐시 때문에 제외
+    results = [run_child(args.startup)[0] for _ in range(args.runs)]
+    imports = [r["import_ms"] for r in results]
+    print(f"import main   median {statistics.median(imports):8.1f}ms  min {min(imports):8.1f}ms  max {max(imports):8.1f}ms")
+    total = statistics.median(imports)
+    if args.startup:
+        startups = [r["startup_ms"] for r in results]
+        print(f"lifespan      median {statistics.median(startups):8.1f}ms  min {min(startups):8.1f}ms  max {max(startups):8.1f}ms")
+        total += statistics.median(startups)
+
+    _, stderr = run_child(False, importtime=True)
+    print("\nslowest imports (cumulative, direct imports of main)")
+    for name, ms in top_imports(stderr, args.top):
+        print(f"  {ms:8.1f}ms  {name}")
+
+    if args.budget_ms is not None and total > args.budget_ms:
+        print(f"\ncold start {total:.1f}ms exceeds budget {args.budget_ms:.1f}ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import json
+import sys
+
+# compare.py : api_bench.py 결과(JSON) 두 개를 비교
+# 지연시간(p95/p99)이나 요청당 쿼리 수가 기준 이상 나빠진 시나리오가 있으면 종료 코드 1 반환.
+#
+# 예) python benchmarks/compare.py benchmarks/results/base.json benchmarks/results/new.json --threshold 10
+
+METRICS = [
+    # (이름, 클수록 나쁜지 여부)
+    ("rps", False),
+    ("p50_ms", True),
+    ("p95_ms", True),
+    ("p99_ms", True),
+    ("queries_per_request", True),
+]
+
+
+def change(old: float, new: float) -> float:
+    if old == 0:
+        return 0.0 if new == 0 else float("inf")
+    return (new - old) / old * 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description="compare two api_bench.py result files")
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=10.0, help="회귀로 판단할 변화율(%%)")
+    args = parser.parse_args()
+
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+
+    print(f"base {base['meta']['commit']} ({base['meta']['timestamp']})  ->  new {new['meta']['commit']} ({new['meta']['timestamp']})")
+    regressions = []
+    for name, new_result in new["scenarios"].items():
+        old_result = base["scenarios"].get(name)
+        if old_result is None:
+            print(f"\n{name}: (new scenario)")
+            continue
+        print(f"\n{name}")
+        for metric, higher_is_worse in METRICS:
+            old_value, new_value = old_result.get(metric, 0), new_result.get(metric, 0)
+            pct = change(old_value, new_value)
+            worse = pct > args.threshold if higher_is_worse else pct < -args.threshold
+            # 쿼리 수는 조금이라도 늘면 회귀로 판단 (N+1 감지)
+            if metric == "queries_per_request":
+                worse = new_value > old_value
+            flag = "  <-- regression" if worse else ""
+            print(f"  {metric:<20} {old_value:>10} -> {new_value:>10}  ({pct:+.1f}%){flag}")
+            if worse:
+                regressions.append(f"{name}.{metric}")
+
+    if regressions:
+        print(f"\nregressions: {', '.join(regressions)}")
+        sys.exit(1)
+    print("\nno regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+# login_burst.py : 로그인 폭주 중 GET /songs 지연시간 측정 벤치마크
+# 실행 중인 서버(uvicorn main:app)에 대해 아래 두 구간을 차례로 측정하고 p50/p95/p99를 출력.
+#   1) baseline : GET /songs 만 호출
+#   2) burst    : GET /songs 호출과 동시에 /users/login 을 계속 호출
+# httpx 필요 (pip install -r requirements-dev.txt)
+#
+# 예) python benchmarks/login_burst.py --email admin@test.com --password 1234 --duration 10
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+async def song_worker(client: httpx.AsyncClient, stop_at: float, latencies: list[float]):
+    while time.perf_counter() < stop_at:
+        start = time.perf_counter()
+        resp = await client.get("/songs/")
+        resp.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+
+async def login_worker(client: httpx.AsyncClient, stop_at: float, payload: dict, counts: dict):
+    while time.perf_counter() < stop_at:
+        resp = await client.post("/users/login", json=payload)
+        counts[resp.status_code] = counts.get(resp.status_code, 0) + 1
+
+
+async def run_phase(args, with_logins: bool) -> dict:
+    latencies: list[float] = []
+    login_counts: dict[int, int] = {}
+    stop_at = time.perf_counter() + args.duration
+    payload = {"email": args.email, "password": args.password}
+
+    limits = httpx.Limits(max_connections=args.song_concurrency + args.login_concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=30) as client:
+        tasks = [song_worker(client, stop_at, latencies) for _ in range(args.song_concurrency)]
+        if with_logins:
+            tasks += [
+                login_worker(client, stop_at, payload, login_counts)
+                for _ in range(args.login_concurrency)
+            ]
+        await asyncio.gather(*tasks)
+
+    return {
+        "requests": len(latencies),
+        "rps": round(len(latencies) / args.duration, 1),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "mean_ms": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+        "login_status": login_counts,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="GET /songs latency during a login burst")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per phase")
+    parser.add_argument("--song-concurrency", type=int, default=8)
+    parser.add_argument("--login-concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    for name, with_logins in (("baseline", False), ("login burst", True)):
+        result = await run_phase(args, with_logins)
+        print(f"[{name}] {result}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
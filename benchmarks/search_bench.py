@@ -0,0 +1,153 @@
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# search_bench.py : GET /songs/search 에서 사용하는 검색 서비스의 지연시간 벤치마크
+# 벤치마크 전용 DB(--db-url, 기본 benchmarks/search_bench.db SQLite)에 가짜 노래 카탈로그(기본 100만 곡)를 만들고,
+# 동시에 여러 검색(자동완성 접두어 포함)을 실행하여 p50/p95/p99 를 출력.
+# .env 의 DB는 사용하지 않음. FULLTEXT 검색을 측정하려면 빈 MySQL DB를 --db-url 로 지정.
+# 기본 SQLite DB는 aiosqlite 필요 (pip install -r requirements-dev.txt)
+# songs 테이블에 이미 행이 있으면 seed 하지 않고 종료 (--skip-seed 로 그대로 검색만 하거나, --allow-existing 으로 채우기)
+#
+# 예) python benchmarks/search_bench.py --songs 100000 --queries 2000
+#     python benchmarks/search_bench.py --db-url "mysql+asyncmy://root:pw@localhost/search_bench" \
+#         --sync-db-url "mysql+pymysql://root:pw@localhost/search_bench" --songs 1000000 --concurrency 32
+
+WORDS = [
+    "love", "night", "summer", "dream", "heart", "blue", "light", "rain", "star", "road",
+    "fire", "moon", "river", "ocean", "city", "home", "wild", "gold", "shadow", "sky",
+    "사랑", "밤", "여름", "꿈", "마음", "하늘", "별", "바다", "거리", "노래",
+]
+ARTISTS = [f"{first} {last}" for first in ("Kim", "Lee", "Park", "Choi", "Jung", "Kang") for last in
+           ("Band", "Trio", "Project", "Crew", "Orchestra", "Sisters", "Brothers", "Club")]
+
+
+def random_title(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4)))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="song search latency benchmark")
+    parser.add_argument("--db-url", default=f"sqlite+aiosqlite:///{ROOT / 'benchmarks' / 'search_bench.db'}")
+    parser.add_argument("--sync-db-url", default=None, help="기본값: --db-url 에서 비동기 드라이버만 제거")
+    parser.add_argument("--songs", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--skip-seed", action="store_true")
+    parser.add_argument("--allow-existing", action="store_true", help="행이 있는 songs 테이블에도 가짜 노래 추가")
+    parser.add_argument("--queries", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--target-p99-ms", type=float, default=50.0)
+    return parser.parse_args()
+
+
+def configure_env(args) -> None:
+    # app 을 import 하기 전에 설정해야 엔진이 벤치마크 DB로 만들어짐
+    sync_url = args.sync_db_url or args.db_url.replace("+aiosqlite", "").replace("+asyncmy", "+pymysql")
+    os.environ["DATABASE_URL"] = args.db_url
+    os.environ["SYNC_DATABASE_URL"] = sync_url
+    os.environ["REPLICA_DATABASE_URLS"] = ""
+    os.environ["SCHEMA_CHECK"] = "off"  # 벤치마크 DB는 seed() 에서 create_all 로 만듦
+
+
+def seed(count: int, batch_size: int, allow_existing: bool) -> None:
+    from sqlalchemy import insert, func, select
+    from app.db.database import Base, sync_engine
+    from app.db.models.models import Song
+
+    rng = random.Random(42)
+    Base.metadata.create_all(sync_engine)
+    with sync_engine.begin() as conn:
+        existing = conn.execute(select(func.count()).select_from(Song)).scalar_one()
+    print(f"songs already in table: {existing}")
+    if existing and not allow_existing:
+        sys.exit(
+            f"songs table at {sync_engine.url.render_as_string(hide_password=True)} is not empty; "
+            "use an empty database, --skip-seed to reuse it, or --allow-existing to add fake songs anyway"
+        )
+
+    start = time.perf_counter()
+    for offset in range(existing, count, batch_size):
+        rows = [
+            {
+                "title": random_title(rng),
+                "artist": rng.choice(ARTISTS),
+                "duration": rng.randint(90, 420),
+            }
+            for _ in range(min(batch_size, count - offset))
+        ]
+        with sync_engine.begin() as conn:
+            conn.execute(insert(Song), rows)
+    print(f"seeded up to {count} songs in {time.perf_counter() - start:.1f}s")
+    sync_engine.dispose()
+
+
+def random_query(rng: random.Random) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(1, 2))]
+    # 마지막 단어는 입력 중인 것처럼 앞부분만 사용 (자동완성)
+    words[-1] = words[-1][: rng.randint(2, len(words[-1]))] if len(words[-1]) > 2 else words[-1]
+    return " ".join(words)
+
+
+async def run_queries(total: int, concurrency: int, limit: int) -> list[float]:
+    from app.db.database import AsyncSessionLocal
+    from app.services.services import SongService
+
+    latencies: list[float] = []
+    queue: asyncio.Queue = asyncio.Queue()
+    rng = random.Random(7)
+    for _ in range(total):
+        queue.put_nowait(random_query(rng))
+
+    async def worker():
+        async with AsyncSessionLocal() as db:
+            while not queue.empty():
+                q = queue.get_nowait()
+                start = time.perf_counter()
+                await SongService.search_songs(db, q, limit)
+                latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def run(args):
+    from app.db.database import async_engine
+
+    start = time.perf_counter()
+    latencies = await run_queries(args.queries, args.concurrency, args.limit)
+    elapsed = time.perf_counter() - start
+    await async_engine.dispose()
+
+    p99 = percentile(latencies, 99)
+    print(
+        f"queries={len(latencies)} qps={len(latencies) / elapsed:.0f} "
+        f"p50={percentile(latencies, 50):.2f}ms p95={percentile(latencies, 95):.2f}ms "
+        f"p99={p99:.2f}ms mean={statistics.fmean(latencies):.2f}ms"
+    )
+    print(f"p99 target {args.target_p99_ms}ms: {'OK' if p99 <= args.target_p99_ms else 'MISSED'}")
+
+
+def main():
+    args = parse_args()
+    configure_env(args)
+    if not args.skip_seed:
+        seed(args.songs, args.batch_size, args.allow_existing)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# serialize_bench.py : 노래 목록 응답 하나(기본 1만 곡)를 만드는 데 드는 CPU 시간 비교
+# 임시 SQLite DB 에 노래를 만들고, 같은 페이지를 경로별로 조회 + JSON 변환하여 응답당 CPU 시간(ms)을 측정.
+#   - orm + response_model  : ORM 객체를 반환하고 FastAPI 가 response_model 로 검증/변환 후 json.dumps (기본 동작)
+#   - orm + model_dump_json : ORM 객체 -> SongPage 검증 -> pydantic JSON (FAST_JSON=false 인 현재 경로)
+#   - rows + json           : 행 -> dict -> 표준 json (FAST_JSON=true, orjson 미설치)
+#   - rows + orjson         : 행 -> dict -> orjson (FAST_JSON=true, orjson 설치 시)
+#
+# 예) python benchmarks/serialize_bench.py --songs 10000 --repeat 20
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="list response serialization CPU benchmark")
+    parser.add_argument("--songs", type=int, default=10_000, help="응답 하나에 담을 노래 수")
+    parser.add_argument("--repeat", type=int, default=20)
+    return parser.parse_args()
+
+
+async def seed(engine, count: int) -> None:
+    from sqlalchemy import insert
+    from app.db.database import Base
+    from app.db.models.models import Song
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, tables=[Song.__table__])
+        await conn.execute(insert(Song), [
+            {"title": f"노래 {i} \"quoted\"", "artist": f"artist {i % 500}", "duration": 120 + i % 240}
+            for i in range(count)
+        ])
+
+
+async def run(args) -> None:
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_model_field
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.core import serialization
+    from app.db.schemas.schemas import SongPage, SongSort
+    from app.services.services import SongService
+
+    tmp = tempfile.mkdtemp()
+    engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'serialize.db')}")
+    Session = sessionmaker(bind=engine, class_=AsyncSession)
+    await seed(engine, args.songs)
+    response_field = create_model_field(name="Response_get_all_songs", type_=SongPage, mode="serialization")
+
+    async def orm_response_model(db):
+        page = await SongService.get_songs_page(db, args.songs, SongSort.ID)
+        content = await serialize_response(field=response_field, response_content=page)
+        return JSONResponse(content).body
+
+    async def orm_model_dump_json(db):
+        page = await SongService.get_songs_page(db, args.songs, SongSort.ID)
+        return SongPage.model_validate(page).model_dump_json().encode()
+
+    def rows_with(dumps):
+        async def rows(db):
+            page = await SongService.get_songs_page(db, args.songs, SongSort.ID, rows=True)
+            return dumps({"items": [row._asdict() for row in page["items"]], "next_cursor": page["next_cursor"]})
+        return rows
+
+    paths = [
+        ("orm + response_model", orm_response_model),
+        ("orm + model_dump_json", orm_model_dump_json),
+        ("rows + json", rows_with(serialization.stdlib_dumps)),
+    ]
+    fast = serialization.encoder()
+    if fast is not serialization.stdlib_dumps:
+        paths.append(("rows + orjson", rows_with(fast)))
+    else:
+        print("orjson is not installed, skipping rows + orjson")
+
+    expected = None
+    results = {}
+    for name, func in paths:
+        samples = []
+        for _ in range(args.repeat + 1):
+            async with Session() as db:
+                start = time.process_time()
+                body = await func(db)
+                samples.append((time.process_time() - start) * 1000)
+        if expected is None:
+            expected = json.loads(body)
+        elif json.loads(body) != expected:
+            sys.exit(f"{name}: response differs from the default path")
+        results[name] = statistics.median(samples[1:])  # 첫 실행은 준비 단계로 제외
+
+    baseline = results[paths[0][0]]
+    print(f"\nCPU per {args.songs}-song response (median of {args.repeat})")
+    for name, ms in results.items():
+        print(f"  {name:<24}{ms:>9.1f}ms{baseline / ms:>8.1f}x")
+    await engine.dispose()
+
+
+def main():
+    args = parse_args()
+    os.environ.setdefault("SCHEMA_CHECK", "off")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
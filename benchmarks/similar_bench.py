@@ -0,0 +1,71 @@
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.similar import SimilarSongIndex, build_index, _load_numpy
+
+# similar_bench.py : 비슷한 노래 색인 계산 시간 / 메모리, 조회 지연시간 벤치마크 (DB 불필요, numpy/scipy 필요)
+# 가짜 플레이리스트-노래 쌍(인기 곡에 몰리도록 Zipf 분포)을 만들어 build_index 를 실행하고,
+# 만들어진 색인으로 GET /songs/{id}/similar 가 하는 조회(SimilarSongIndex.get)의 호출당 시간(µs)을 측정.
+#
+# 예) python benchmarks/similar_bench.py --playlists 200000 --songs 500000 --avg-size 50
+
+
+def make_pairs(np, playlists: int, songs: int, avg_size: int, seed: int):
+    rng = np.random.default_rng(seed)
+    sizes = np.clip(rng.poisson(avg_size, playlists), 1, None)
+    playlist_ids = np.repeat(np.arange(1, playlists + 1, dtype=np.int32), sizes)
+    song_ids = (rng.zipf(1.2, len(playlist_ids)) % songs + 1).astype(np.int32)
+    # 같은 플레이리스트 안의 중복 노래 제거 (playlist_songs PK 와 같게)
+    pairs = np.unique(np.stack([playlist_ids, song_ids], axis=1), axis=0)
+    return pairs[:, 0], pairs[:, 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="similar songs index benchmark")
+    parser.add_argument("--playlists", type=int, default=50_000)
+    parser.add_argument("--songs", type=int, default=100_000)
+    parser.add_argument("--avg-size", type=int, default=40, help="플레이리스트당 평균 노래 수")
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--max-playlist-size", type=int, default=1000)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    modules = _load_numpy()
+    if modules is None:
+        sys.exit("numpy / scipy 가 필요합니다.")
+    np = modules[0]
+
+    playlist_ids, song_ids = make_pairs(np, args.playlists, args.songs, args.avg_size, args.seed)
+    print(f"playlist rows {len(playlist_ids):,}  playlists {args.playlists:,}  catalog {args.songs:,}")
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    built = build_index(playlist_ids, song_ids, args.top_k, args.max_playlist_size)
+    build = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    size = sum(array.nbytes for array in built)
+    print(f"build {build:8.2f}s  peak memory {peak / 2**20:8.1f}MiB  index {size / 2**20:.1f}MiB for {len(built[0]):,} songs")
+
+    index = SimilarSongIndex(args.top_k, 0, args.max_playlist_size, 0)
+    index._index = (*built, None)
+    rng = np.random.default_rng(args.seed)
+    targets = built[0][rng.integers(0, len(built[0]), args.lookups)].tolist()
+    samples = []
+    for _ in range(5):
+        start = time.perf_counter()
+        for song_id in targets:
+            index.get(song_id, 10)
+        samples.append((time.perf_counter() - start) / len(targets) * 1_000_000)
+    print(f"lookup (limit 10) {statistics.median(samples):8.2f}µs per call")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,47 @@
-import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.concurrency import asynccontextmanager
-from app.db.database import Base, async_engine
-from app.routers import user, song, playlist
+from app.db.database import async_engine, replicas
+from app.db.migrations import check_schema_revision
+from app.core.jwt_context import shutdown_pwd_executor
+from app.services.plays import play_recorder
+from app.services.charts import chart_store
+from app.services.availability import availability_index
+from app.services.similar import similar_index
+from app.routers import user, song, playlist, play, metrics
+from app.core.instrumentation import InstrumentationMiddleware
 
 # main.py : FastAPI 애플리케이션 진입점
 # 애플리케이션 인스턴스 생성, 미들웨어 설정, 라우터 포함
-# 애플리케이션 수명 주기(lifespan)동안 데이터베이스 테이블을 생성
+# 애플리케이션 시작 시 DB 스키마 리비전만 확인 (테이블 생성/변경은 alembic upgrade head 로 수행)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    async with async_engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    try:
+        await check_schema_revision(async_engine)
+    except Exception:
+        await async_engine.dispose()  # 커넥션을 정리해야 프로세스가 바로 종료됨
+        raise
+    replicas.start()               # 읽기 복제본 상태 확인 (설정된 경우)
+    play_recorder.start()
+    chart_store.start()
+    availability_index.start()     # 가입된 username / email 색인 채우기 (백그라운드)
+    similar_index.start()          # 비슷한 노래 색인 계산 또는 SIMILAR_INDEX_PATH 파일 읽기 (백그라운드, numpy/scipy 필요)
     yield
+    await similar_index.stop()
+    await availability_index.stop()
+    await chart_store.stop()
+    await play_recorder.stop()     # 대기열에 남은 재생 기록을 모두 저장한 뒤 종료
+    await replicas.stop()
+    shutdown_pwd_executor()
     await async_engine.dispose()
 
 app=FastAPI(lifespan=lifespan)
 
 # 미들웨어 등록
 
+# 요청별 지연시간 / 쿼리 수 측정 (/metrics 로 확인)
+app.add_middleware(InstrumentationMiddleware)
 
 # CORS 설정
 app.add_middleware(
@@ -33,4 +55,13 @@ app.add_middleware(
 # 라우터 등록
 app.include_router(user.router)
 app.include_router(song.router)
-app.include_router(playlist.router)
\ No newline at end of file
+app.include_router(playlist.router)
+app.include_router(play.router)
+app.include_router(metrics.router)
+
+
+# 직접 실행 (python main.py) - uvicorn 은 여기서만 import (워커 import 시간 단축)
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run("main:app", host="0.0.0.0", port=8000)
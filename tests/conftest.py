@@ -0,0 +1,65 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# conftest.py : 테스트 공통 설정
+# app 을 import 하기 전에 임시 SQLite DB 를 쓰도록 환경 변수를 지정하고(.env 의 MySQL 대신),
+# 테이블 생성 + 기본 데이터(관리자 / 일반 사용자 / 노래)를 넣은 뒤 lifespan 을 실행한 TestClient 를 제공.
+# 응답의 X-DB-Query-Count 헤더(SERVER_TIMING=true)로 요청 하나가 실행한 쿼리 수를 확인.
+
+_DB_PATH = os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_DB_PATH}"
+os.environ["SYNC_DATABASE_URL"] = f"sqlite:///{_DB_PATH}"
+os.environ["SCHEMA_CHECK"] = "off"
+os.environ["SERVER_TIMING"] = "true"
+os.environ["REPLICA_DATABASE_URLS"] = ""
+
+PASSWORD = "test-password"
+ADMIN = {"id": 1, "username": "admin", "email": "admin@test.com"}
+USER = {"id": 2, "username": "user", "email": "user@test.com"}
+
+
+def _seed() -> None:
+    from sqlalchemy import insert
+    from app.core.jwt_context import pwd_context
+    from app.db.database import Base, sync_engine
+    from app.db.models.models import User, Song, UserRole
+
+    Base.metadata.create_all(sync_engine)
+    password = pwd_context.hash(PASSWORD)
+    with sync_engine.begin() as conn:
+        conn.execute(insert(User), [
+            {**ADMIN, "password": password, "role": UserRole.ADMIN},
+            {**USER, "password": password, "role": UserRole.USER},
+        ])
+        conn.execute(insert(Song), [
+            {"id": i, "title": f"song {i}", "artist": f"artist {i % 3}", "duration": 180 + i}
+            for i in range(1, 11)
+        ])
+    sync_engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    _seed()
+    from main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+# 로그인 (이후 요청은 client 의 쿠키로 인증)
+@pytest.fixture
+def login(client):
+    def _login(account: dict):
+        response = client.post("/users/login", json={"email": account["email"], "password": PASSWORD})
+        assert response.status_code == 200, response.text
+        return response
+    return _login
@@ -0,0 +1,39 @@
+import asyncio
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.db.models.models import User
+from app.services import availability
+from app.services.availability import AvailabilityIndex
+
+
+def _user(id: int) -> dict:
+    return {"id": id, "username": f"name{id}", "email": f"name{id}@test.com", "password": "x"}
+
+
+# 동시 가입으로 id 가 작은 사용자가 나중에 commit 되어도, 다음 갱신에서 필터에 들어가야 함
+def test_refresh_picks_up_late_commits(monkeypatch, tmp_path):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'users.db'}")
+        monkeypatch.setattr(availability, "read_session", sessionmaker(bind=engine, class_=AsyncSession))
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[User.__table__])
+
+        index = AvailabilityIndex(capacity=1000, error_rate=0.001, refresh_interval=60, rebuild_interval=3600)
+        await index.rebuild()
+        async with engine.begin() as conn:
+            await conn.execute(insert(User), [_user(101)])
+        await index.refresh()
+        async with engine.begin() as conn:
+            await conn.execute(insert(User), [_user(100)])     # 101 보다 늦게 commit
+        await index.refresh()
+        await engine.dispose()
+
+        assert index.maybe_taken(username="name100")
+        assert index.maybe_taken(email="NAME101@test.com")
+        assert not index.maybe_taken(username="name102")
+
+    asyncio.run(scenario())
@@ -0,0 +1,25 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.settings import settings
+from app.db.migrations import check_schema_revision
+
+
+# 리비전 기록 없이 테이블만 있는 DB(create_all)는 strict 모드에서 시작을 막고 stamp 방법을 안내
+def test_unversioned_database_gets_stamp_hint(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "schema_check", "strict")
+
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'old.db'}")
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY)"))
+        try:
+            await check_schema_revision(engine)
+        finally:
+            await engine.dispose()
+
+    with pytest.raises(RuntimeError, match="alembic stamp 3b8e1f6a2c40"):
+        asyncio.run(scenario())
@@ -0,0 +1,20 @@
+from app.services import services
+from conftest import USER
+
+
+# 노래 수 상한을 넘는 추가는 통째로 되돌리고, 이미 들어 있는 노래를 다시 추가하는 것은 상한에 걸리지 않음
+def test_add_songs_respects_max_size(client, login, monkeypatch):
+    monkeypatch.setattr(services, "PLAYLIST_MAX_SONGS", 3)
+    login(USER)
+    playlist_id = client.post("/playlists/", json={"name": "full"}).json()["id"]
+
+    assert client.post(f"/playlists/{playlist_id}/songs", json={"song_ids": [1, 2]}).json()["changed"] == 2
+    response = client.post(f"/playlists/{playlist_id}/songs", json={"song_ids": [3, 4]})
+    assert response.status_code == 400
+
+    assert client.post(f"/playlists/{playlist_id}/songs/3").json()["changed"] == 1
+    assert client.post(f"/playlists/{playlist_id}/songs/1").json()["changed"] == 0
+    assert client.post(f"/playlists/{playlist_id}/songs/4").status_code == 400
+
+    songs = client.get(f"/playlists/{playlist_id}/songs").json()["items"]
+    assert [song["id"] for song in songs] == [1, 2, 3]
@@ -0,0 +1,101 @@
+from conftest import ADMIN, USER, PASSWORD
+
+# test_query_counts.py : 쓰기 요청 하나가 실행하는 쿼리 수 고정
+# 쿼리 수가 늘어나는 변경(중복 조회, commit 후 다시 조회 등)이 들어오면 실패.
+# 인증은 토큰 내용 + 사용자 캐시로 처리하므로 로그인 후의 요청에는 사용자 조회가 포함되지 않음.
+# 쓰기 요청은 commit 후 다시 조회하지 않음 (expire_on_commit=False, SQLite 는 UPDATE ... RETURNING 사용).
+
+
+# 응답을 만드는 동안 실행된 쿼리 수 (X-DB-Query-Count 헤더)
+def query_count(response) -> int:
+    return int(response.headers["x-db-query-count"])
+
+
+def _create_playlist(client, name: str = "playlist") -> int:
+    response = client.post("/playlists/", json={"name": name})
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+# 플레이리스트 수정 : 플레이리스트 조회(소유자 JOIN) + 노래 목록 조회 + UPDATE
+def test_update_playlist(client, login):
+    login(USER)
+    playlist_id = _create_playlist(client)
+
+    response = client.patch(f"/playlists/{playlist_id}", json={"desc": "updated"})
+    assert response.status_code == 200
+    assert response.json()["desc"] == "updated"
+    assert query_count(response) == 3
+
+
+# 플레이리스트에 노래 추가 : 소유자 확인 + 노래 존재 확인 + 마지막 위치 조회 + INSERT
+def test_add_song_to_playlist(client, login):
+    login(USER)
+    playlist_id = _create_playlist(client)
+
+    response = client.post(f"/playlists/{playlist_id}/songs/1")
+    assert response.status_code == 200
+    assert response.json()["changed"] == 1
+    assert query_count(response) == 4
+
+
+# 플레이리스트에서 노래 제거 : 소유자 확인 + DELETE
+def test_remove_song_from_playlist(client, login):
+    login(USER)
+    playlist_id = _create_playlist(client)
+    client.post(f"/playlists/{playlist_id}/songs/1")
+
+    response = client.delete(f"/playlists/{playlist_id}/songs/1")
+    assert response.status_code == 200
+    assert response.json()["changed"] == 1
+    assert query_count(response) == 2
+
+
+# 플레이리스트 삭제 : 소유자 조건을 포함한 DELETE 두 번 (연결 테이블, 플레이리스트)
+def test_delete_playlist(client, login):
+    login(USER)
+    playlist_id = _create_playlist(client)
+    client.post(f"/playlists/{playlist_id}/songs/1")
+
+    response = client.delete(f"/playlists/{playlist_id}")
+    assert response.status_code == 204
+    assert query_count(response) == 2
+    assert client.get(f"/playlists/{playlist_id}").status_code == 404
+
+
+# 로그인 : email 로 사용자 조회 + refresh token INSERT
+def test_login(client):
+    response = client.post("/users/login", json={"email": USER["email"], "password": PASSWORD})
+    assert response.status_code == 200
+    assert query_count(response) == 2
+
+
+# 노래 생성 : INSERT 한 번 (관리자 확인은 로그인 때 채워진 사용자 캐시 사용)
+def test_create_song(client, login):
+    login(ADMIN)
+
+    response = client.post("/songs/", json={"title": "new song", "artist": "artist", "duration": 200})
+    assert response.status_code == 201
+    assert response.json()["title"] == "new song"
+    assert query_count(response) == 1
+
+
+# 노래 수정 : UPDATE ... RETURNING 한 번
+def test_update_song(client, login):
+    login(ADMIN)
+
+    response = client.patch("/songs/2", json={"duration": 321})
+    assert response.status_code == 200
+    assert response.json()["duration"] == 321
+    assert query_count(response) == 1
+
+
+# 플레이리스트 생성 : 소유자 기본키 조회 + INSERT
+def test_create_playlist(client, login):
+    login(USER)
+
+    response = client.post("/playlists/", json={"name": "created"})
+    assert response.status_code == 201
+    assert response.json()["user"]["id"] == USER["id"]
+    assert response.json()["songs"] == []
+    assert query_count(response) == 2
@@ -0,0 +1,32 @@
+import asyncio
+from datetime import datetime
+
+import numpy as np
+
+from app.services.similar import SimilarSongIndex, build_index, save_index
+
+
+def _saved_index(path, playlist_ids, song_ids):
+    index = build_index(np.array(playlist_ids, dtype=np.int32), np.array(song_ids, dtype=np.int32), 5, 1000)
+    save_index(np, str(path), (*index, datetime(2026, 1, 1)))
+
+
+# SIMILAR_INDEX_PATH 가 있으면 DB 를 읽지 않고 스케줄 작업이 저장한 파일만 읽음 (파일이 바뀌었을 때만 다시 읽기)
+def test_load_saved_index(tmp_path):
+    path = tmp_path / "similar.npz"
+    index = SimilarSongIndex(top_k=5, refresh_interval=60, max_playlist_size=1000, chunk_size=100, index_path=str(path))
+
+    async def scenario():
+        await index.load()                  # 아직 파일 없음
+        assert index.get(1, 5)["items"] == []
+
+        _saved_index(path, [1, 1, 2, 2], [1, 2, 1, 2])
+        await index.load()
+        assert [item["song_id"] for item in index.get(1, 5)["items"]] == [2]
+        assert index.get(1, 5)["generated_at"].year == 2026
+
+        loaded = index._index
+        await index.load()                  # 파일이 그대로면 다시 읽지 않음
+        assert index._index is loaded
+
+    asyncio.run(scenario())
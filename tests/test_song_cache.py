@@ -0,0 +1,19 @@
+import asyncio
+
+from app.services.cache import MemoryCacheBackend, SongCache
+
+
+# 캐시가 비어 있을 때 조회를 시작한 요청이 노래 수정(무효화) 이후에 옛 데이터를 저장해도
+# 다음 조회는 그 값을 읽지 않아야 함 (키를 DB 조회 전에 만들기 때문)
+def test_fill_after_invalidate_is_not_served():
+    async def scenario():
+        cache = SongCache(MemoryCacheBackend(maxsize=100, ttl=300))
+        key = await cache.song_key(1)       # 조회 요청 : 캐시 없음 -> DB 조회 시작
+        await cache.invalidate(1)           # 그 사이 관리자가 수정 + 무효화
+        await cache.set(key, b'{"title": "old"}')   # 조회 요청이 옛 데이터를 저장
+
+        assert await cache.get(await cache.song_key(1)) is None
+        await cache.set(await cache.song_key(1), b'{"title": "new"}')
+        assert (await cache.get(await cache.song_key(1)))[0] == b'{"title": "new"}'
+
+    asyncio.run(scenario())
@@ -0,0 +1,40 @@
+import asyncio
+
+from app.services.services import SongIngestService
+
+
+def _rows(text: str, fmt: str) -> list:
+    async def chunks():
+        yield text.encode()
+
+    async def collect():
+        lines = SongIngestService.iter_lines(chunks())
+        return [row async for row in SongIngestService._iter_rows(lines, fmt)]
+
+    return asyncio.run(collect())
+
+
+# 따옴표 안의 줄바꿈 / 쉼표 / 이스케이프된 따옴표는 한 행의 필드로 읽고, 줄 번호는 행이 시작된 줄
+def test_csv_quoted_newline():
+    rows = _rows(
+        'title,artist,duration\r\n'
+        '"Line one\r\nline two",Band,200\r\n'
+        '"Say ""hi"", ok",Band,180\r\n'
+        '\r\n'
+        'Plain,Solo,150\r\n',
+        "csv",
+    )
+    assert rows == [
+        (2, {"title": "Line one\nline two", "artist": "Band", "duration": "200"}),
+        (4, {"title": 'Say "hi", ok', "artist": "Band", "duration": "180"}),
+        (6, {"title": "Plain", "artist": "Solo", "duration": "150"}),
+    ]
+
+
+# 잘못된 행은 오류로 반환하고 다음 행부터 계속 읽음
+def test_csv_errors():
+    rows = _rows('title,artist,duration\nA,B\nC,D,120\n"unclosed,E,1\n', "csv")
+    assert [line for line, _ in rows] == [2, 3, 4]
+    assert isinstance(rows[0][1], ValueError)
+    assert rows[1][1] == {"title": "C", "artist": "D", "duration": "120"}
+    assert isinstance(rows[2][1], ValueError)